@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Compara os backends numéricos da calculadora (float, decimal e fraction)
+
+Mede, para cada backend:
+- a conversão + avaliação de expressões "a op b" pelo caminho rápido (evaluate_line);
+- expressões completas pelo motor com cache;
+- uma soma acumulada de valores já convertidos (custo puro da aritmética).
+
+Para o decimal também mede a alternativa ingênua (um `localcontext` por operação),
+que o backend evita reutilizando o contexto.
+
+Uso:
+    python benchmarks/backends.py
+    python benchmarks/backends.py --precision 50 --operations 200000 --json
+"""
+
+import argparse
+import decimal
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from calculadora import evaluate_line  # noqa: E402
+from numeros import BACKEND_NAMES, DEFAULT_PRECISION, use_backend  # noqa: E402
+
+SIMPLE_EXPRESSIONS = ["0,1 + 0,2", "19,99 * 3", "100 / 7", "2 ** 10", "-7 // 2", "10 % 3"]
+FULL_EXPRESSIONS = ["(0,1 + 0,2) * 3", "1 / 3 + 1 / 6", "(2 + 3) * 4 ** 2 - 1,5", "-(7 // 2) % 5"]
+
+
+def best_rate(function: Callable[[], None], operations: int, repeat: int) -> float:
+    """Maior vazão (operações/s) entre `repeat` execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return operations / best if best else 0.0
+
+
+def measure_backend(name: str, precision: int, operations: int, repeat: int) -> Dict[str, float]:
+    backend = use_backend(name, precision)
+
+    def simple() -> None:
+        for index in range(operations):
+            evaluate_line(SIMPLE_EXPRESSIONS[index % len(SIMPLE_EXPRESSIONS)])
+
+    def full() -> None:
+        for index in range(operations):
+            evaluate_line(FULL_EXPRESSIONS[index % len(FULL_EXPRESSIONS)])
+
+    values = [backend.parse(f"{index % 1000}.{index % 97:02d}") for index in range(operations)]
+
+    def accumulate() -> None:
+        total = backend.parse("0")
+        for value in values:
+            total = total + value * value
+
+    return {
+        "simple_per_second": round(best_rate(simple, operations, repeat)),
+        "full_per_second": round(best_rate(full, operations, repeat)),
+        "arithmetic_per_second": round(best_rate(accumulate, operations, repeat)),
+    }
+
+
+def measure_local_context(precision: int, operations: int, repeat: int) -> float:
+    """Mesma soma do backend decimal, mas criando um contexto por operação."""
+    values = [decimal.Decimal(f"{index % 1000}.{index % 97:02d}") for index in range(operations)]
+
+    def accumulate() -> None:
+        total = decimal.Decimal(0)
+        for value in values:
+            with decimal.localcontext() as context:
+                context.prec = precision
+                total = total + value * value
+
+    return round(best_rate(accumulate, operations, repeat))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara os backends numéricos da calculadora")
+    parser.add_argument("--operations", type=int, default=100_000, help="operações por medição (padrão: 100000)")
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION, help="precisão do backend decimal")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções por medição; vale a melhor (padrão: 3)")
+    parser.add_argument("--json", action="store_true", help="emite o resultado em JSON")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name in BACKEND_NAMES:
+        results[name] = measure_backend(name, args.precision, args.operations, args.repeat)
+    use_backend("float")
+    results["decimal"]["arithmetic_local_context_per_second"] = measure_local_context(
+        args.precision, args.operations, args.repeat
+    )
+
+    if args.json:
+        print(json.dumps({"operations": args.operations, "precision": args.precision, "backends": results}))
+        return 0
+
+    baseline = results["float"]
+    lines: List[str] = [f"🔢 {args.operations} operações por medição (decimal com {args.precision} dígitos)"]
+    for name, rates in results.items():
+        lines.append(
+            f"{name:>8}: rápido {rates['simple_per_second']:>10,}/s ({rates['simple_per_second'] / baseline['simple_per_second']:.2f}x) | "
+            f"motor {rates['full_per_second']:>10,}/s ({rates['full_per_second'] / baseline['full_per_second']:.2f}x) | "
+            f"aritmética {rates['arithmetic_per_second']:>11,}/s ({rates['arithmetic_per_second'] / baseline['arithmetic_per_second']:.2f}x)"
+        )
+    local_rate = results["decimal"]["arithmetic_local_context_per_second"]
+    lines.append(
+        f"  decimal com localcontext por operação: {local_rate:,}/s "
+        f"({results['decimal']['arithmetic_per_second'] / local_rate:.1f}x mais lento que o contexto reutilizado)"
+    )
+    print("\n".join(lines))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do serviço HTTP da calculadora (servidor_http.py)
+
+Abre várias conexões keep-alive em paralelo, envia POST /eval em sequência por
+conexão e mede vazão (requisições/s) e latência (p50, p90, p99, máxima).
+
+Uso:
+    python benchmarks/carga_http.py --spawn                # sobe um servidor local temporário
+    python benchmarks/carga_http.py --port 8080 -c 64 -n 200
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EXPRESSIONS = ["2+3", "(2+3)*4**2", "10 // 3", "7 % 4", "1,5 * 2", "-2**2"]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_client(host: str, port: int, requests: int, latencies: List[float]) -> int:
+    """Uma conexão keep-alive enviando `requests` requisições; retorna quantas falharam."""
+    reader, writer = await asyncio.open_connection(host, port)
+    failures = 0
+    try:
+        for index in range(requests):
+            body = json.dumps({"expression": EXPRESSIONS[index % len(EXPRESSIONS)]}).encode()
+            request = (
+                b"POST /eval HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (host.encode(), len(body), body)
+            )
+            started = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if not head.startswith(b"HTTP/1.1 200"):
+                failures += 1
+    finally:
+        writer.close()
+    return failures
+
+
+async def wait_for_server(host: str, port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    await wait_for_server(args.host, args.port)
+    latencies: List[float] = []
+    started = time.perf_counter()
+    failures = await asyncio.gather(*(run_client(args.host, args.port, args.requests, latencies) for _ in range(args.connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "connections": args.connections,
+        "requests": total,
+        "failures": sum(failures),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p90": round(percentile(latencies, 0.90) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço HTTP da calculadora")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-c", "--connections", type=int, default=32, help="conexões simultâneas (padrão: 32)")
+    parser.add_argument("-n", "--requests", type=int, default=500, help="requisições por conexão (padrão: 500)")
+    parser.add_argument("--spawn", action="store_true", help="inicia um servidor_http.py local durante o teste")
+    parser.add_argument("--json", action="store_true", help="emite o resultado em JSON")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, str(ROOT / "servidor_http.py"), "--host", args.host, "--port", str(args.port)],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        latency = result["latency_ms"]
+        print(f"🔌 {result['connections']} conexões | {result['requests']} requisições em {result['seconds']} s")
+        print(f"🚀 {result['requests_per_second']} req/s | falhas: {result['failures']}")
+        print(f"⏱️  latência p50 {latency['p50']} ms | p90 {latency['p90']} ms | p99 {latency['p99']} ms | máx {latency['max']} ms")
+    return 0 if result["failures"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do servidor TCP da calculadora (servidor_tcp.py)
+
+Abre várias conexões em paralelo, envia uma expressão por vez em cada uma (esperando a
+resposta) e mede vazão (expressões/s) e latência (p50, p90, p99, máxima). Metade das
+expressões usa "_", exercitando o estado de cada sessão.
+
+Com `--idle N`, antes da carga abre N conexões ociosas; com `--spawn` (servidor local,
+Linux), mede também a memória residente do servidor antes e depois delas (KB por conexão).
+
+Uso:
+    python benchmarks/carga_tcp.py --spawn                 # sobe um servidor local temporário
+    python benchmarks/carga_tcp.py --spawn --idle 2000 -c 100
+    python benchmarks/carga_tcp.py --port 7070 -c 64 -n 200
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EXPRESSIONS = ["2+3", "_*4", "(2+3)*4**2", "_ // 3", "1,5 * 2", "_ % 7", "-2**2", "√(_ * _) + 1"]
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def resident_kb(pid: int) -> Optional[int]:
+    """Memória residente (VmRSS) de um processo, em KB; None fora do Linux."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+async def connect(host: str, port: int) -> Connection:
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readline()  # boas-vindas
+    return reader, writer
+
+
+async def run_client(host: str, port: int, requests: int, latencies: List[float]) -> int:
+    """Uma sessão enviando `requests` expressões em sequência; retorna quantas falharam."""
+    reader, writer = await connect(host, port)
+    failures = 0
+    try:
+        for index in range(requests):
+            line = EXPRESSIONS[index % len(EXPRESSIONS)].encode("utf-8") + b"\n"
+            started = time.perf_counter()
+            writer.write(line)
+            response = await reader.readline()
+            latencies.append(time.perf_counter() - started)
+            if not response or response.startswith(b"Erro"):
+                failures += 1
+        writer.write(b"q\n")
+        await reader.readline()
+    finally:
+        writer.close()
+    return failures
+
+
+async def wait_for_server(host: str, port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def run(args: argparse.Namespace, server_pid: Optional[int]) -> dict:
+    await wait_for_server(args.host, args.port)
+    result: dict = {"connections": args.connections}
+
+    idle: List[Connection] = []
+    if args.idle:
+        await asyncio.sleep(0.2)
+        before = resident_kb(server_pid) if server_pid else None
+        for start in range(0, args.idle, 200):
+            idle += await asyncio.gather(*(connect(args.host, args.port) for _ in range(min(200, args.idle - start))))
+        await asyncio.sleep(0.2)
+        after = resident_kb(server_pid) if server_pid else None
+        result["idle_connections"] = len(idle)
+        if before is not None and after is not None:
+            result["idle_kb_per_connection"] = round((after - before) / len(idle), 2)
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    failures = await asyncio.gather(*(run_client(args.host, args.port, args.requests, latencies) for _ in range(args.connections)))
+    elapsed = time.perf_counter() - started
+    for _, writer in idle:
+        writer.close()
+
+    latencies.sort()
+    total = len(latencies)
+    result.update({
+        "requests": total,
+        "failures": sum(failures),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p90": round(percentile(latencies, 0.90) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    })
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor TCP da calculadora")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    parser.add_argument("-c", "--connections", type=int, default=32, help="sessões ativas simultâneas (padrão: 32)")
+    parser.add_argument("-n", "--requests", type=int, default=500, help="expressões por sessão (padrão: 500)")
+    parser.add_argument("--idle", type=int, default=0, help="conexões ociosas abertas durante o teste (padrão: 0)")
+    parser.add_argument("--spawn", action="store_true", help="inicia um servidor_tcp.py local durante o teste")
+    parser.add_argument("--json", action="store_true", help="emite o resultado em JSON")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, str(ROOT / "servidor_tcp.py"), "--host", args.host, "--port", str(args.port)],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        result = asyncio.run(run(args, server.pid if server is not None else None))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        latency = result["latency_ms"]
+        if "idle_connections" in result:
+            memory = result.get("idle_kb_per_connection")
+            suffix = f" | {memory} KB por conexão ociosa" if memory is not None else ""
+            print(f"💤 {result['idle_connections']} conexões ociosas{suffix}")
+        print(f"🔌 {result['connections']} sessões | {result['requests']} expressões em {result['seconds']} s")
+        print(f"🚀 {result['requests_per_second']} expressões/s | falhas: {result['failures']}")
+        print(f"⏱️  latência p50 {latency['p50']} ms | p90 {latency['p90']} ms | p99 {latency['p99']} ms | máx {latency['max']} ms")
+    return 0 if result["failures"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
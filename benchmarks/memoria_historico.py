@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Memória por entrada do histórico da versão web
+
+Compara o formato antigo (um dict por operação com datetime e textos já formatados,
+em um RingHistory) com o `ColumnarHistory` (colunas float64 e código do operador).
+A medição usa tracemalloc: bytes alocados para manter N entradas vivas.
+
+Uso:
+    python benchmarks/memoria_historico.py
+    python benchmarks/memoria_historico.py --entries 100000 --json
+"""
+
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from historico import ColumnarHistory, RingHistory  # noqa: E402
+
+OPERATIONS = ["+", "-", "*", "/", "^", "mod", "//"]
+
+
+def format_number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else f"{value:.10g}"
+
+
+def fill_dicts(entries: int) -> RingHistory:
+    history: RingHistory = RingHistory(entries)
+    generator = random.Random(1)
+    for _ in range(entries):
+        a, b = generator.uniform(-1000, 1000), generator.uniform(-1000, 1000)
+        operation = generator.choice(OPERATIONS)
+        history.append({
+            'timestamp': datetime.now(),
+            'expression': f"{format_number(a)} {operation} {format_number(b)}",
+            'result': format_number(a + b),
+            'operation': operation,
+        })
+    return history
+
+
+def fill_columns(entries: int) -> ColumnarHistory:
+    history = ColumnarHistory(entries)
+    generator = random.Random(1)
+    for _ in range(entries):
+        a, b = generator.uniform(-1000, 1000), generator.uniform(-1000, 1000)
+        history.append(a, generator.choice(OPERATIONS), b, a + b)
+    return history
+
+
+def measure(fill: Callable[[int], object], entries: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    history = fill(entries)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del history
+    return (after - before) / entries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Memória por entrada do histórico")
+    parser.add_argument("--entries", type=int, default=50_000, help="entradas medidas (padrão: 50000)")
+    parser.add_argument("--json", action="store_true", help="emite o resultado em JSON")
+    args = parser.parse_args()
+
+    result: Dict[str, float] = {
+        "entries": args.entries,
+        "dict_bytes_per_entry": round(measure(fill_dicts, args.entries), 1),
+        "columnar_bytes_per_entry": round(measure(fill_columns, args.entries), 1),
+    }
+    result["reduction"] = round(result["dict_bytes_per_entry"] / result["columnar_bytes_per_entry"], 1)
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"🧾 {args.entries} entradas")
+        print(f"   dict + datetime + textos: {result['dict_bytes_per_entry']} bytes/entrada")
+        print(f"   ColumnarHistory:          {result['columnar_bytes_per_entry']} bytes/entrada")
+        print(f"   redução: {result['reduction']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Mede o tempo de importação (partida a frio) da calculadora web
+
+Executa `python -X importtime -c "import calculadora_streamlit"` em um processo novo e
+separa o custo do próprio app do custo do Streamlit. Falha (código 1) quando:
+- algum módulo pesado (pandas, plotly, numpy) é importado na partida pelo app (o que o
+  próprio Streamlit já importa não conta);
+- o custo próprio do app passa do limite em milissegundos (--max-ms).
+
+Uso:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --module calculadora --max-ms 30 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Módulos que só devem ser carregados quando o gráfico é desenhado
+HEAVY_MODULES = ("pandas", "plotly", "numpy")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure_once(module: str) -> Tuple[Dict[str, int], List[str]]:
+    """Retorna o tempo cumulativo (µs) de cada módulo de nível superior e a lista de módulos importados."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"falha ao importar {module}:\n{completed.stderr[-2000:]}")
+    cumulative: Dict[str, int] = {}
+    imported: List[str] = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, _, name = match.groups()
+        imported.append(name)
+        cumulative[name] = max(cumulative.get(name, 0), int(cumulative_us))
+    return cumulative, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tempo de importação da calculadora")
+    parser.add_argument("--module", default="calculadora_streamlit", help="módulo medido (padrão: calculadora_streamlit)")
+    parser.add_argument("--max-ms", type=float, default=60.0, help="limite do custo próprio do app em ms (padrão: 60)")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções; vale a mediana (padrão: 3)")
+    parser.add_argument("--json", action="store_true", help="emite o resultado em JSON")
+    args = parser.parse_args()
+
+    totals: List[float] = []
+    own_costs: List[float] = []
+    heavy_found = set()
+    for _ in range(max(args.repeat, 1)):
+        try:
+            cumulative, imported = measure_once(args.module)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 2
+        total_ms = cumulative.get(args.module, 0) / 1000
+        framework_ms = cumulative.get("streamlit", 0) / 1000
+        totals.append(total_ms)
+        own_costs.append(total_ms - framework_ms)
+        heavy_found.update(name for name in imported if name.split(".")[0] in HEAVY_MODULES)
+
+    # O que o próprio Streamlit já importa não conta contra o app
+    if "streamlit" in imported and args.module != "streamlit":
+        _, framework_imported = measure_once("streamlit")
+        heavy_found.difference_update(framework_imported)
+
+    totals.sort()
+    own_costs.sort()
+    result = {
+        "module": args.module,
+        "total_ms": round(totals[len(totals) // 2], 2),
+        "own_ms": round(own_costs[len(own_costs) // 2], 2),
+        "max_ms": args.max_ms,
+        "heavy_modules": sorted({name.split(".")[0] for name in heavy_found}),
+    }
+    failures = []
+    if result["heavy_modules"]:
+        failures.append(f"módulos pesados importados na partida: {', '.join(result['heavy_modules'])}")
+    if result["own_ms"] > args.max_ms:
+        failures.append(f"custo próprio {result['own_ms']} ms acima do limite de {args.max_ms} ms")
+    result["ok"] = not failures
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"⏱️  {args.module}: total {result['total_ms']} ms | app {result['own_ms']} ms (limite {args.max_ms} ms)")
+        for failure in failures:
+            print(f"❌ {failure}")
+        if not failures:
+            print("✅ Partida dentro do limite")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
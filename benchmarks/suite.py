@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks da calculadora
+
+Micro-benchmarks (ns por chamada, melhor de várias repetições):
+- try_parse_expression (caminho rápido da CLI);
+- cada função *_numbers da CLI;
+- format_number da CLI e da versão web (CalculadoraStreamlit.format_number);
+- caminho de gravação do histórico (RingHistory.append e SQLiteHistoryStore.append);
+- recálculo de variáveis (VariableGraph.set) com milhares de fórmulas.
+
+Macro-benchmarks:
+- lote de N linhas (padrão: 1 milhão) pelo mesmo caminho de `calculadora.py --batch`;
+- reruns da versão web com streamlit.testing (ignorado quando o Streamlit não está instalado).
+
+O resultado é um JSON (`--output` grava em arquivo). Com `--compare base.json`, cada
+benchmark é comparado ao valor salvo e o código de saída é 1 quando algum ficou mais
+lento que a tolerância (`--tolerance`, padrão 10%).
+
+Uso:
+    python benchmarks/suite.py --output base.json
+    python benchmarks/suite.py --compare base.json
+    python benchmarks/suite.py --quick --filter format
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import calculadora  # noqa: E402
+from historico import RingHistory, SQLiteHistoryStore  # noqa: E402
+from variaveis import VariableGraph  # noqa: E402
+
+BATCH_EXPRESSIONS = ["2 + 3", "(2+3)*4**2", "10 // 3", "7 % 4", "1,5 * 2", "-2**2", "_ / 2", "100 / 0"]
+
+MICRO_BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+MACRO_BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Optional[float]]] = {}
+
+
+def micro(name: str):
+    """Registra uma fábrica que devolve a função medida (sem argumentos).
+
+    A fábrica pode devolver um gerenciador de contexto que entrega a função; ele é
+    encerrado depois da medição (ex.: para apagar arquivos temporários).
+    """
+    def register(factory: Callable[[], Callable[[], object]]):
+        MICRO_BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+def macro(name: str):
+    """Registra um benchmark que devolve a duração em segundos (None = ignorado)."""
+    def register(function: Callable[[argparse.Namespace], Optional[float]]):
+        MACRO_BENCHMARKS[name] = function
+        return function
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Micro-benchmarks
+# ---------------------------------------------------------------------------
+
+@micro("try_parse_expression")
+def bench_try_parse_expression():
+    parse = calculadora.try_parse_expression
+    return lambda: parse("12,5 * 4", 3.0)
+
+
+for _name in ("add", "subtract", "multiply", "divide", "power", "modulo", "floor_divide"):
+    def _factory(function=getattr(calculadora, f"{_name}_numbers")):
+        return lambda: function(7.5, 2.0)
+    micro(f"{_name}_numbers")(_factory)
+
+
+@micro("format_number.cli")
+def bench_format_number_cli():
+    format_number = calculadora.format_number
+    return lambda: (format_number(42.0), format_number(3.14159))
+
+
+@micro("format_number.web")
+def bench_format_number_web():
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        return None
+    from calculadora_streamlit import CalculadoraStreamlit
+    format_number = CalculadoraStreamlit.format_number
+    return lambda: (format_number(None, 42.0), format_number(None, 3.14159))
+
+
+@micro("history.ring_append")
+def bench_ring_append():
+    history = RingHistory(50)
+    append = history.append
+    return lambda: append("2 + 3 = 5")
+
+
+@micro("history.sqlite_append")
+@contextlib.contextmanager
+def bench_sqlite_append():
+    with tempfile.TemporaryDirectory(prefix="calculadora-bench-") as directory:
+        store = SQLiteHistoryStore(os.path.join(directory, "historico.db"))
+        try:
+            append = store.append
+            yield lambda: append("2 + 3", "5", "+")
+        finally:
+            store.close()
+
+
+@micro("variables.set_leaf_input")
+def bench_variables_leaf():
+    # 5000 fórmulas; a entrada alterada alimenta só uma delas
+    graph = VariableGraph()
+    for index in range(5000):
+        graph.set(f"entrada{index}", str(index))
+        graph.set(f"formula{index}", f"entrada{index} * 2 + 1")
+    values = itertools.cycle((1.0, 2.0))
+    return lambda: graph.set("entrada2500", str(next(values)))
+
+
+@micro("variables.set_chain_1000")
+def bench_variables_chain():
+    # Cadeia de 1000 fórmulas dependentes: mudar a origem recalcula todas, em ordem
+    graph = VariableGraph()
+    graph.set("c0", "1")
+    for index in range(1, 1000):
+        graph.set(f"c{index}", f"c{index - 1} + 1")
+    values = itertools.cycle(("1", "2"))
+    return lambda: graph.set("c0", next(values))
+
+
+def run_micro(factory: Callable[[], Callable[[], object]], repeat: int, min_time: float) -> Optional[Dict[str, float]]:
+    with contextlib.ExitStack() as stack:
+        function = factory()
+        if isinstance(function, contextlib.AbstractContextManager):
+            function = stack.enter_context(function)
+        if function is None:
+            return None
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        number = max(int(number * min_time / 0.2), 1)
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"ns_per_op": round(best * 1e9, 1), "ops_per_second": round(1 / best) if best else 0}
+
+
+# ---------------------------------------------------------------------------
+# Macro-benchmarks
+# ---------------------------------------------------------------------------
+
+class _NullWriter(io.TextIOBase):
+    """Descarta a saída (mede o cálculo e a formatação, não o terminal)."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _batch_lines(count: int) -> Iterator[str]:
+    for index in range(count):
+        yield BATCH_EXPRESSIONS[index % len(BATCH_EXPRESSIONS)] + "\n"
+
+
+@macro("batch")
+def bench_batch(args: argparse.Namespace) -> Optional[float]:
+    started = time.perf_counter()
+    calculadora.run_batch(_batch_lines(args.batch_lines), _NullWriter())
+    return time.perf_counter() - started
+
+
+@macro("streamlit_rerun")
+def bench_streamlit_rerun(args: argparse.Namespace) -> Optional[float]:
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return None
+    app = AppTest.from_file(str(ROOT / "calculadora_streamlit.py"), default_timeout=60)
+    app.run()
+    started = time.perf_counter()
+    for _ in range(args.reruns):
+        app.run()
+    return (time.perf_counter() - started) / args.reruns
+
+
+# ---------------------------------------------------------------------------
+# Execução e comparação
+# ---------------------------------------------------------------------------
+
+def run_suite(args: argparse.Namespace) -> Dict[str, object]:
+    results: Dict[str, Dict[str, float]] = {}
+    skipped: List[str] = []
+    for name, factory in MICRO_BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+        result = run_micro(factory, args.repeat, args.min_time)
+        if result is None:
+            skipped.append(name)
+        else:
+            results[name] = result
+    for name, function in MACRO_BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+        seconds = function(args)
+        if seconds is None:
+            skipped.append(name)
+            continue
+        result = {"seconds": round(seconds, 4)}
+        if name == "batch":
+            result["lines"] = args.batch_lines
+            result["lines_per_second"] = round(args.batch_lines / seconds)
+        results[name] = result
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+        "skipped": skipped,
+    }
+
+
+def _cost(result: Dict[str, float]) -> float:
+    """Métrica comparada: menor é melhor."""
+    return result["ns_per_op"] if "ns_per_op" in result else result["seconds"]
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], tolerance: float) -> List[Dict[str, object]]:
+    """Variação de cada benchmark presente nos dois resultados."""
+    rows = []
+    baseline_results = baseline.get("benchmarks", {})
+    for name, result in current["benchmarks"].items():
+        if name not in baseline_results:
+            continue
+        before = _cost(baseline_results[name])
+        after = _cost(result)
+        change = (after - before) / before if before else 0.0
+        rows.append({"name": name, "baseline": before, "current": after, "change": round(change, 4), "regression": change > tolerance})
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks da calculadora")
+    parser.add_argument("--output", metavar="ARQUIVO", help="grava o resultado JSON no arquivo")
+    parser.add_argument("--compare", metavar="BASE", help="compara com um resultado salvo e acusa regressões")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="piora aceita na comparação (padrão: 0.10 = 10%%)")
+    parser.add_argument("--filter", metavar="TEXTO", help="executa só os benchmarks cujo nome contém TEXTO")
+    parser.add_argument("--repeat", type=int, default=5, help="repetições dos micro-benchmarks; vale a melhor (padrão: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="duração mínima de cada repetição em s (padrão: 0.2)")
+    parser.add_argument("--batch-lines", type=int, default=1_000_000, help="linhas do lote (padrão: 1000000)")
+    parser.add_argument("--reruns", type=int, default=20, help="reruns medidos da versão web (padrão: 20)")
+    parser.add_argument("--quick", action="store_true", help="medições curtas (lote de 100 mil linhas, 3 repetições)")
+    args = parser.parse_args()
+    if args.quick:
+        args.repeat = min(args.repeat, 3)
+        args.min_time = min(args.min_time, 0.05)
+        args.batch_lines = min(args.batch_lines, 100_000)
+        args.reruns = min(args.reruns, 5)
+
+    current = run_suite(args)
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = compare(current, baseline, args.tolerance)
+        current["comparison"] = {"baseline": args.compare, "tolerance": args.tolerance, "results": rows}
+        for row in rows:
+            marker = "❌" if row["regression"] else "✅"
+            print(f"{marker} {row['name']:<24} {row['baseline']:>12} -> {row['current']:>12} ({row['change']:+.1%})", file=sys.stderr)
+        if any(row["regression"] for row in rows):
+            exit_code = 1
+
+    output = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
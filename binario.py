@@ -0,0 +1,151 @@
+"""
+Operações elemento a elemento sobre arrays binários em disco (NumPy memmap)
+
+`run_binary_operation("a.f64", "*", "b.f64", "c.f64")` mapeia os arquivos na memória e
+aplica a operação em blocos de tamanho fixo, gravando direto no arquivo de saída (também
+mapeado): a memória usada não depende do tamanho dos dados e nenhum elemento vira objeto
+Python. O segundo operando pode ser outro arquivo ou um número (aplicado a todos os
+elementos); "√" usa só o primeiro.
+
+Formatos:
+- binário cru: float64 na ordem nativa da máquina (ex.: `array.tofile("a.f64")`);
+- `.npy`: lido com o cabeçalho do NumPy; a saída `.npy` é criada com cabeçalho.
+
+Divisores zero em "/", "%" e "//" e resultados sem valor real (raiz de negativo, base
+negativa com expoente fracionário) viram NaN e são contados em `BinarySummary`.
+"""
+
+from time import perf_counter
+from typing import Callable, NamedTuple, Optional, Union
+import os
+
+import numpy as np
+
+from operacoes import OPERATIONS, canonical_symbol
+from vetorizado import VECTOR_FUNCTIONS
+
+DTYPE = np.dtype(np.float64)
+
+# Elementos por bloco (8 MiB por array em float64)
+DEFAULT_CHUNK_ELEMENTS = 1 << 20
+
+UNARY_FUNCTIONS = {"√": np.sqrt}
+
+_ZERO_DIVISOR_SYMBOLS = frozenset(symbol for symbol, operation in OPERATIONS.items() if operation.checks_zero_divisor)
+
+
+class BinarySummary(NamedTuple):
+	elements: int
+	zero_divisors: int
+	undefined: int  # NaN no resultado (inclui os divisores zero)
+	seconds: float
+	bytes: int  # lidos dos operandos e gravados no resultado
+
+	@property
+	def bytes_per_second(self) -> float:
+		return self.bytes / self.seconds if self.seconds else 0.0
+
+
+def open_array(path: str) -> np.ndarray:
+	"""Mapeia um arquivo float64 (cru ou .npy) somente para leitura.
+
+	Raises:
+		ValueError: tamanho que não é múltiplo de 8 bytes ou .npy com outro tipo/forma.
+	"""
+	if path.lower().endswith(".npy"):
+		array = np.load(path, mmap_mode="r")
+		if array.dtype != DTYPE or array.ndim != 1:
+			raise ValueError(f"{path}: esperado um array float64 de uma dimensão (encontrado {array.dtype}, {array.ndim}D)")
+		return array
+	size = os.path.getsize(path)
+	if size % DTYPE.itemsize:
+		raise ValueError(f"{path}: tamanho de {size} bytes não é múltiplo de {DTYPE.itemsize} (float64)")
+	if size == 0:
+		return np.empty(0, dtype=DTYPE)
+	return np.memmap(path, dtype=DTYPE, mode="r")
+
+
+def create_array(path: str, elements: int) -> np.ndarray:
+	"""Cria o arquivo de saída com `elements` float64, mapeado para escrita."""
+	if path.lower().endswith(".npy"):
+		return np.lib.format.open_memmap(path, mode="w+", dtype=DTYPE, shape=(elements,))
+	if elements == 0:
+		open(path, "wb").close()
+		return np.empty(0, dtype=DTYPE)
+	return np.memmap(path, dtype=DTYPE, mode="w+", shape=(elements,))
+
+
+def run_binary_operation(
+	input_path: str,
+	operator_symbol: str,
+	operand: Union[str, float, None],
+	output_path: str,
+	chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+	progress: Optional[Callable[[int, int], None]] = None,
+) -> BinarySummary:
+	"""Aplica `input op operand` elemento a elemento e grava em `output_path`.
+
+	Args:
+		operand: caminho de outro arquivo, um número ou None (operações de um operando).
+		progress: recebe (elementos processados, total) a cada bloco.
+
+	Raises:
+		UnknownOperator: operador sem versão vetorizada.
+		ValueError: arquivos de tamanhos diferentes ou operando ausente/sobrando.
+	"""
+	symbol = canonical_symbol(operator_symbol)
+	unary = UNARY_FUNCTIONS.get(symbol)
+	if unary is None and symbol not in VECTOR_FUNCTIONS:
+		raise ValueError(f"operador não suportado no modo binário: {operator_symbol!r}")
+	if unary is not None and operand is not None:
+		raise ValueError(f"{symbol} usa apenas um operando")
+	if unary is None and operand is None:
+		raise ValueError(f"{symbol} precisa de um segundo operando (arquivo ou número)")
+
+	inputs = [input_path] + ([operand] if isinstance(operand, str) else [])
+	if any(os.path.abspath(path) == os.path.abspath(output_path) for path in inputs):
+		raise ValueError("o arquivo de saída não pode ser um dos arquivos de entrada")
+	a = open_array(input_path)
+	b = open_array(operand) if isinstance(operand, str) else operand
+	elements = len(a)
+	if isinstance(b, np.ndarray) and len(b) != elements:
+		raise ValueError(f"arquivos com tamanhos diferentes: {elements} e {len(b)} elementos")
+	if chunk_elements < 1:
+		raise ValueError("chunk_elements deve ser maior que zero")
+
+	function = VECTOR_FUNCTIONS.get(symbol)
+	checks_zero = symbol in _ZERO_DIVISOR_SYMBOLS
+	output = create_array(output_path, elements)
+	zero_divisors = 0
+	undefined = 0
+	started = perf_counter()
+	with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+		for start in range(0, elements, chunk_elements):
+			stop = min(start + chunk_elements, elements)
+			target = output[start:stop]
+			if unary is not None:
+				unary(a[start:stop], out=target)
+			else:
+				right = b[start:stop] if isinstance(b, np.ndarray) else b
+				# Resultado gravado direto no arquivo mapeado, sem array intermediário
+				function(a[start:stop], right, out=target)
+				if checks_zero:
+					zero = right == 0
+					if isinstance(zero, np.ndarray):
+						count = int(np.count_nonzero(zero))
+						if count:
+							target[zero] = np.nan
+					else:
+						count = (stop - start) if zero else 0
+						if count:
+							target[:] = np.nan
+					zero_divisors += count
+			undefined += int(np.count_nonzero(np.isnan(target)))
+			if progress is not None:
+				progress(stop, elements)
+	if isinstance(output, np.memmap):
+		output.flush()
+	seconds = perf_counter() - started
+	del output
+	arrays = 3 if isinstance(b, np.ndarray) else 2
+	return BinarySummary(elements, zero_divisors, undefined, seconds, elements * DTYPE.itemsize * arrays)
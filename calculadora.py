@@ -12,13 +12,80 @@ Operações suportadas:
 
 Melhorias de usabilidade:
 - Entrada rápida por expressão: ex. "2 + 3", "7*4", "_ / 2" ("_" usa o último resultado)
+- Expressões completas com precedência e parênteses: ex. "(2+3)*_**2", "-1,5 * (4 // 3)"
 - Atalho para sair: "q" ou "0"
 - Enter para usar o último resultado como primeiro número (quando existir)
 - Histórico das últimas operações
+- Modo em lote: `python calculadora.py --batch arquivo.txt` ou via pipe (uma expressão por linha)
+- Lote em paralelo: `--workers N --chunk-size M` (saída na ordem da entrada; sem '_')
+- Modo exato: `--exact` mantém inteiros como inteiros do Python (sem perda em "2**64 + 1",
+  e "a ** b % m" usa exponenciação modular)
+- Aritmética decimal ou racional: `--backend decimal --precision 50` ou `--backend fraction`
+  (0.1 + 0.2 = 0.3)
+- Arrays binários em disco: `--binary a.f64 --op "*" --operand b.f64 --output c.f64` aplica a
+  operação elemento a elemento em blocos, com os arquivos mapeados na memória (NumPy)
+- Estatísticas de listas: `--stats arquivo.txt` (ou pipe) e o comando "s" resumem os números
+  em uma passada (soma, média, variância, mínimo/máximo e quantis aproximados)
+- Variáveis com fórmulas reativas: "taxa = 0.05", "total = base * (1 + taxa)"; ao mudar
+  uma variável, só as fórmulas que dependem dela são recalculadas ("v" lista, "del nome" apaga)
 """
 
-from typing import Optional, List, Tuple
+from collections import deque
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from typing import TYPE_CHECKING, Deque, Dict, Optional, List, Tuple, Iterable, Iterator, TextIO, Union
+import argparse
+import io
+import functools
+import itertools
+import math
+import os
 import re
+import sys
+
+import operacoes
+from expressoes import ExpressionError, ExpressionSyntaxError, UndefinedVariable, evaluate as evaluate_expression, tokenize
+from estatisticas import StreamingStats, round_significant
+from historico import RingHistory, SQLiteHistoryStore, history_capacity, history_db_path
+from instrumentacao import OperatorMetrics, metrics
+from memoizacao import EVICTION_POLICIES, OperationCache
+from numeros import (
+	BACKEND_NAMES,
+	DEFAULT_PRECISION,
+	current_backend,
+	format_decimal,
+	format_fraction,
+	format_integer,
+	use_backend,
+)
+from operacoes import OPERATIONS, DivisionByZero, OperationTooExpensive, apply_operation, use_operation_cache
+from variaveis import Cell, VariableGraph, parse_assignment
+
+if TYPE_CHECKING:
+	from concurrent.futures import Future
+
+
+# Mensagens de erro para operações cujo divisor não pode ser zero
+ZERO_DIVISOR_MESSAGES = {
+	symbol: f"{operation.zero_divisor_message}."
+	for symbol, operation in OPERATIONS.items()
+	if operation.checks_zero_divisor
+}
+
+# Opções do menu numérico -> símbolo no registro de operações
+MENU_OPERATORS = {"1": "+", "2": "-", "3": "*", "4": "/", "5": "**", "6": "%", "7": "//"}
+
+# Capacidade padrão do histórico (CALCULADORA_HISTORY_SIZE ou --history-size alteram)
+DEFAULT_HISTORY_SIZE = 20
+
+# Tamanho do buffer de escrita usado no modo em lote
+BATCH_BUFFER_SIZE = 1 << 16
+
+# Linhas por bloco enviado a cada processo no lote em paralelo
+DEFAULT_CHUNK_SIZE = 10000
+
+# Comandos que encerram o modo interativo e a leitura em lote
+EXIT_COMMANDS = frozenset({"0", "q", "sair"})
 
 
 class UserCancelledInput(Exception):
@@ -28,17 +95,40 @@ class UserCancelledInput(Exception):
 
 def format_number(value: float) -> str:
 	"""Formata números para exibição amigável, removendo .0 quando possível."""
+	if type(value) is float:
+		# Caminho comum primeiro: sem as checagens de Decimal e Fraction (ABC, mais lentas)
+		return str(int(value)) if value.is_integer() else str(value)
+	if isinstance(value, int):
+		return format_integer(value)
+	if isinstance(value, Decimal):
+		return format_decimal(value)
+	if isinstance(value, Fraction):
+		return format_fraction(value)
+	if not math.isfinite(value):
+		return str(value)
 	if value == int(value):
 		return str(int(value))
 	return str(value)
 
 
-def parse_number(prompt_text: str, default_value: Optional[float] = None) -> float:
+def parse_operand(text: str, exact: bool = False) -> float:
+	"""Converte um operando ('10', '-3,5') pelo backend numérico ativo.
+
+	Com `exact`, inteiros viram `int` sem passar por float.
+
+	Raises:
+		ValueError: se o texto não for um número.
+	"""
+	return current_backend().parse(text.replace(",", "."), exact)
+
+
+def parse_number(prompt_text: str, default_value: Optional[float] = None, exact: bool = False) -> float:
 	"""Lê um número, aceita vírgula ou ponto. Enter usa default quando fornecido. 'q' sai.
 
 	Args:
 		prompt_text: texto base do prompt.
 		default_value: se fornecido, Enter retorna esse valor.
+		exact: mantém inteiros como `int` (modo exato).
 
 	Raises:
 		UserCancelledInput: se o usuário digitar 'q' ou 'sair'.
@@ -52,11 +142,10 @@ def parse_number(prompt_text: str, default_value: Optional[float] = None) -> flo
 		if user_input.lower() in {"q", "sair"}:
 			raise UserCancelledInput()
 		if user_input == "" and default_value is not None:
-			return float(default_value)
+			return default_value
 		user_input = user_input.replace(" ", "")
-		user_input = user_input.replace(",", ".")
 		try:
-			return float(user_input)
+			return parse_operand(user_input, exact)
 		except ValueError:
 			print("Entrada inválida. Digite um número válido (ex.: 10, 3.5, -2) ou 'q' para sair.")
 
@@ -75,25 +164,25 @@ def multiply_numbers(a: float, b: float) -> float:
 
 def divide_numbers(a: float, b: float) -> Optional[float]:
 	if b == 0:
-		print("Erro: divisão por zero não é permitida.")
+		print(f"Erro: {ZERO_DIVISOR_MESSAGES['/']}")
 		return None
 	return a / b
 
 
 def power_numbers(a: float, b: float) -> float:
-	return a ** b
+	return apply_operation("**", a, b)
 
 
 def modulo_numbers(a: float, b: float) -> Optional[float]:
 	if b == 0:
-		print("Erro: módulo por zero não é permitido.")
+		print(f"Erro: {ZERO_DIVISOR_MESSAGES['%']}")
 		return None
 	return a % b
 
 
 def floor_divide_numbers(a: float, b: float) -> Optional[float]:
 	if b == 0:
-		print("Erro: divisão inteira por zero não é permitida.")
+		print(f"Erro: {ZERO_DIVISOR_MESSAGES['//']}")
 		return None
 	return a // b
 
@@ -109,23 +198,29 @@ def print_menu(last_result: Optional[float]) -> None:
 	print("5) Potência (**)")
 	print("6) Módulo (%)")
 	print("7) Divisão inteira (//)")
-	print("h) Histórico | c) Limpar resultado | 0/q) Sair")
+	print("h) Histórico | v) Variáveis | s) Estatísticas | m) Métricas | c) Limpar resultado | 0/q) Sair")
 
 
-def try_parse_expression(expression_text: str, last_result: Optional[float]) -> Optional[Tuple[float, str, float]]:
+def try_parse_expression(
+	expression_text: str,
+	last_result: Optional[float],
+	exact: bool = False,
+) -> Optional[Tuple[float, str, float]]:
 	"""Tenta interpretar uma expressão do tipo 'a op b'. Suporta '_' como último resultado."""
 	pattern = r"^\s*([+-]?(?:\d+(?:[.,]\d+)?|_))\s*(\*\*|//|[+\-*/%])\s*([+-]?(?:\d+(?:[.,]\d+)?|_))\s*$"
 	match = re.match(pattern, expression_text)
 	if not match:
 		return None
 	left_raw, operator_symbol, right_raw = match.groups()
+	if operator_symbol == "**" and left_raw[0] in "+-":
+		# "-2**2" é -(2**2): a precedência do sinal fica a cargo do motor de expressões
+		return None
 
 	def convert_operand(operand_text: str) -> Optional[float]:
 		if operand_text == "_":
 			return last_result
-		operand_text = operand_text.replace(",", ".")
 		try:
-			return float(operand_text)
+			return parse_operand(operand_text, exact)
 		except ValueError:
 			return None
 
@@ -136,37 +231,327 @@ def try_parse_expression(expression_text: str, last_result: Optional[float]) ->
 	return left_value, operator_symbol, right_value
 
 
-def main() -> None:
+def compute_expression(number_a: float, operator_symbol: str, number_b: float) -> Optional[float]:
+	"""Aplica o operador pelo registro de operações. Divisor zero imprime o erro e retorna None."""
+	try:
+		return apply_operation(operator_symbol, number_a, number_b)
+	except DivisionByZero as error:
+		print(f"Erro: {ZERO_DIVISOR_MESSAGES[error.operator]}")
+	except OperationTooExpensive as error:
+		print(f"Erro: {error}.")
+	except OverflowError:
+		print("Erro: resultado grande demais para ser representado.")
+	except InvalidOperation:
+		print("Erro: operação sem resultado definido.")
+	except ValueError as error:
+		print(f"Erro: {error}.")
+	return None
+
+
+def evaluate_line(
+	text: str,
+	last_result: Optional[float] = None,
+	exact: bool = False,
+	variables: Optional[Dict[str, float]] = None,
+) -> float:
+	"""Avalia uma expressão: 'a op b' pelo caminho rápido, o resto pelo motor completo (com cache).
+
+	`variables` dá o valor dos nomes usados na expressão (ex.: VariableGraph.values).
+	Com as métricas ligadas, o tempo de interpretação entra como "parse" e as expressões
+	completas como "expressão"; o operador do caminho rápido é medido no despacho.
+
+	Raises:
+		DivisionByZero, ExpressionError, OverflowError, ValueError.
+	"""
+	if metrics.enabled:
+		expr = metrics.measure("parse", try_parse_expression, text, last_result, exact)
+		if expr is None:
+			return metrics.measure("expressão", evaluate_expression, text, last_result, exact, variables)
+	else:
+		expr = try_parse_expression(text, last_result, exact)
+		if expr is None:
+			return evaluate_expression(text, last_result, exact, variables)
+	number_a, operator_symbol, number_b = expr
+	return apply_operation(operator_symbol, number_a, number_b)
+
+
+def describe_error(error: Exception, text: str) -> str:
+	"""Mensagem amigável para um erro levantado por evaluate_line."""
+	if isinstance(error, DivisionByZero):
+		return ZERO_DIVISOR_MESSAGES[error.operator]
+	if isinstance(error, ExpressionSyntaxError):
+		return f"expressão inválida ({error}): {text}"
+	if isinstance(error, UndefinedVariable):
+		# A mensagem já traz o nome da variável
+		return str(error)
+	if isinstance(error, ExpressionError):
+		return f"{error}: {text}"
+	if isinstance(error, OverflowError):
+		return f"resultado grande demais para ser representado: {text}"
+	if isinstance(error, InvalidOperation):
+		return f"operação sem resultado definido: {text}"
+	return str(error)
+
+
+def format_stats(stats: StreamingStats) -> str:
+	"""Resumo de uma lista de números (comando 's' e --stats); quantis marcados com ≈."""
+	lines = []
+	for label, value in stats.summary():
+		if label.startswith("p") and value is not None:
+			label = f"{label} (≈)"
+			value = round_significant(value)
+		lines.append(f"{label:<15} {format_number(value) if value is not None else '-'}")
+	if stats.invalid:
+		lines.append(f"{'ignorados':<15} {stats.invalid} (não numéricos)")
+	return "\n".join(lines)
+
+
+def read_stats_input() -> StreamingStats:
+	"""Lê números do teclado até uma linha vazia (comando 's')."""
+	stats = StreamingStats()
+	print("Digite ou cole os números (separados por espaço, ';' ou linha); linha vazia encerra.")
+	while True:
+		try:
+			line = input()
+		except EOFError:
+			break
+		if not line.strip():
+			break
+		stats.add_text(line)
+	return stats
+
+
+def describe_variable(cell: Cell) -> str:
+	"""'nome = valor' ou 'nome = erro: mensagem' (atribuições e comando 'v')."""
+	if cell.error is not None:
+		return f"{cell.name} = erro: {describe_error(cell.error, cell.source)}"
+	return f"{cell.name} = {format_number(cell.value)}"
+
+
+# "_" fora de um nome, para linhas que o tokenizador não aceita (ex.: apelidos do caminho rápido)
+_LAST_RESULT_WORD = re.compile(r"(?<![^\W_])_(?![^\W_])")
+
+
+def _uses_last_result(text: str) -> bool:
+	"""Se a linha usa '_' (o último resultado), e não só como parte de um nome ('minha_taxa')."""
+	if "_" not in text:
+		return False
+	try:
+		return any(token.kind == "last" for token in tokenize(text))
+	except ExpressionSyntaxError:
+		return _LAST_RESULT_WORD.search(text) is not None
+
+
+def iter_batch_results(
+	lines: Iterable[str],
+	first_line_number: int = 1,
+	chain_last_result: bool = True,
+	exact: bool = False,
+) -> Iterator[Tuple[bool, str]]:
+	"""Avalia uma expressão por linha, de forma preguiçosa, mantendo o encadeamento com '_'.
+
+	Linhas vazias, comentários (iniciados por '#'), 'h', 'v', 's' e 'm' são ignorados; 'c' limpa o
+	último resultado, 'del nome' apaga uma variável e 'q'/'0'/'sair' encerram a leitura, como no
+	modo interativo. Cada expressão ou atribuição ("nome = expressão") produz exatamente um par
+	(sucesso, texto): o resultado formatado ou a mensagem de erro.
+	Com `chain_last_result=False` (lote em paralelo), linhas com '_' e atribuições são rejeitadas.
+	"""
 	last_result: Optional[float] = None
-	history: List[str] = []
+	variables = VariableGraph(exact)
+	for line_number, raw_line in enumerate(lines, start=first_line_number):
+		text = raw_line.strip()
+		if not text or text.startswith("#"):
+			continue
+		command = text.lower()
+		if command in EXIT_COMMANDS:
+			return
+		if not chain_last_result and _uses_last_result(text):
+			yield False, f"Erro (linha {line_number}): '_' não é suportado no lote em paralelo (use --workers 1): {text}"
+			continue
+		if command in ("h", "v", "s", "m"):
+			continue
+		if command == "c":
+			last_result = None
+			continue
+		if command.startswith("del "):
+			name = text[4:].strip()
+			if name in variables:
+				variables.delete(name)
+			continue
+		assignment = parse_assignment(text)
+		if assignment is not None:
+			if not chain_last_result:
+				yield False, f"Erro (linha {line_number}): atribuições não são suportadas no lote em paralelo (use --workers 1): {text}"
+				continue
+			name, expression = assignment
+			try:
+				variables.set(name, expression, last_result)
+			except (ArithmeticError, ValueError) as error:
+				yield False, f"Erro (linha {line_number}): {describe_error(error, expression)}"
+				continue
+			cell = variables.get(name)
+			if cell.error is not None:
+				yield False, f"Erro (linha {line_number}): {describe_variable(cell)}"
+				continue
+			last_result = cell.value
+			yield True, describe_variable(cell)
+			continue
+		try:
+			result = evaluate_line(text, last_result, exact, variables.values)
+		except (ArithmeticError, ValueError) as error:
+			yield False, f"Erro (linha {line_number}): {describe_error(error, text)}"
+			continue
+		last_result = result
+		yield True, format_number(result)
+
+
+def run_batch(lines: Iterable[str], writer: TextIO, exact: bool = False) -> int:
+	"""Escreve no writer um resultado (ou erro) por expressão. Retorna a quantidade de erros."""
+	error_count = 0
+	write = writer.write
+	for ok, text in iter_batch_results(lines, exact=exact):
+		write(text)
+		write("\n")
+		if not ok:
+			error_count += 1
+	writer.flush()
+	return error_count
+
+
+def evaluate_chunk(
+	chunk: Tuple[int, List[str]],
+	exact: bool = False,
+	collect_metrics: bool = False,
+) -> Tuple[str, int, bool, Optional[Dict[str, OperatorMetrics]]]:
+	"""Avalia um bloco de linhas em um processo de trabalho.
+
+	Retorna (saída já formatada, quantidade de erros, se o bloco contém 'q'/'0'/'sair',
+	métricas do bloco ou None). Com `collect_metrics`, as métricas do processo de trabalho
+	são zeradas no início do bloco e devolvidas para serem somadas no processo principal.
+	"""
+	first_line_number, lines = chunk
+	metrics.enabled = collect_metrics
+	if collect_metrics:
+		metrics.reset()
+	stopped = False
+	for index, line in enumerate(lines):
+		if line.strip().lower() in EXIT_COMMANDS:
+			lines = lines[:index]
+			stopped = True
+			break
+	output: List[str] = []
+	error_count = 0
+	for ok, text in iter_batch_results(lines, first_line_number, chain_last_result=False, exact=exact):
+		output.append(text)
+		if not ok:
+			error_count += 1
+	output.append("")
+	chunk_metrics = metrics.operators if collect_metrics else None
+	return "\n".join(output) if len(output) > 1 else "", error_count, stopped, chunk_metrics
+
+
+def iter_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+	"""Agrupa as linhas em blocos (número da primeira linha, linhas), sem ler tudo de uma vez."""
+	iterator = iter(lines)
+	first_line_number = 1
+	while True:
+		chunk = list(itertools.islice(iterator, chunk_size))
+		if not chunk:
+			return
+		yield first_line_number, chunk
+		first_line_number += len(chunk)
+
+
+def run_parallel_batch(
+	lines: Iterable[str],
+	writer: TextIO,
+	workers: int,
+	chunk_size: int = DEFAULT_CHUNK_SIZE,
+	exact: bool = False,
+) -> int:
+	"""Lote em paralelo: blocos avaliados em um pool de processos, escritos na ordem da entrada.
+
+	Cada linha é independente: '_' não é suportado neste modo (a linha recebe um erro).
+	No máximo 2 blocos por processo ficam em andamento, então a memória não depende do
+	tamanho da entrada. Retorna a quantidade de erros.
+	"""
+	error_count = 0
+	chunks = iter_chunks(lines, chunk_size)
+	# As métricas de cada bloco voltam com o resultado e são somadas às deste processo
+	evaluate = functools.partial(evaluate_chunk, exact=exact, collect_metrics=metrics.enabled)
+	# Os processos de trabalho usam o mesmo backend numérico deste processo
+	backend = current_backend()
+	backend_args = (backend.name, getattr(backend, "precision", DEFAULT_PRECISION))
+	# Importado só aqui: carregar concurrent.futures.process custa ~30 ms em toda inicialização
+	from concurrent.futures import ProcessPoolExecutor
+
+	with ProcessPoolExecutor(max_workers=workers, initializer=use_backend, initargs=backend_args) as executor:
+		pending: Deque["Future[Tuple[str, int, bool, Optional[Dict[str, OperatorMetrics]]]]"] = deque(
+			executor.submit(evaluate, chunk) for chunk in itertools.islice(chunks, workers * 2)
+		)
+		while pending:
+			output, chunk_errors, stopped, chunk_metrics = pending.popleft().result()
+			writer.write(output)
+			error_count += chunk_errors
+			if chunk_metrics:
+				metrics.merge(chunk_metrics)
+			if stopped:
+				for future in pending:
+					future.cancel()
+				break
+			next_chunk = next(chunks, None)
+			if next_chunk is not None:
+				pending.append(executor.submit(evaluate, next_chunk))
+	writer.flush()
+	return error_count
+
+
+def main(
+	history_size: Optional[int] = None,
+	history_store: Optional[SQLiteHistoryStore] = None,
+	exact: bool = False,
+) -> None:
+	"""Loop interativo. Com `history_store`, o histórico também é persistido e o 'h' lê dele."""
+	last_result: Optional[float] = None
+	history: RingHistory[str] = RingHistory(history_size or history_capacity(DEFAULT_HISTORY_SIZE))
+	variables = VariableGraph(exact)
+
+	def record(expression: str, formatted_result: str, operation: Optional[str]) -> None:
+		history.append(f"{expression} = {formatted_result}")
+		if history_store is not None:
+			history_store.append(expression, formatted_result, operation)
 
 	while True:
 		print_menu(last_result)
-		choice = input("Escolha uma opção ou digite uma expressão (ex.: 2+3, _*4): ").strip()
+		choice = input("Escolha uma opção ou digite uma expressão (ex.: 2+3, _*4, taxa = 0.05): ").strip()
 
 		# Atalhos de saída
-		if choice.lower() in {"0", "q", "sair"}:
+		if choice.lower() in EXIT_COMMANDS:
 			print("Até mais!")
 			break
 
+		# Atribuição (ex.: taxa = 0.05, total = base * (1 + taxa)): recalcula as dependentes
+		assignment = parse_assignment(choice)
+		if assignment is not None:
+			name, expression = assignment
+			try:
+				updated = variables.set(name, expression, last_result)
+			except (ArithmeticError, ValueError) as error:
+				print(f"Erro: {describe_error(error, expression)}")
+				continue
+			for updated_name in updated:
+				print(("" if updated_name == name else "  ↳ ") + describe_variable(variables.get(updated_name)))
+			cell = variables.get(name)
+			if cell.error is None:
+				last_result = cell.value
+				record(f"{name} = {expression}", format_number(cell.value), None)
+			continue
+
 		# Expressão rápida (ex.: 2+3, 4 ** 2, _ / 10)
-		expr = try_parse_expression(choice, last_result)
+		expr = try_parse_expression(choice, last_result, exact)
 		if expr is not None:
 			number_a, operator_label, number_b = expr
-			if operator_label == "+":
-				result = add_numbers(number_a, number_b)
-			elif operator_label == "-":
-				result = subtract_numbers(number_a, number_b)
-			elif operator_label == "*":
-				result = multiply_numbers(number_a, number_b)
-			elif operator_label == "/":
-				result = divide_numbers(number_a, number_b)
-			elif operator_label == "**":
-				result = power_numbers(number_a, number_b)
-			elif operator_label == "%":
-				result = modulo_numbers(number_a, number_b)
-			else:  # //
-				result = floor_divide_numbers(number_a, number_b)
+			result = compute_expression(number_a, operator_label, number_b)
 
 			if result is not None:
 				formatted_a = format_number(number_a)
@@ -174,62 +559,94 @@ def main() -> None:
 				formatted_result = format_number(result)
 				print(f"Resultado: {formatted_a} {operator_label} {formatted_b} = {formatted_result}")
 				last_result = result
-				history.append(f"{formatted_a} {operator_label} {formatted_b} = {formatted_result}")
-				if len(history) > 20:
-					history.pop(0)
+				record(f"{formatted_a} {operator_label} {formatted_b}", formatted_result, operator_label)
 			continue
 
 		# Comandos utilitários
 		if choice.lower() == "h":
-			if not history:
+			if history_store is not None:
+				items = [f"{entry.expression} = {entry.result}" for entry in reversed(history_store.page(10))]
+			else:
+				items = history.last(10)
+			if not items:
 				print("Histórico vazio.")
 			else:
 				print("\n— Histórico —")
-				for item in history[-10:]:
+				for item in items:
 					print(item)
 			continue
+		if choice.lower() == "m":
+			print("\n— Métricas —")
+			print(metrics.format_table())
+			if operacoes.operation_cache is not None:
+				print(operacoes.operation_cache.describe())
+			continue
 		if choice.lower() == "c":
 			last_result = None
 			print("Último resultado limpo.")
 			continue
+		if choice.lower() == "s":
+			stats = read_stats_input()
+			print("\n— Estatísticas —")
+			print(format_stats(stats) if stats.count or stats.invalid else "Nenhum número informado.")
+			if stats.count:
+				last_result = stats.total
+			continue
+		if choice.lower() == "v":
+			if not variables:
+				print("Nenhuma variável definida.")
+			else:
+				print("\n— Variáveis —")
+				for cell in variables:
+					print(f"{describe_variable(cell)}    ({cell.source})")
+			continue
+		if choice.lower().startswith("del "):
+			name = choice[4:].strip()
+			if name not in variables:
+				print(f"Variável não definida: {name}")
+				continue
+			updated = variables.delete(name)
+			print(f"Variável {name} apagada.")
+			for updated_name in updated:
+				print("  ↳ " + describe_variable(variables.get(updated_name)))
+			continue
 
 		# Menu numérico tradicional
-		if choice not in {"1", "2", "3", "4", "5", "6", "7"}:
-			print("Opção inválida. Tente novamente.")
+		if choice not in MENU_OPERATORS:
+			# Expressão completa (ex.: (2+3)*_**2)
+			try:
+				result = metrics.measure("expressão", evaluate_expression, choice, last_result, exact, variables.values)
+			except ExpressionSyntaxError:
+				print("Opção inválida. Tente novamente.")
+				continue
+			except DivisionByZero as error:
+				print(f"Erro: {ZERO_DIVISOR_MESSAGES[error.operator]}")
+				continue
+			except OverflowError:
+				print("Erro: resultado grande demais para ser representado.")
+				continue
+			except InvalidOperation:
+				print("Erro: operação sem resultado definido.")
+				continue
+			except (ExpressionError, ArithmeticError) as error:
+				print(f"Erro: {error}.")
+				continue
+			formatted_result = format_number(result)
+			print(f"Resultado: {choice} = {formatted_result}")
+			last_result = result
+			record(choice, formatted_result, None)
 			continue
 
 		try:
 			prompt_a = "Digite o primeiro número"
-			number_a = parse_number(prompt_a + ": ", default_value=last_result)
-			number_b = parse_number("Digite o segundo número: ")
+			number_a = parse_number(prompt_a + ": ", default_value=last_result, exact=exact)
+			number_b = parse_number("Digite o segundo número: ", exact=exact)
 		except UserCancelledInput:
 			print("Operação cancelada.")
 			continue
 
-		result: Optional[float]
-		operation_label: str
-
-		if choice == "1":
-			result = add_numbers(number_a, number_b)
-			operation_label = "+"
-		elif choice == "2":
-			result = subtract_numbers(number_a, number_b)
-			operation_label = "-"
-		elif choice == "3":
-			result = multiply_numbers(number_a, number_b)
-			operation_label = "*"
-		elif choice == "4":
-			result = divide_numbers(number_a, number_b)
-			operation_label = "/"
-		elif choice == "5":
-			result = power_numbers(number_a, number_b)
-			operation_label = "**"
-		elif choice == "6":
-			result = modulo_numbers(number_a, number_b)
-			operation_label = "%"
-		else:  # choice == "7"
-			result = floor_divide_numbers(number_a, number_b)
-			operation_label = "//"
+		operation_label = MENU_OPERATORS[choice]
+		result = compute_expression(number_a, operation_label, number_b)
 
 		if result is not None:
 			formatted_a = format_number(number_a)
@@ -237,10 +654,232 @@ def main() -> None:
 			formatted_result = format_number(result)
 			print(f"Resultado: {formatted_a} {operation_label} {formatted_b} = {formatted_result}")
 			last_result = result
-			history.append(f"{formatted_a} {operation_label} {formatted_b} = {formatted_result}")
-			if len(history) > 20:
-				history.pop(0)
+			record(f"{formatted_a} {operation_label} {formatted_b}", formatted_result, operation_label)
+
+
+def write_metrics(path: str) -> None:
+	"""Grava as métricas no formato texto do Prometheus (ex.: para o textfile collector)."""
+	with open(path, "w", encoding="utf-8") as metrics_file:
+		metrics_file.write(metrics.to_prometheus())
+
+
+def run_binary(input_path: str, operator_symbol: str, operand: Optional[str], output_path: str, chunk_elements: int) -> int:
+	"""Modo --binary: operação elemento a elemento entre arquivos float64 mapeados na memória."""
+	# NumPy só é carregado neste modo
+	from binario import run_binary_operation
+
+	value: Union[str, float, None] = operand
+	if operand is not None:
+		try:
+			value = float(parse_operand(operand))
+		except ValueError:
+			value = operand  # não é número: caminho de arquivo
+
+	def progress(done: int, total: int) -> None:
+		print(f"\r{done}/{total} elementos ({done / total:.0%})", end="", file=sys.stderr, flush=True)
+
+	try:
+		summary = run_binary_operation(input_path, operator_symbol, value, output_path, chunk_elements, progress)
+	except (OSError, ValueError) as error:
+		print(f"Erro: {error}", file=sys.stderr)
+		return 1
+	if summary.elements:
+		print(file=sys.stderr)
+	print(
+		f"{summary.elements} elementos em {summary.seconds:.2f} s "
+		f"({summary.bytes_per_second / 1e6:.0f} MB/s); "
+		f"divisores zero: {summary.zero_divisors}; sem valor (NaN): {summary.undefined}",
+		file=sys.stderr,
+	)
+	return 1 if summary.undefined else 0
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+	"""Ponto de entrada da linha de comando: modo interativo ou em lote."""
+	parser = argparse.ArgumentParser(description="Calculadora simples em Python")
+	parser.add_argument(
+		"--batch",
+		nargs="?",
+		const="-",
+		metavar="ARQUIVO",
+		help="avalia uma expressão por linha do arquivo (ou da entrada padrão com '-' ou sem argumento)",
+	)
+	parser.add_argument(
+		"--history-size",
+		type=int,
+		metavar="N",
+		help=f"quantidade de operações mantidas no histórico (padrão: {DEFAULT_HISTORY_SIZE})",
+	)
+	parser.add_argument(
+		"--history-db",
+		metavar="ARQUIVO",
+		default=history_db_path(),
+		help="arquivo SQLite onde o histórico é persistido (padrão: CALCULADORA_HISTORY_DB)",
+	)
+	parser.add_argument(
+		"--workers",
+		type=int,
+		default=1,
+		metavar="N",
+		help="processos no modo em lote; 0 usa todos os núcleos (padrão: 1, sequencial, com '_')",
+	)
+	parser.add_argument(
+		"--chunk-size",
+		type=int,
+		default=DEFAULT_CHUNK_SIZE,
+		metavar="LINHAS",
+		help=f"linhas por bloco no lote em paralelo (padrão: {DEFAULT_CHUNK_SIZE})",
+	)
+	parser.add_argument(
+		"--exact",
+		action="store_true",
+		help="mantém inteiros exatos (sem conversão para float); 'a ** b % m' usa exponenciação modular",
+	)
+	parser.add_argument(
+		"--backend",
+		choices=BACKEND_NAMES,
+		default="float",
+		help="aritmética usada: float (padrão), decimal (precisão fixa) ou fraction (racionais exatos)",
+	)
+	parser.add_argument(
+		"--precision",
+		type=int,
+		default=DEFAULT_PRECISION,
+		metavar="DÍGITOS",
+		help=f"dígitos significativos do backend decimal (padrão: {DEFAULT_PRECISION})",
+	)
+	parser.add_argument(
+		"--metrics",
+		action="store_true",
+		help="mede chamadas, erros e latência por operador ('m' mostra; no lote, resumo na saída de erro)",
+	)
+	parser.add_argument(
+		"--metrics-file",
+		metavar="ARQUIVO",
+		help="ao terminar, grava as métricas no formato texto do Prometheus (liga --metrics)",
+	)
+	parser.add_argument(
+		"--memo",
+		nargs="?",
+		const=4096,
+		type=int,
+		metavar="ENTRADAS",
+		help="guarda resultados de potências e raízes repetidas (padrão: 4096 entradas)",
+	)
+	parser.add_argument(
+		"--memo-policy",
+		choices=EVICTION_POLICIES,
+		default="lru",
+		help="remoção quando o cache enche: lru (padrão) ou size (maiores primeiro)",
+	)
+	parser.add_argument(
+		"--binary",
+		metavar="ARQUIVO",
+		help="arquivo float64 (cru ou .npy) processado elemento a elemento; requer --op e --output (NumPy)",
+	)
+	parser.add_argument("--op", metavar="OPERADOR", help="operador aplicado no modo --binary (ex.: '*', '/', '**', '√')")
+	parser.add_argument(
+		"--operand",
+		metavar="ARQUIVO|NÚMERO",
+		help="segundo operando do modo --binary: outro arquivo float64 ou um número",
+	)
+	parser.add_argument("--output", metavar="ARQUIVO", help="arquivo de saída do modo --binary")
+	parser.add_argument(
+		"--binary-chunk",
+		type=int,
+		default=1 << 20,
+		metavar="ELEMENTOS",
+		help="elementos por bloco no modo --binary (padrão: 1048576)",
+	)
+	parser.add_argument(
+		"--stats",
+		nargs="?",
+		const="-",
+		metavar="ARQUIVO",
+		help="resume os números do arquivo (ou da entrada padrão): soma, média, variância, mínimo/máximo e quantis",
+	)
+	args = parser.parse_args(argv)
+	if args.stats is not None:
+		stats = StreamingStats()
+		try:
+			if args.stats == "-":
+				stats.add_lines(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace"))
+			else:
+				with open(args.stats, "r", encoding="utf-8", errors="replace") as reader:
+					stats.add_lines(reader)
+		except OSError as error:
+			print(f"Erro: {error}", file=sys.stderr)
+			return 1
+		print(format_stats(stats))
+		return 0 if stats.count else 1
+	if args.binary is not None:
+		if args.op is None or args.output is None:
+			parser.error("--binary requer --op e --output")
+		if args.binary_chunk < 1:
+			parser.error("--binary-chunk deve ser maior que zero")
+		return run_binary(args.binary, args.op, args.operand, args.output, args.binary_chunk)
+	if args.memo is not None:
+		if args.memo < 1:
+			parser.error("--memo deve ser maior que zero")
+		use_operation_cache(OperationCache(max_entries=args.memo, policy=args.memo_policy))
+	if args.metrics or args.metrics_file:
+		metrics.enabled = True
+	if args.precision < 1:
+		parser.error("--precision deve ser maior que zero")
+	use_backend(args.backend, args.precision)
+	if args.workers < 0:
+		parser.error("--workers deve ser zero ou positivo")
+	if args.chunk_size < 1:
+		parser.error("--chunk-size deve ser maior que zero")
+	workers = args.workers or os.cpu_count() or 1
+	if args.history_size is not None and args.history_size < 1:
+		parser.error("--history-size deve ser maior que zero")
+
+	batch_source = args.batch
+	if batch_source is None and not sys.stdin.isatty():
+		batch_source = "-"
+	if batch_source is None:
+		history_store = SQLiteHistoryStore(args.history_db) if args.history_db else None
+		try:
+			main(args.history_size, history_store, args.exact)
+		finally:
+			if history_store is not None:
+				history_store.close()
+			if args.metrics_file:
+				write_metrics(args.metrics_file)
+		return 0
+
+	def process(reader: Iterable[str]) -> int:
+		if workers > 1:
+			return run_parallel_batch(reader, writer, workers, args.chunk_size, args.exact)
+		return run_batch(reader, writer, args.exact)
+
+	writer = open(sys.stdout.fileno(), "w", buffering=BATCH_BUFFER_SIZE, encoding="utf-8", closefd=False)
+	try:
+		if batch_source == "-":
+			error_count = process(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace"))
+		else:
+			with open(batch_source, "r", encoding="utf-8", errors="replace") as reader:
+				error_count = process(reader)
+	except BrokenPipeError:
+		return 1
+	except OSError as error:
+		# Arquivo do lote ausente ou ilegível
+		print(f"Erro: {error}", file=sys.stderr)
+		return 1
+	finally:
+		try:
+			writer.close()
+		except BrokenPipeError:
+			pass
+		if metrics.enabled:
+			print(metrics.format_table(), file=sys.stderr)
+		if operacoes.operation_cache is not None:
+			print(operacoes.operation_cache.describe(), file=sys.stderr)
+		if args.metrics_file:
+			write_metrics(args.metrics_file)
+	return 1 if error_count else 0
 
 
 if __name__ == "__main__":
-	main()
\ No newline at end of file
+	sys.exit(cli())
\ No newline at end of file
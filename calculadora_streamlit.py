@@ -5,13 +5,25 @@ Uma calculadora web moderna criada com Streamlit, mantendo todas as funcionalida
 da calculadora Python original mas com uma interface gráfica elegante.
 """
 
+import io
+import os
+import re
+import tempfile
+import time
+import uuid
 import streamlit as st
-import pandas as pd
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
+from decimal import Decimal
+from fractions import Fraction
 from typing import List, Dict, Optional
-import math
+
+from estatisticas import OperationStats, StreamingStats, round_significant
+from historico import ColumnarHistory, SQLiteHistoryStore, history_capacity, history_db_path
+from instrumentacao import metrics
+from memoizacao import OperationCache, memo_entries
+from numeros import BACKEND_NAMES, DEFAULT_PRECISION, NumericBackend, format_decimal, format_fraction, get_backend
+from operacoes import DivisionByZero, UnknownOperator, apply_operation, use_operation_cache
+from variaveis import VariableGraph, parse_assignment
 
 # Configuração da página
 st.set_page_config(
@@ -101,8 +113,64 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Capacidade padrão do histórico por sessão (CALCULADORA_HISTORY_SIZE altera)
+HISTORY_SIZE = 50
+
+# Parâmetro da URL que identifica o dono do histórico persistente (CALCULADORA_HISTORY_DB)
+HISTORY_OWNER_PARAM = "historico"
+_HISTORY_OWNER = re.compile(r"[A-Za-z0-9_-]{8,64}")
+
+# Rótulos dos backends numéricos na barra lateral
+BACKEND_LABELS = {
+    "float": "Ponto flutuante (float)",
+    "decimal": "Decimal (precisão fixa)",
+    "fraction": "Frações exatas",
+}
+
+# Resultados do cálculo em lote ficam em disco até o download; os de sessões abandonadas
+# são apagados depois de BULK_RESULT_MAX_AGE segundos
+BULK_RESULT_DIR = os.path.join(tempfile.gettempdir(), "calculadora-lote")
+BULK_RESULT_MAX_AGE = 3600
+
+def prune_bulk_results(max_age: float = BULK_RESULT_MAX_AGE):
+    """Apaga resultados de lote mais antigos que `max_age` segundos"""
+    limit = time.time() - max_age
+    try:
+        entries = list(os.scandir(BULK_RESULT_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < limit:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+@st.cache_resource
+def get_history_store(path: str) -> SQLiteHistoryStore:
+    """Histórico persistente compartilhado pelo processo (uma conexão para todas as sessões;
+    cada sessão lê e limpa só as próprias entradas, pela coluna owner)"""
+    return SQLiteHistoryStore(path)
+
+@st.cache_resource
+def get_sample_cache():
+    """Blocos amostrados dos gráficos, compartilhados por todas as sessões do processo"""
+    from grafico import SampleCache
+    return SampleCache()
+
+@st.cache_resource
+def get_operation_cache() -> Optional[OperationCache]:
+    """Cache de resultados do processo (CALCULADORA_MEMO=entradas), instalado uma única vez
+    e compartilhado por todas as sessões; None quando desligado"""
+    entries = memo_entries()
+    return use_operation_cache(OperationCache(max_entries=entries) if entries is not None else None)
+
 class CalculadoraStreamlit:
     def __init__(self):
+        db_path = history_db_path()
+        self.history_store = get_history_store(db_path) if db_path else None
+        # Instala o cache de resultados do processo na primeira execução (não muda por sessão)
+        get_operation_cache()
         self.initialize_session_state()
     
     def initialize_session_state(self):
@@ -116,12 +184,78 @@ class CalculadoraStreamlit:
         if 'waiting_for_operand' not in st.session_state:
             st.session_state.waiting_for_operand = False
         if 'history' not in st.session_state:
-            st.session_state.history = []
+            st.session_state.history = ColumnarHistory(history_capacity(HISTORY_SIZE))
+        if 'history_owner' not in st.session_state:
+            st.session_state.history_owner = self.stable_history_owner() if self.history_store is not None else None
         if 'memory' not in st.session_state:
             st.session_state.memory = 0
+        if 'stats' not in st.session_state:
+            # Agregados incrementais; com histórico persistente, parte das contagens já gravadas
+            initial_counts = (
+                self.history_store.operation_counts(st.session_state.history_owner)
+                if self.history_store is not None
+                else None
+            )
+            st.session_state.stats = OperationStats(initial_counts)
+        if 'chart_cache' not in st.session_state:
+            st.session_state.chart_cache = (None, None)  # (versão das estatísticas, figura)
+        if 'numeric_backend' not in st.session_state:
+            st.session_state.numeric_backend = "float"
+        if 'decimal_precision' not in st.session_state:
+            st.session_state.decimal_precision = DEFAULT_PRECISION
+        if 'variables' not in st.session_state:
+            st.session_state.variables = VariableGraph()
+        if 'graph_range' not in st.session_state:
+            st.session_state.graph_range = (-10.0, 10.0)
+    
+    @staticmethod
+    def stable_history_owner() -> str:
+        """Dono do histórico persistente, guardado na URL (?historico=...): sobrevive a recarregar
+        a página e a reiniciar o servidor; quem abre o mesmo endereço vê o mesmo histórico"""
+        owner = st.query_params.get(HISTORY_OWNER_PARAM, "")
+        if not _HISTORY_OWNER.fullmatch(owner):
+            owner = uuid.uuid4().hex
+            st.query_params[HISTORY_OWNER_PARAM] = owner
+        return owner
+    
+    @property
+    def backend(self) -> NumericBackend:
+        """Backend numérico da sessão (instância compartilhada; o contexto decimal é reutilizado)"""
+        return get_backend(st.session_state.numeric_backend, st.session_state.decimal_precision)
+    
+    def show_value(self, value):
+        """Mostra um valor calculado no visor, guardando o número exato ao lado do texto
+        (o texto pode ser aproximado, ex.: "1.63e+4771 (4772 dígitos)", ou de outro backend)"""
+        st.session_state.display = self.format_number(value)
+        st.session_state.display_value = (st.session_state.display, value)
+    
+    def parse_display(self):
+        """Converte o visor para o tipo numérico do backend da sessão
+        
+        Raises:
+            ValueError: visor que não é um número neste backend (ex.: "Infinity" em frações).
+        """
+        backend = self.backend
+        backend.activate()
+        text = st.session_state.display
+        stored = st.session_state.get('display_value')
+        try:
+            if stored is not None and stored[0] == text:
+                # Valor exato do último resultado, convertido se o backend mudou
+                return backend.convert(stored[1])
+            return backend.parse(text)
+        except (ArithmeticError, ValueError):
+            label = BACKEND_LABELS.get(st.session_state.numeric_backend, st.session_state.numeric_backend)
+            raise ValueError(f"o valor do visor ({text}) não pode ser usado com {label}") from None
     
     def format_number(self, value: float) -> str:
         """Formata números para exibição amigável"""
+        # float (o caso comum) pula as checagens de Decimal e Fraction (ABC, mais lentas)
+        if type(value) is not float:
+            if isinstance(value, Decimal):
+                return format_decimal(value)
+            if isinstance(value, Fraction):
+                return format_fraction(value)
         try:
             # Converte para float primeiro para garantir que é um número
             float_value = float(value)
@@ -170,11 +304,18 @@ class CalculadoraStreamlit:
     
     def clear_history(self):
         """Limpa o histórico"""
-        st.session_state.history = []
+        st.session_state.history.clear()
+        st.session_state.stats.clear()
+        if self.history_store is not None:
+            self.history_store.clear(st.session_state.history_owner)
     
     def perform_operation(self, next_operation: str):
         """Executa operações matemáticas"""
-        input_value = float(st.session_state.display)
+        try:
+            input_value = self.parse_display()
+        except ValueError as e:
+            st.error(f"❌ Erro: {str(e)}")
+            return
         
         if st.session_state.previous_value is None:
             st.session_state.previous_value = input_value
@@ -183,21 +324,17 @@ class CalculadoraStreamlit:
             result = self.calculate_result(current_value, input_value, st.session_state.operation)
             
             if result is not None:
-                # Adiciona ao histórico
-                history_item = {
-                    'timestamp': datetime.now(),
-                    'expression': f"{self.format_number(current_value)} {st.session_state.operation} {self.format_number(input_value)}",
-                    'result': self.format_number(result),
-                    'operation': st.session_state.operation
-                }
-                st.session_state.history.append(history_item)
-                
-                # Limita o histórico a 50 itens
-                if len(st.session_state.history) > 50:
-                    st.session_state.history.pop(0)
-                
+                operation = st.session_state.operation
                 formatted_result = self.format_number(result)
-                st.session_state.display = formatted_result
+                # Histórico em colunas (sobrescreve o mais antigo em O(1)); o texto só é montado na exibição
+                st.session_state.history.append(current_value, operation, input_value, result)
+                st.session_state.stats.record(operation, result)
+                if self.history_store is not None:
+                    # Enfileira a gravação; não bloqueia o cálculo
+                    expression = f"{self.format_number(current_value)} {operation} {self.format_number(input_value)}"
+                    self.history_store.append(expression, formatted_result, operation, owner=st.session_state.history_owner)
+                
+                self.show_value(result)
                 st.session_state.previous_value = result
         
         st.session_state.waiting_for_operand = True
@@ -205,32 +342,17 @@ class CalculadoraStreamlit:
     
     def calculate_result(self, a: float, b: float, operation: str) -> Optional[float]:
         """Calcula o resultado de uma operação"""
+        backend = self.backend
+        backend.activate()
         try:
-            if operation == '+':
-                return a + b
-            elif operation == '-':
-                return a - b
-            elif operation == '×':
-                return a * b
-            elif operation == '÷':
-                if b == 0:
-                    st.error("❌ Erro: Divisão por zero não é permitida!")
-                    return None
-                return a / b
-            elif operation == '^':
-                return a ** b
-            elif operation == 'mod':
-                if b == 0:
-                    st.error("❌ Erro: Módulo por zero não é permitido!")
-                    return None
-                return a % b
-            elif operation == '//':
-                if b == 0:
-                    st.error("❌ Erro: Divisão inteira por zero não é permitida!")
-                    return None
-                return a // b
-            else:
-                return None
+            # Valores de antes de uma troca de backend são convertidos para o tipo atual
+            return apply_operation(operation, backend.convert(a), backend.convert(b))
+        except UnknownOperator:
+            return None
+        except DivisionByZero as e:
+            message = str(e)
+            st.error(f"❌ Erro: {message[:1].upper()}{message[1:]}!")
+            return None
         except Exception as e:
             st.error(f"❌ Erro na operação: {str(e)}")
             return None
@@ -246,8 +368,7 @@ class CalculadoraStreamlit:
     def percentage(self):
         """Calcula porcentagem"""
         try:
-            value = float(st.session_state.display) / 100
-            st.session_state.display = self.format_number(value)
+            self.show_value(self.parse_display() / 100)
         except:
             st.error("❌ Erro ao calcular porcentagem")
     
@@ -255,10 +376,8 @@ class CalculadoraStreamlit:
         """Muda o sinal do número"""
         if st.session_state.display != '0':
             try:
-                # Converte para float, muda o sinal e formata de volta
-                value = float(st.session_state.display)
-                value = -value
-                st.session_state.display = self.format_number(value)
+                # Converte pelo backend, muda o sinal e formata de volta
+                self.show_value(-self.parse_display())
             except ValueError:
                 # Se não conseguir converter, faz a mudança manual
                 if st.session_state.display.startswith('-'):
@@ -269,7 +388,7 @@ class CalculadoraStreamlit:
     def memory_store(self):
         """Armazena valor na memória"""
         try:
-            st.session_state.memory = float(st.session_state.display)
+            st.session_state.memory = self.parse_display()
             formatted_value = self.format_number(st.session_state.memory)
             st.success(f"💾 Valor {formatted_value} armazenado na memória")
         except:
@@ -277,7 +396,7 @@ class CalculadoraStreamlit:
     
     def memory_recall(self):
         """Recupera valor da memória"""
-        st.session_state.display = self.format_number(st.session_state.memory)
+        self.show_value(st.session_state.memory)
         st.session_state.waiting_for_operand = False
     
     def memory_clear(self):
@@ -299,24 +418,46 @@ class CalculadoraStreamlit:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            # Display da calculadora
-            st.markdown(f"""
-            <div class="calculator-display">
-                <div style="font-size: 1.2rem; margin-bottom: 1rem; opacity: 0.8;">
-                    {f"{st.session_state.previous_value} {st.session_state.operation}" if st.session_state.operation and st.session_state.previous_value else ""}
-                </div>
-                <div style="font-size: 3rem; font-family: 'Courier New', monospace;">
-                    {st.session_state.display}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Botões da calculadora
-            self.create_calculator_buttons()
+            # Display e teclado em um fragmento: cada tecla reexecuta só esta parte
+            self.create_keypad()
             
         with col2:
             # Painel lateral com histórico e estatísticas
             self.create_sidebar_panel()
+        
+        self.create_variables_panel()
+        self.create_graph_panel()
+        self.create_list_stats_panel()
+        self.create_upload_panel()
+    
+    @st.fragment
+    def create_keypad(self):
+        """Display e botões da calculadora, reexecutados isoladamente a cada tecla"""
+        display_slot = st.empty()
+        stats_version = st.session_state.stats.version
+        
+        # Botões da calculadora
+        self.create_calculator_buttons()
+        
+        # O display é preenchido depois dos botões para já refletir a tecla pressionada
+        self.render_display(display_slot)
+        
+        # Cálculo concluído: histórico e gráficos mudaram, então a página inteira é atualizada
+        if st.session_state.stats.version != stats_version:
+            st.rerun()
+    
+    def render_display(self, slot):
+        """Desenha o display da calculadora no espaço reservado"""
+        slot.markdown(f"""
+        <div class="calculator-display">
+            <div style="font-size: 1.2rem; margin-bottom: 1rem; opacity: 0.8;">
+                {f"{st.session_state.previous_value} {st.session_state.operation}" if st.session_state.operation and st.session_state.previous_value else ""}
+            </div>
+            <div style="font-size: 3rem; font-family: 'Courier New', monospace;">
+                {st.session_state.display}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
     
     def create_calculator_buttons(self):
         """Cria os botões da calculadora"""
@@ -432,10 +573,9 @@ class CalculadoraStreamlit:
         with col3:
             if st.button("√", key="sqrt", help="Raiz quadrada"):
                 try:
-                    value = float(st.session_state.display)
+                    value = self.parse_display()
                     if value >= 0:
-                        result = math.sqrt(value)
-                        st.session_state.display = self.format_number(result)
+                        self.show_value(apply_operation('√', value))
                         st.session_state.waiting_for_operand = True
                     else:
                         st.error("❌ Não é possível calcular raiz de número negativo")
@@ -460,13 +600,55 @@ class CalculadoraStreamlit:
             if st.button("MC", key="memory_clear", help="Limpar memória"):
                 self.memory_clear()
     
+    def recent_history(self, count: int) -> List[Dict]:
+        """Últimas operações, da mais nova para a mais antiga (do SQLite quando configurado)"""
+        if self.history_store is None:
+            return [
+                {
+                    'timestamp': datetime.fromtimestamp(record.timestamp),
+                    'expression': f"{self.format_number(record.a)} {record.operation} {self.format_number(record.b)}",
+                    'result': self.format_number(record.result),
+                    'value': record.result,
+                    'operation': record.operation,
+                }
+                for record in reversed(st.session_state.history.last(count))
+            ]
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(entry.timestamp),
+                'expression': entry.expression,
+                'result': entry.result,
+                'value': None,  # só o texto é persistido
+                'operation': entry.operation,
+            }
+            for entry in self.history_store.page(count, owner=st.session_state.history_owner)
+        ]
+    
+    def operation_chart(self, stats: OperationStats):
+        """Gráfico de pizza das operações, reconstruído apenas quando as contagens mudam"""
+        cached_version, cached_fig = st.session_state.chart_cache
+        if cached_version == stats.version:
+            return cached_fig
+        # Importação tardia: o Plotly só é carregado quando o primeiro gráfico é desenhado
+        import plotly.express as px
+        fig = px.pie(
+            values=list(stats.counts.values()),
+            names=list(stats.counts.keys()),
+            title="Distribuição de Operações",
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+        fig.update_layout(height=300)
+        st.session_state.chart_cache = (stats.version, fig)
+        return fig
+    
     def create_sidebar_panel(self):
         """Cria o painel lateral com histórico e estatísticas"""
         st.markdown("### 📊 Estatísticas")
         
-        # Métricas principais
-        total_operations = len(st.session_state.history)
-        unique_operations = len(set(item['operation'] for item in st.session_state.history if item['operation']))
+        # Métricas principais (agregados incrementais, custo independente do tamanho do histórico)
+        stats = st.session_state.stats
+        total_operations = stats.total
+        unique_operations = len(stats.counts)
         
         col1, col2 = st.columns(2)
         
@@ -486,17 +668,25 @@ class CalculadoraStreamlit:
             </div>
             """, unsafe_allow_html=True)
         
+        if stats.result_count:
+            st.caption(
+                f"Resultados — mínimo: {self.format_number(stats.minimum)} | "
+                f"máximo: {self.format_number(stats.maximum)} | "
+                f"média: {self.format_number(stats.mean)}"
+            )
+        
         # Histórico
         st.markdown("### 📝 Histórico")
         
-        if st.session_state.history:
+        recent_items = self.recent_history(10)  # Últimas 10 operações
+        if recent_items:
             # Botão para limpar histórico
             if st.button("🗑️ Limpar Histórico", key="clear_history"):
                 self.clear_history()
                 st.rerun()
             
             # Exibir histórico
-            for i, item in enumerate(reversed(st.session_state.history[-10:])):  # Últimas 10 operações
+            for i, item in enumerate(recent_items):
                 with st.expander(f"{item['expression']} = {item['result']}", expanded=False):
                     st.write(f"**Operação:** {item['operation']}")
                     st.write(f"**Resultado:** {item['result']}")
@@ -504,29 +694,305 @@ class CalculadoraStreamlit:
                     
                     # Botão para reutilizar resultado
                     if st.button(f"Reutilizar {item['result']}", key=f"reuse_{i}"):
-                        st.session_state.display = item['result']
+                        if item['value'] is not None:
+                            self.show_value(item['value'])
+                        else:
+                            st.session_state.display = item['result']
                         st.session_state.waiting_for_operand = False
                         st.rerun()
         else:
             st.info("📝 Nenhuma operação realizada ainda. Faça alguns cálculos para ver o histórico aqui!")
         
         # Gráfico de operações
-        if len(st.session_state.history) > 0:
+        if stats.counts:
             st.markdown("### 📈 Gráfico de Operações")
-            
-            # Preparar dados para o gráfico
-            df = pd.DataFrame(st.session_state.history)
-            operation_counts = df['operation'].value_counts()
-            
-            # Criar gráfico de pizza
-            fig = px.pie(
-                values=operation_counts.values,
-                names=operation_counts.index,
-                title="Distribuição de Operações",
-                color_discrete_sequence=px.colors.qualitative.Set3
+            st.plotly_chart(self.operation_chart(stats), use_container_width=True)
+        
+        self.create_metrics_panel()
+    
+    def create_metrics_panel(self):
+        """Contadores e latência por operador (métricas do processo, todas as sessões)"""
+        st.markdown("### ⏱️ Instrumentação")
+        # Configuração do processo (CALCULADORA_METRICS=1 ao iniciar), não de cada sessão:
+        # um visitante não liga nem desliga a coleta para os outros
+        if not metrics.enabled:
+            st.caption("Métricas desligadas. Inicie com `CALCULADORA_METRICS=1` para medir chamadas, erros e latência por operador.")
+        cache = get_operation_cache()
+        if cache is not None:
+            info = cache.info()
+            st.caption(
+                f"Cache: {info['entries']}/{info['max_entries']} entradas, "
+                f"{info['bytes'] / 1024:.1f} KiB | taxa de acerto {info['hit_rate']:.1%} | "
+                f"remoções {info['evictions']}"
+            )
+        rows = metrics.rows()
+        if rows:
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+            st.download_button(
+                "⬇️ Exportar (Prometheus)",
+                metrics.to_prometheus(),
+                file_name="calculadora_metrics.prom",
+                mime="text/plain",
+                key="export_metrics",
+            )
+        else:
+            st.caption("Nenhuma operação medida ainda.")
+    
+    @st.fragment
+    def create_variables_panel(self):
+        """Variáveis nomeadas e fórmulas; mudar uma variável recalcula só as dependentes"""
+        st.markdown("---")
+        st.markdown("### 🔣 Variáveis")
+        variables: VariableGraph = st.session_state.variables
+        
+        with st.form("variable_form", clear_on_submit=True):
+            col_input, col_submit = st.columns([4, 1])
+            text = col_input.text_input(
+                "Definir",
+                placeholder="taxa = 0.05   ou   total = base * (1 + taxa)",
+                label_visibility="collapsed",
             )
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            submitted = col_submit.form_submit_button("Definir")
+        if submitted and text.strip():
+            assignment = parse_assignment(text)
+            if assignment is None:
+                st.error("❌ Use o formato nome = expressão")
+            else:
+                name, expression = assignment
+                try:
+                    updated = variables.set(name, expression)
+                except (ArithmeticError, ValueError) as e:
+                    st.error(f"❌ Erro na fórmula: {str(e)}")
+                else:
+                    if len(updated) > 1:
+                        st.caption("Recalculadas: " + ", ".join(updated[1:]))
+        
+        if not variables:
+            st.caption("Nenhuma variável definida. Fórmulas podem usar outras variáveis e os operadores da calculadora.")
+            return
+        st.dataframe(
+            [
+                {
+                    "nome": cell.name,
+                    "fórmula": cell.source,
+                    "valor": self.format_number(cell.value) if cell.error is None else "",
+                    "erro": str(cell.error) if cell.error is not None else "",
+                }
+                for cell in variables
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+        
+        col_select, col_use, col_store, col_delete = st.columns([2, 1, 1, 1])
+        name = col_select.selectbox("Variável", list(variables.cells), key="selected_variable", label_visibility="collapsed")
+        cell = variables.get(name)
+        if col_use.button("Usar no visor", key="variable_to_display", disabled=cell is None or cell.error is not None):
+            self.show_value(cell.value)
+            st.session_state.waiting_for_operand = False
+            st.rerun()
+        if col_store.button("Guardar visor", key="display_to_variable", help="Atribui o valor do visor à variável"):
+            try:
+                variables.set(name, st.session_state.display.replace(",", "."))
+            except (ArithmeticError, ValueError) as e:
+                st.error(f"❌ Erro: {str(e)}")
+            else:
+                st.rerun(scope="fragment")
+        if col_delete.button("🗑️ Apagar", key="delete_variable"):
+            variables.delete(name)
+            st.rerun(scope="fragment")
+    
+    @st.fragment
+    def create_graph_panel(self):
+        """Gráfico de uma expressão em x, amostrado de forma adaptativa e guardado em blocos"""
+        st.markdown("---")
+        st.markdown("### 📉 Gráfico de Funções")
+        expression = st.text_input(
+            "f(x) =",
+            value="x**2 % 5",
+            key="graph_expression",
+            help="Use x e os operadores da calculadora: + - * / ** // % e √ (ou sqrt(...))",
+        )
+        start, stop = st.session_state.graph_range
+        width = stop - start
+        
+        # Arrastar meia janela ou mudar o zoom em 2x reaproveita os blocos já calculados
+        pan_left, zoom_in, zoom_out, pan_right, reset = st.columns(5)
+        if pan_left.button("◀", key="graph_left", help="Mover para a esquerda"):
+            start, stop = start - width / 2, stop - width / 2
+        if zoom_in.button("🔍 +", key="graph_zoom_in", help="Aproximar"):
+            start, stop = start + width / 4, stop - width / 4
+        if zoom_out.button("🔍 −", key="graph_zoom_out", help="Afastar"):
+            start, stop = start - width / 2, stop + width / 2
+        if pan_right.button("▶", key="graph_right", help="Mover para a direita"):
+            start, stop = start + width / 2, stop + width / 2
+        if reset.button("↺", key="graph_reset", help="Voltar para [-10, 10]"):
+            start, stop = -10.0, 10.0
+        st.session_state.graph_range = (start, stop)
+        if not expression.strip():
+            return
+        
+        # NumPy só é carregado quando há um gráfico para desenhar
+        import plotly.graph_objects as go
+        from grafico import plot_points
+        from expressoes import ExpressionError
+        
+        cache = get_sample_cache()
+        try:
+            samples = plot_points(expression, start, stop, cache)
+        except (ExpressionError, ValueError) as e:
+            st.error(f"❌ Erro no gráfico: {str(e)}")
+            return
+        fig = go.Figure(go.Scatter(x=samples.x, y=samples.y, mode="lines", connectgaps=False, name=expression))
+        fig.update_layout(
+            xaxis_title="x",
+            yaxis_title="f(x)",
+            xaxis_range=[start, stop],
+            margin=dict(l=0, r=0, t=10, b=0),
+            height=380,
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        info = cache.info()
+        st.caption(
+            f"x ∈ [{self.format_number(start)}, {self.format_number(stop)}] | {len(samples.x)} pontos | "
+            f"blocos em cache: {info['size']} (acertos {info['hits']}, calculados {info['misses']})"
+        )
+    
+    @st.fragment
+    def create_list_stats_panel(self):
+        """Soma, média, variância e quantis de uma lista colada ou enviada, em uma passada"""
+        st.markdown("---")
+        st.markdown("### 📐 Estatísticas de Listas")
+        col_paste, col_file = st.columns(2)
+        pasted = col_paste.text_area(
+            "Números",
+            placeholder="1,5 2 3,25\n4; 10",
+            help="Vírgula ou ponto como decimal; separe por espaço, ';' ou quebra de linha",
+            key="list_stats_text",
+        )
+        uploaded = col_file.file_uploader("Ou um arquivo de texto", type=["txt", "csv"], key="list_stats_file")
+        if not pasted.strip() and uploaded is None:
+            return
+        
+        stats = StreamingStats()
+        stats.add_text(pasted)
+        if uploaded is not None:
+            # Lido linha a linha: memória constante mesmo para arquivos grandes
+            uploaded.seek(0)
+            reader = io.TextIOWrapper(uploaded, encoding="utf-8", errors="replace")
+            try:
+                stats.add_lines(reader)
+            finally:
+                reader.detach()  # não fecha o arquivo enviado
+        if not stats.count:
+            st.warning("⚠️ Nenhum número encontrado.")
+            return
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Quantidade", stats.count)
+        col2.metric("Soma", self.format_number(stats.total))
+        col3.metric("Média", self.format_number(stats.mean))
+        col4.metric("Desvio padrão", self.format_number(stats.standard_deviation) if stats.count > 1 else "-")
+        st.dataframe(
+            [
+                {
+                    "estatística": label + (" (≈)" if label.startswith("p") else ""),
+                    "valor": self.format_number(round_significant(value) if label.startswith("p") else value) if value is not None else "-",
+                }
+                for label, value in stats.summary()
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+        if stats.invalid:
+            st.caption(f"{stats.invalid} valores não numéricos ignorados.")
+    
+    @st.fragment
+    def create_upload_panel(self):
+        """Cálculo em lote de um arquivo CSV/Parquet, processado e gravado em blocos"""
+        st.markdown("---")
+        st.markdown("### 📂 Cálculo em Lote")
+        st.caption(
+            "Envie um CSV ou Parquet com as colunas `a`, `op` e `b` (ou uma coluna `expression`). "
+            "Cada linha é calculada em ponto flutuante, com os mesmos operadores e mensagens de erro da calculadora."
+        )
+        uploaded = st.file_uploader("Arquivo", type=["csv", "parquet"], key="bulk_upload")
+        output_format = st.radio("Formato do resultado", ("csv", "parquet"), horizontal=True, key="bulk_format")
+        if uploaded is None:
+            return
+        
+        # pandas/NumPy só são carregados quando um arquivo é enviado
+        import lote_arquivos
+        
+        job = (uploaded.file_id, output_format)
+        if st.session_state.get("bulk_job") != job:
+            self.discard_bulk_result()
+            # O resultado fica em disco (não na sessão): é gravado em blocos e servido do arquivo
+            prune_bulk_results()
+            os.makedirs(BULK_RESULT_DIR, exist_ok=True)
+            output = tempfile.NamedTemporaryFile(
+                prefix="resultado-", suffix=f".{output_format}", dir=BULK_RESULT_DIR, delete=False
+            )
+            output.close()
+            progress = st.progress(0.0, text="Calculando...")
+            total = getattr(uploaded, "size", 0) or 1
+            try:
+                summary = lote_arquivos.process_file(
+                    uploaded,
+                    uploaded.name,
+                    output.name,
+                    output_format,
+                    progress=lambda rows: progress.progress(min(uploaded.tell() / total, 1.0), text=f"{rows:,} linhas".replace(",", ".")),
+                )
+            except Exception as e:
+                os.unlink(output.name)
+                progress.empty()
+                st.error(f"❌ Erro ao processar o arquivo: {str(e)}")
+                return
+            progress.empty()
+            st.session_state.bulk_job = job
+            st.session_state.bulk_result = (output.name, summary)
+        
+        path, summary = st.session_state.bulk_result
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Linhas", f"{summary.rows:,}".replace(",", "."))
+        col2.metric("Calculadas", f"{summary.ok:,}".replace(",", "."))
+        col3.metric("Erros", f"{summary.error_count:,}".replace(",", "."))
+        col4.metric("Média", self.format_number(summary.mean) if summary.mean is not None else "-")
+        if summary.minimum is not None:
+            st.caption(f"Mínimo {self.format_number(summary.minimum)} | máximo {self.format_number(summary.maximum)}")
+        if summary.counts:
+            st.caption("Por operador: " + " | ".join(f"{symbol}: {count}" for symbol, count in sorted(summary.counts.items())))
+        if summary.errors:
+            st.dataframe(lote_arquivos.summary_rows(summary), hide_index=True, use_container_width=True)
+        
+        if path is None or not os.path.exists(path):
+            st.caption("Resultado já baixado (ou expirado). Envie o arquivo de novo para recalcular.")
+            return
+        base_name = os.path.splitext(uploaded.name)[0]
+        with open(path, "rb") as result_file:
+            st.download_button(
+                "⬇️ Baixar resultado",
+                result_file,
+                file_name=f"{base_name}_resultado.{output_format}",
+                mime="text/csv" if output_format == "csv" else "application/octet-stream",
+                key="download_bulk",
+                on_click=self.release_bulk_file,
+            )
+    
+    def release_bulk_file(self):
+        """Apaga o arquivo de resultado depois do download (o resumo continua na tela)"""
+        path, summary = st.session_state.bulk_result
+        if path is not None and os.path.exists(path):
+            os.unlink(path)
+        st.session_state.bulk_result = (None, summary)
+    
+    def discard_bulk_result(self):
+        """Descarta o resultado do lote anterior desta sessão (e o arquivo, se ainda existir)"""
+        previous = st.session_state.pop("bulk_result", None)
+        st.session_state.pop("bulk_job", None)
+        if previous is not None and previous[0] is not None and os.path.exists(previous[0]):
+            os.unlink(previous[0])
     
     def run(self):
         """Executa a aplicação"""
@@ -551,6 +1017,24 @@ def main():
         - ✅ Estatísticas e gráficos
         """)
         
+        st.markdown("---")
+        st.markdown("### 🔢 Aritmética")
+        st.selectbox(
+            "Backend numérico",
+            BACKEND_NAMES,
+            format_func=BACKEND_LABELS.get,
+            key="numeric_backend",
+            help="Decimal e frações evitam artefatos do float como 0.1 + 0.2 = 0.30000000000000004",
+        )
+        if st.session_state.get("numeric_backend") == "decimal":
+            st.number_input(
+                "Precisão (dígitos)",
+                min_value=1,
+                max_value=1000,
+                step=1,
+                key="decimal_precision",
+            )
+        
         st.markdown("---")
         st.markdown("### 🚀 Como usar")
         st.markdown("""
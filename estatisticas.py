@@ -0,0 +1,287 @@
+"""
+Estatísticas incrementais da calculadora
+
+`OperationStats` mantém agregados que são atualizados em O(1) a cada operação
+(contagem por operador, total, mínimo, máximo e média dos resultados), para que os
+painéis não precisem percorrer o histórico inteiro a cada atualização. O atributo
+`version` muda sempre que os agregados mudam, permitindo reaproveitar gráficos já
+construídos enquanto nada mudou.
+
+`StreamingStats` resume listas longas de números em uma passada e memória constante:
+soma (compensada), média e variância (Welford), mínimo, máximo e quantis aproximados por
+um `QuantileSketch` limitado (erro relativo de ~1%, no estilo DDSketch). A entrada em
+texto segue as regras de `parse_number` da CLI: vírgula ou ponto como separador decimal;
+os números são separados por espaços, quebras de linha ou ";".
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import math
+import sys
+
+
+class OperationStats:
+	"""Agregados das operações realizadas, atualizados incrementalmente."""
+
+	__slots__ = ("counts", "total", "result_count", "minimum", "maximum", "mean", "version")
+
+	def __init__(self, counts: Optional[Dict[str, int]] = None) -> None:
+		self.counts: Dict[str, int] = {}
+		self.total = 0
+		self.result_count = 0  # resultados registrados aqui (contagens iniciais não trazem valores)
+		self.minimum: Optional[float] = None
+		self.maximum: Optional[float] = None
+		self.mean: Optional[float] = None
+		self.version = 0
+		if counts:
+			self.counts.update(counts)
+			self.total = sum(counts.values())
+			self.version = 1
+
+	def record(self, operation: Optional[str], result: float) -> None:
+		"""Registra uma operação concluída (Decimal, Fraction e int são convertidos para float)."""
+		try:
+			result = float(result)
+		except OverflowError:
+			# Fração ou inteiro exato grande demais para float (ex.: 9 ^ 400): limitado ao maior float
+			result = sys.float_info.max if result > 0 else -sys.float_info.max
+		if operation:
+			self.counts[operation] = self.counts.get(operation, 0) + 1
+		self.total += 1
+		self.result_count += 1
+		if self.mean is None:
+			self.minimum = self.maximum = self.mean = result
+		else:
+			# result / n - mean / n: sem estourar com valores próximos do maior float
+			self.mean += result / self.result_count - self.mean / self.result_count
+			if result < self.minimum:
+				self.minimum = result
+			if result > self.maximum:
+				self.maximum = result
+		self.version += 1
+
+	def clear(self) -> None:
+		self.counts = {}
+		self.total = 0
+		self.result_count = 0
+		self.minimum = self.maximum = self.mean = None
+		self.version += 1
+
+	def __repr__(self) -> str:
+		return f"OperationStats(total={self.total}, counts={self.counts})"
+
+
+# Quantis mostrados nos resumos
+SUMMARY_QUANTILES = (0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+def round_significant(value: float, digits: int = 3) -> float:
+	"""Arredonda para `digits` algarismos significativos (exibição dos quantis aproximados)."""
+	if value == 0 or not math.isfinite(value):
+		return value
+	return round(value, digits - 1 - math.floor(math.log10(abs(value))))
+
+
+class QuantileSketch:
+	"""Quantis aproximados com erro relativo limitado e memória limitada.
+
+	Cada valor cai em um balde logarítmico de razão gamma = (1 + accuracy) / (1 - accuracy);
+	o quantil devolvido está a no máximo `accuracy` (relativo) do valor exato. Acima de
+	`max_buckets` baldes por sinal, os de menor magnitude são fundidos.
+	"""
+
+	__slots__ = ("accuracy", "max_buckets", "count", "zeros", "_gamma_log", "_gamma", "_positive", "_negative")
+
+	def __init__(self, accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+		if not 0 < accuracy < 1:
+			raise ValueError("accuracy deve estar entre 0 e 1")
+		if max_buckets < 1:
+			raise ValueError("max_buckets deve ser maior que zero")
+		self.accuracy = accuracy
+		self.max_buckets = max_buckets
+		self.count = 0
+		self.zeros = 0
+		self._gamma = (1 + accuracy) / (1 - accuracy)
+		self._gamma_log = math.log(self._gamma)
+		self._positive: Dict[int, int] = {}
+		self._negative: Dict[int, int] = {}
+
+	def add(self, value: float) -> None:
+		self.count += 1
+		if value == 0:
+			self.zeros += 1
+			return
+		store = self._positive if value > 0 else self._negative
+		key = math.ceil(math.log(abs(value)) / self._gamma_log)
+		store[key] = store.get(key, 0) + 1
+		if len(store) > self.max_buckets:
+			self._collapse(store)
+
+	def _collapse(self, store: Dict[int, int]) -> None:
+		# Funde os dois baldes de menor magnitude (o erro cresce só perto de zero)
+		first, second = sorted(store)[:2]
+		store[second] += store.pop(first)
+
+	def _value(self, key: int) -> float:
+		return 2 * self._gamma ** key / (self._gamma + 1)
+
+	def quantile(self, fraction: float) -> Optional[float]:
+		"""Valor aproximado do quantil (0 a 1); None sem valores."""
+		if not 0 <= fraction <= 1:
+			raise ValueError("o quantil deve estar entre 0 e 1")
+		if not self.count:
+			return None
+		# Posto mais próximo (nearest-rank): o quantil alto alcança a cauda (p99 de 5 valores é o máximo)
+		rank = max(math.ceil(fraction * self.count), 1)
+		seen = 0
+		for key in sorted(self._negative, reverse=True):
+			seen += self._negative[key]
+			if seen >= rank:
+				return -self._value(key)
+		seen += self.zeros
+		if seen >= rank:
+			return 0.0
+		for key in sorted(self._positive):
+			seen += self._positive[key]
+			if seen >= rank:
+				return self._value(key)
+		return self._value(max(self._positive))
+
+	def merge(self, other: "QuantileSketch") -> None:
+		"""Soma outro sketch com a mesma precisão (ex.: resultados de blocos)."""
+		if other.accuracy != self.accuracy:
+			raise ValueError("sketches com precisões diferentes")
+		self.count += other.count
+		self.zeros += other.zeros
+		for store, other_store in ((self._positive, other._positive), (self._negative, other._negative)):
+			for key, bucket_count in other_store.items():
+				store[key] = store.get(key, 0) + bucket_count
+			while len(store) > self.max_buckets:
+				self._collapse(store)
+
+	@property
+	def buckets(self) -> int:
+		return len(self._positive) + len(self._negative)
+
+
+class StreamingStats:
+	"""Soma, média, variância (Welford), mínimo, máximo e quantis em uma passada."""
+
+	__slots__ = ("count", "mean", "minimum", "maximum", "invalid", "sketch", "_m2", "_sum", "_compensation")
+
+	def __init__(self, accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+		self.count = 0
+		self.mean = 0.0
+		self.minimum: Optional[float] = None
+		self.maximum: Optional[float] = None
+		self.invalid = 0  # textos que não são números finitos
+		self.sketch = QuantileSketch(accuracy, max_buckets)
+		self._m2 = 0.0
+		self._sum = 0.0
+		self._compensation = 0.0
+
+	def add(self, value: float) -> None:
+		self.count += 1
+		delta = value - self.mean
+		self.mean += delta / self.count
+		self._m2 += delta * (value - self.mean)
+		# Soma de Neumaier: sem perder as parcelas pequenas ao lado de grandes
+		total = self._sum + value
+		if abs(self._sum) >= abs(value):
+			self._compensation += (self._sum - total) + value
+		else:
+			self._compensation += (value - total) + self._sum
+		self._sum = total
+		if self.minimum is None or value < self.minimum:
+			self.minimum = value
+		if self.maximum is None or value > self.maximum:
+			self.maximum = value
+		self.sketch.add(value)
+
+	def update(self, values: Iterable[float]) -> None:
+		for value in values:
+			self.add(value)
+
+	def add_text(self, text: str) -> int:
+		"""Soma os números de um trecho de texto; retorna quantos eram inválidos."""
+		invalid = 0
+		add = self.add
+		for token in text.replace(";", " ").split():
+			try:
+				value = float(token.replace(",", "."))
+			except ValueError:
+				invalid += 1
+				continue
+			if math.isfinite(value):
+				add(value)
+			else:
+				invalid += 1
+		self.invalid += invalid
+		return invalid
+
+	def add_lines(self, lines: Iterable[str]) -> None:
+		"""Consome as linhas uma a uma (arquivo, entrada padrão), com memória constante."""
+		for line in lines:
+			self.add_text(line)
+
+	@property
+	def total(self) -> float:
+		return self._sum + self._compensation
+
+	@property
+	def variance(self) -> Optional[float]:
+		"""Variância amostral (n - 1); None com menos de dois valores."""
+		return self._m2 / (self.count - 1) if self.count > 1 else None
+
+	@property
+	def population_variance(self) -> Optional[float]:
+		return self._m2 / self.count if self.count else None
+
+	@property
+	def standard_deviation(self) -> Optional[float]:
+		variance = self.variance
+		return math.sqrt(variance) if variance is not None else None
+
+	def quantile(self, fraction: float) -> Optional[float]:
+		"""Quantil aproximado, limitado ao intervalo [mínimo, máximo] observado."""
+		value = self.sketch.quantile(fraction)
+		if value is None:
+			return None
+		return min(max(value, self.minimum), self.maximum)
+
+	def merge(self, other: "StreamingStats") -> None:
+		"""Combina com outro resumo (fórmula de Chan para a variância)."""
+		if not other.count:
+			self.invalid += other.invalid
+			return
+		if not self.count:
+			self.mean, self._m2 = other.mean, other._m2
+			self.minimum, self.maximum = other.minimum, other.maximum
+		else:
+			count = self.count + other.count
+			delta = other.mean - self.mean
+			self._m2 += other._m2 + delta * delta * self.count * other.count / count
+			self.mean += delta * other.count / count
+			self.minimum = min(self.minimum, other.minimum)
+			self.maximum = max(self.maximum, other.maximum)
+		self.count += other.count
+		self.invalid += other.invalid
+		self._sum += other._sum
+		self._compensation += other._compensation
+		self.sketch.merge(other.sketch)
+
+	def summary(self) -> List[Tuple[str, Optional[float]]]:
+		"""(rótulo, valor) dos agregados, na ordem de exibição."""
+		rows: List[Tuple[str, Optional[float]]] = [
+			("quantidade", self.count),
+			("soma", self.total if self.count else None),
+			("média", self.mean if self.count else None),
+			("variância", self.variance),
+			("desvio padrão", self.standard_deviation),
+			("mínimo", self.minimum),
+			("máximo", self.maximum),
+		]
+		rows += [(f"p{fraction * 100:g}", self.quantile(fraction)) for fraction in SUMMARY_QUANTILES]
+		return rows
+
+	def __repr__(self) -> str:
+		return f"StreamingStats(count={self.count}, mean={self.mean!r}, invalid={self.invalid})"
@@ -0,0 +1,503 @@
+"""
+Motor de expressões da calculadora
+
+Converte texto como "(2+3)*_**2" ou "-1,5 * (4 // 3)" em uma árvore sintática (AST)
+respeitando precedência, parênteses, menos unário, "_" (último resultado) e decimais com
+vírgula. A árvore é compilada uma única vez em funções Python encadeadas e guardada em
+um cache LRU limitado, indexado pelo texto normalizado (sem espaços).
+
+Precedência (da menor para a maior):
+- "+" e "-" binários
+- "*", "/", "//" e "%"
+- "+" e "-" unários e a raiz quadrada ("√x" ou "sqrt(x)")
+- "**" (associativo à direita; -2**2 == -4, como em Python)
+
+Nomes (ex.: "x", "taxa") são variáveis, resolvidas na avaliação pelo dicionário
+`variables` de `CompiledExpression.evaluate`; `CompiledExpression.variables` lista os
+nomes usados por uma expressão.
+
+No modo exato (`exact=True`), literais inteiros continuam como `int` do Python, então
+"//", "%" e "**" entre inteiros são calculados sem perda de precisão, e o padrão
+"a ** b % m" vira exponenciação modular (`pow(a, b, m)`), sem materializar a potência.
+
+Os literais são convertidos pelo backend numérico ativo (numeros.py): float, Decimal ou
+Fraction. O backend faz parte da chave do cache, já que as constantes são pré-calculadas.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+import operator
+import re
+
+from numeros import NumericBackend, current_backend
+from operacoes import BINARY_SYMBOLS, OPERATIONS, DivisionByZero, exact_power_digits, power_limits
+
+__all__ = [
+	"CompiledExpression",
+	"DivisionByZero",
+	"ExpressionCache",
+	"ExpressionError",
+	"ExpressionSyntaxError",
+	"UndefinedLastResult",
+	"UndefinedVariable",
+	"cache_info",
+	"compile_expression",
+	"evaluate",
+	"normalize_expression",
+	"parse",
+	"tokenize",
+]
+
+
+class ExpressionError(ValueError):
+	"""Erro ao interpretar ou avaliar uma expressão."""
+	pass
+
+
+class ExpressionSyntaxError(ExpressionError):
+	"""O texto não é uma expressão válida."""
+	pass
+
+
+class UndefinedLastResult(ExpressionError):
+	"""A expressão usa '_' mas ainda não existe último resultado."""
+
+	def __init__(self) -> None:
+		super().__init__("'_' usado sem resultado anterior")
+
+
+class UndefinedVariable(ExpressionError):
+	"""A expressão usa uma variável sem valor."""
+
+	def __init__(self, name: str) -> None:
+		super().__init__(f"variável não definida: {name}")
+		self.name = name
+
+
+# ---------------------------------------------------------------------------
+# Tokenização
+# ---------------------------------------------------------------------------
+
+class Token(NamedTuple):
+	kind: str  # "number", "last", "name", "op", "(", ")", "end"
+	text: str
+	position: int
+
+
+_TOKEN_PATTERN = re.compile(
+	r"\s*(?:"
+	r"(?P<number>\d+(?:[.,]\d+)?|[.,]\d+)"
+	r"|(?P<name>[^\W\d_]\w*)"
+	r"|(?P<last>_)"
+	r"|(?P<op>\*\*|//|[+\-*/%√])"
+	r"|(?P<paren>[()])"
+	r")"
+)
+
+
+def tokenize(expression_text: str) -> List[Token]:
+	"""Divide a expressão em tokens. Levanta ExpressionSyntaxError em caracteres inválidos."""
+	tokens: List[Token] = []
+	position = 0
+	length = len(expression_text)
+	while position < length:
+		match = _TOKEN_PATTERN.match(expression_text, position)
+		if match is None or match.end() == position:
+			remaining = expression_text[position:]
+			stripped = remaining.lstrip()
+			if stripped == "":
+				break
+			offset = position + len(remaining) - len(stripped)
+			raise ExpressionSyntaxError(f"caractere inesperado na posição {offset + 1}: {stripped[0]!r}")
+		kind = match.lastgroup
+		text = match.group(kind)
+		tokens.append(Token(text if kind == "paren" else kind, text, match.start(kind)))
+		position = match.end()
+	tokens.append(Token("end", "", length))
+	return tokens
+
+
+# ---------------------------------------------------------------------------
+# Árvore sintática
+# ---------------------------------------------------------------------------
+
+class Number(NamedTuple):
+	value: Union[int, float]
+
+
+class LastResult(NamedTuple):
+	pass
+
+
+class Variable(NamedTuple):
+	name: str
+
+
+class UnaryOp(NamedTuple):
+	operator: str
+	operand: "Node"
+
+
+class BinaryOp(NamedTuple):
+	operator: str
+	left: "Node"
+	right: "Node"
+
+
+Node = Union[Number, LastResult, Variable, UnaryOp, BinaryOp]
+
+_ADDITIVE = {"+", "-"}
+_MULTIPLICATIVE = {"*", "/", "//", "%"}
+
+# Funções de um argumento escritas pelo nome: sqrt(x) equivale a √x
+_FUNCTIONS = {"sqrt": "√"}
+
+
+class _Parser:
+	"""Parser descendente recursivo sobre a lista de tokens."""
+
+	def __init__(self, tokens: List[Token], exact: bool = False, backend: Optional[NumericBackend] = None) -> None:
+		self.tokens = tokens
+		self.index = 0
+		self.exact = exact
+		self.backend = backend or current_backend()
+
+	def peek(self) -> Token:
+		return self.tokens[self.index]
+
+	def advance(self) -> Token:
+		token = self.tokens[self.index]
+		self.index += 1
+		return token
+
+	def parse(self) -> "Node":
+		if self.peek().kind == "end":
+			raise ExpressionSyntaxError("expressão vazia")
+		node = self.parse_additive()
+		token = self.peek()
+		if token.kind != "end":
+			raise ExpressionSyntaxError(f"token inesperado na posição {token.position + 1}: {token.text!r}")
+		return node
+
+	def parse_additive(self) -> "Node":
+		node = self.parse_multiplicative()
+		while self.peek().kind == "op" and self.peek().text in _ADDITIVE:
+			operator_symbol = self.advance().text
+			node = BinaryOp(operator_symbol, node, self.parse_multiplicative())
+		return node
+
+	def parse_multiplicative(self) -> "Node":
+		node = self.parse_unary()
+		while self.peek().kind == "op" and self.peek().text in _MULTIPLICATIVE:
+			operator_symbol = self.advance().text
+			node = BinaryOp(operator_symbol, node, self.parse_unary())
+		return node
+
+	def parse_unary(self) -> "Node":
+		token = self.peek()
+		if token.kind == "op" and token.text in _ADDITIVE:
+			self.advance()
+			operand = self.parse_unary()
+			if token.text == "+":
+				return operand
+			if isinstance(operand, Number):
+				return Number(-operand.value)
+			return UnaryOp("-", operand)
+		if token.kind == "op" and token.text == "√":
+			self.advance()
+			return UnaryOp("√", self.parse_unary())
+		return self.parse_power()
+
+	def parse_power(self) -> "Node":
+		node = self.parse_atom()
+		if self.peek().kind == "op" and self.peek().text == "**":
+			self.advance()
+			# Expoente aceita menos unário e é associativo à direita: 2**-1, 2**3**2
+			node = BinaryOp("**", node, self.parse_unary())
+		return node
+
+	def parse_atom(self) -> "Node":
+		token = self.advance()
+		if token.kind == "number":
+			return Number(self.backend.parse(token.text.replace(",", "."), self.exact))
+		if token.kind == "last":
+			return LastResult()
+		if token.kind == "name":
+			if token.text in _FUNCTIONS and self.peek().kind == "(":
+				return UnaryOp(_FUNCTIONS[token.text], self.parse_atom())
+			return Variable(token.text)
+		if token.kind == "(":
+			node = self.parse_additive()
+			closing = self.advance()
+			if closing.kind != ")":
+				raise ExpressionSyntaxError(f"')' esperado na posição {closing.position + 1}")
+			return node
+		if token.kind == "end":
+			raise ExpressionSyntaxError("expressão incompleta")
+		raise ExpressionSyntaxError(f"token inesperado na posição {token.position + 1}: {token.text!r}")
+
+
+def parse(expression_text: str, exact: bool = False, backend: Optional[NumericBackend] = None) -> "Node":
+	"""Constrói a AST de uma expressão. Com `exact`, literais inteiros viram `int`.
+
+	`backend` converte os literais (padrão: o backend ativo em numeros.py).
+	"""
+	return _Parser(tokenize(expression_text), exact, backend).parse()
+
+
+# ---------------------------------------------------------------------------
+# Compilação
+# ---------------------------------------------------------------------------
+
+Variables = Mapping[str, float]
+Evaluator = Callable[[Optional[float], Optional[Variables]], float]
+
+_UNARY_FUNCTIONS: Dict[str, Callable[[float], float]] = {
+	"-": operator.neg,
+	"√": OPERATIONS["√"].function,
+}
+
+
+def _checked(operator_symbol: str, function: Callable[[float, float], float]) -> Callable[[float, float], float]:
+	def apply(a: float, b: float) -> float:
+		if b == 0:
+			raise DivisionByZero(operator_symbol)
+		return function(a, b)
+	return apply
+
+
+_BINARY_FUNCTIONS: Dict[str, Callable[[float, float], float]] = {
+	symbol: (
+		_checked(symbol, OPERATIONS[symbol].function)
+		if OPERATIONS[symbol].checks_zero_divisor
+		else OPERATIONS[symbol].function
+	)
+	for symbol in BINARY_SYMBOLS
+}
+
+
+def _is_modular_integer_power(base: float, exponent: float, modulus: float) -> bool:
+	return type(base) is int and type(exponent) is int and type(modulus) is int and exponent >= 0
+
+
+def _power_modulo(base: float, exponent: float, modulus: float) -> float:
+	"""(base ** exponent) % modulus; entre inteiros usa pow(base, exponent, modulus)."""
+	if modulus == 0:
+		raise DivisionByZero("%")
+	if _is_modular_integer_power(base, exponent, modulus):
+		return pow(base, exponent, modulus)
+	return _BINARY_FUNCTIONS["%"](_BINARY_FUNCTIONS["**"](base, exponent), modulus)
+
+
+def _is_power_modulo(node: "Node") -> bool:
+	return isinstance(node, BinaryOp) and node.operator == "%" and isinstance(node.left, BinaryOp) and node.left.operator == "**"
+
+
+def _uses_last_result(node: "Node") -> bool:
+	if isinstance(node, LastResult):
+		return True
+	if isinstance(node, UnaryOp):
+		return _uses_last_result(node.operand)
+	if isinstance(node, BinaryOp):
+		return _uses_last_result(node.left) or _uses_last_result(node.right)
+	return False
+
+
+def _variable_names(node: "Node") -> FrozenSet[str]:
+	if isinstance(node, Variable):
+		return frozenset((node.name,))
+	if isinstance(node, UnaryOp):
+		return _variable_names(node.operand)
+	if isinstance(node, BinaryOp):
+		return _variable_names(node.left) | _variable_names(node.right)
+	return frozenset()
+
+
+def _folds_power(base: float, exponent: float) -> bool:
+	"""Potência barata o bastante para ser pré-calculada na compilação.
+
+	As acima do orçamento em linha ficam para a avaliação: pré-calculadas, o tempo limite
+	(ou a recusa) seria pago duas vezes.
+	"""
+	digits = exact_power_digits(base, exponent)
+	return digits is None or digits <= power_limits.inline_digits
+
+
+def _fold_constants(node: "Node") -> "Node":
+	"""Pré-calcula subárvores sem '_' e sem variáveis. Erros (ex.: divisão por zero) ficam para a avaliação."""
+	if isinstance(node, UnaryOp):
+		operand = _fold_constants(node.operand)
+		if isinstance(operand, Number):
+			try:
+				return Number(_UNARY_FUNCTIONS[node.operator](operand.value))
+			except (ArithmeticError, ValueError):
+				pass
+		return UnaryOp(node.operator, operand)
+	if _is_power_modulo(node):
+		base = _fold_constants(node.left.left)
+		exponent = _fold_constants(node.left.right)
+		modulus = _fold_constants(node.right)
+		if (
+			isinstance(base, Number)
+			and isinstance(exponent, Number)
+			and isinstance(modulus, Number)
+			and (_is_modular_integer_power(base.value, exponent.value, modulus.value) or _folds_power(base.value, exponent.value))
+		):
+			try:
+				return Number(_power_modulo(base.value, exponent.value, modulus.value))
+			except (ArithmeticError, ValueError):
+				pass
+		return BinaryOp("%", BinaryOp("**", base, exponent), modulus)
+	if isinstance(node, BinaryOp):
+		left = _fold_constants(node.left)
+		right = _fold_constants(node.right)
+		if (
+			isinstance(left, Number)
+			and isinstance(right, Number)
+			and (node.operator != "**" or _folds_power(left.value, right.value))
+		):
+			try:
+				return Number(_BINARY_FUNCTIONS[node.operator](left.value, right.value))
+			except (ArithmeticError, ValueError):
+				pass
+		return BinaryOp(node.operator, left, right)
+	return node
+
+
+def _compile_node(node: "Node") -> Evaluator:
+	if isinstance(node, Number):
+		value = node.value
+		return lambda last_result, variables: value
+	if isinstance(node, LastResult):
+		def last(last_result: Optional[float], variables: Optional[Variables]) -> float:
+			if last_result is None:
+				raise UndefinedLastResult()
+			return last_result
+		return last
+	if isinstance(node, Variable):
+		name = node.name
+		def variable(last_result: Optional[float], variables: Optional[Variables]) -> float:
+			try:
+				return variables[name]
+			except (KeyError, TypeError):
+				raise UndefinedVariable(name) from None
+		return variable
+	if isinstance(node, UnaryOp):
+		unary = _UNARY_FUNCTIONS[node.operator]
+		operand = _compile_node(node.operand)
+		return lambda last_result, variables: unary(operand(last_result, variables))
+	if _is_power_modulo(node):
+		base = _compile_node(node.left.left)
+		exponent = _compile_node(node.left.right)
+		modulus = _compile_node(node.right)
+		return lambda last_result, variables: _power_modulo(
+			base(last_result, variables), exponent(last_result, variables), modulus(last_result, variables)
+		)
+	function = _BINARY_FUNCTIONS[node.operator]
+	left = _compile_node(node.left)
+	right = _compile_node(node.right)
+	return lambda last_result, variables: function(left(last_result, variables), right(last_result, variables))
+
+
+class CompiledExpression:
+	"""Expressão já analisada e compilada; chame `evaluate(last_result)` para obter o valor."""
+
+	__slots__ = ("source", "tree", "uses_last_result", "variables", "_evaluator")
+
+	def __init__(self, source: str, tree: "Node") -> None:
+		self.source = source
+		self.tree = tree
+		self.uses_last_result = _uses_last_result(tree)
+		self.variables = _variable_names(tree)
+		self._evaluator = _compile_node(_fold_constants(tree))
+
+	def evaluate(self, last_result: Optional[float] = None, variables: Optional[Variables] = None) -> float:
+		"""Valor da expressão; `variables` dá o valor de cada nome usado (ver `self.variables`)."""
+		return self._evaluator(last_result, variables)
+
+	def __repr__(self) -> str:
+		return f"CompiledExpression({self.source!r})"
+
+
+_SIGNIFICANT_SPACE = re.compile(r"(?<=[\w.,])\s+(?=[\w.,])|(?<=[*/])\s+(?=[*/])")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_expression(expression_text: str) -> str:
+	"""Forma canônica usada como chave do cache.
+
+	Remove os espaços, exceto onde eles separam tokens ("2 3" e "* *" continuam inválidos).
+	"""
+	text = _SIGNIFICANT_SPACE.sub("\0", expression_text.strip())
+	return _WHITESPACE.sub("", text).replace("\0", " ")
+
+
+# ---------------------------------------------------------------------------
+# Cache LRU
+# ---------------------------------------------------------------------------
+
+class ExpressionCache:
+	"""Cache LRU limitado de expressões compiladas, com contadores de acertos e falhas."""
+
+	def __init__(self, capacity: int = 1024) -> None:
+		if capacity < 1:
+			raise ValueError("capacity deve ser >= 1")
+		self.capacity = capacity
+		self.hits = 0
+		self.misses = 0
+		self._entries: "OrderedDict[Tuple[str, bool, Tuple[object, ...]], CompiledExpression]" = OrderedDict()
+
+	def compile(self, expression_text: str, exact: bool = False) -> CompiledExpression:
+		normalized = normalize_expression(expression_text)
+		backend = current_backend()
+		key = (normalized, exact, backend.key)
+		entries = self._entries
+		compiled = entries.get(key)
+		if compiled is not None:
+			self.hits += 1
+			entries.move_to_end(key)
+			return compiled
+		self.misses += 1
+		compiled = CompiledExpression(normalized, parse(normalized, exact, backend))
+		entries[key] = compiled
+		if len(entries) > self.capacity:
+			entries.popitem(last=False)
+		return compiled
+
+	def clear(self) -> None:
+		self._entries.clear()
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def __iter__(self) -> Iterator[Tuple[str, bool, Tuple[object, ...]]]:
+		"""Chaves (texto normalizado, modo exato, backend), da menos para a mais recente."""
+		return iter(self._entries)
+
+	def info(self) -> Dict[str, int]:
+		return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "capacity": self.capacity}
+
+
+default_cache = ExpressionCache()
+
+
+def compile_expression(expression_text: str, exact: bool = False) -> CompiledExpression:
+	"""Compila (ou recupera do cache padrão) uma expressão."""
+	return default_cache.compile(expression_text, exact)
+
+
+def evaluate(
+	expression_text: str,
+	last_result: Optional[float] = None,
+	exact: bool = False,
+	variables: Optional[Variables] = None,
+) -> float:
+	"""Avalia uma expressão usando o cache padrão."""
+	return default_cache.compile(expression_text, exact).evaluate(last_result, variables)
+
+
+def cache_info() -> Dict[str, int]:
+	"""Contadores do cache padrão: hits, misses, size e capacity."""
+	return default_cache.info()
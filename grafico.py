@@ -0,0 +1,247 @@
+"""
+Gráficos de funções de x (NumPy)
+
+`compile_function("x**2 % 5")` usa o parser de expressoes.py (com √ e sqrt()) e compila a
+árvore uma única vez em funções NumPy: cada avaliação calcula a grade inteira em uma passada.
+Onde a calculadora levantaria erro (divisor zero, raiz de negativo, resultado complexo ou
+grande demais), o valor é NaN e o gráfico fica interrompido.
+
+`sample()` amostra um intervalo de forma adaptativa: parte de uma grade uniforme e
+subdivide, nível a nível, os intervalos onde a curva dobra (segunda diferença grande), salta
+(degraus de "//" e "%") ou entra/sai do domínio. Saltos que persistem na resolução final
+recebem um NaN entre os pontos, para o traço não ligar os dois lados da descontinuidade.
+
+`SampleCache` guarda as amostras em blocos ("tiles") de largura potência de 2, alinhados
+em múltiplos da largura: arrastar a janela ou voltar a um zoom já visto reaproveita os
+blocos calculados. `plot_points()` monta a janela a partir dos blocos.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import math
+
+import numpy as np
+
+from expressoes import (
+	ExpressionError,
+	LastResult,
+	Number,
+	UnaryOp,
+	Variable,
+	normalize_expression,
+	parse,
+)
+from numeros import get_backend
+from operacoes import OPERATIONS
+from vetorizado import VECTOR_FUNCTIONS
+
+VARIABLE = "x"
+
+# Pontos iniciais de cada bloco e níveis máximos de subdivisão
+TILE_POINTS = 129
+MAX_DEPTH = 6
+
+# Blocos por janela: a largura do bloco é a potência de 2 logo abaixo de largura/TILES_PER_VIEW
+TILES_PER_VIEW = 4
+
+# Curvatura tolerada (fração da altura típica da curva) antes de subdividir
+TOLERANCE = 0.002
+
+VectorFunction = Callable[[np.ndarray], np.ndarray]
+
+_ZERO_DIVISOR_SYMBOLS = frozenset(symbol for symbol, operation in OPERATIONS.items() if operation.checks_zero_divisor)
+
+
+class Samples(NamedTuple):
+	x: np.ndarray
+	y: np.ndarray
+
+
+def _compile_vector(node) -> VectorFunction:
+	if isinstance(node, Number):
+		value = float(node.value)
+		return lambda x: np.full(x.shape, value)
+	if isinstance(node, Variable):
+		if node.name != VARIABLE:
+			raise ExpressionError(f"variável não suportada no gráfico: {node.name} (use {VARIABLE})")
+		return lambda x: x
+	if isinstance(node, LastResult):
+		raise ExpressionError(f"'_' não pode ser usado no gráfico (use {VARIABLE})")
+	if isinstance(node, UnaryOp):
+		operand = _compile_vector(node.operand)
+		if node.operator == "√":
+			return lambda x: np.sqrt(operand(x))  # NaN para negativos
+		return lambda x: np.negative(operand(x))
+	function = VECTOR_FUNCTIONS[node.operator]
+	left = _compile_vector(node.left)
+	right = _compile_vector(node.right)
+	if node.operator in _ZERO_DIVISOR_SYMBOLS:
+		def checked(x: np.ndarray) -> np.ndarray:
+			divisor = right(x)
+			values = function(left(x), divisor)
+			values[divisor == 0] = np.nan
+			return values
+		return checked
+	return lambda x: function(left(x), right(x))
+
+
+@lru_cache(maxsize=128)
+def compile_function(expression_text: str) -> VectorFunction:
+	"""Compila uma expressão em x para uma função vetorizada (NaN onde não há valor real).
+
+	Raises:
+		ExpressionError: sintaxe inválida, '_' ou variável diferente de x.
+	"""
+	vector_function = _compile_vector(parse(normalize_expression(expression_text), backend=get_backend("float")))
+
+	def evaluate(x: np.ndarray) -> np.ndarray:
+		with np.errstate(all="ignore"):
+			values = np.asarray(vector_function(np.asarray(x, dtype=np.float64)), dtype=np.float64)
+		# inf/-inf: estouro ou 0 ** negativo, que a calculadora trata como erro
+		return np.where(np.isfinite(values), values, np.nan)
+	return evaluate
+
+
+def _scale(y: np.ndarray) -> float:
+	"""Altura típica da curva (ignora polos e valores fora do domínio)."""
+	finite = y[np.isfinite(y)]
+	if len(finite) < 2:
+		return 1.0
+	low, high = np.percentile(finite, (2, 98))
+	return float(high - low) or max(float(np.abs(finite).max()), 1.0)
+
+
+def _refine_mask(y: np.ndarray, tolerance: float) -> np.ndarray:
+	"""Intervalos [i, i+1] que precisam de um ponto no meio."""
+	finite = np.isfinite(y)
+	mask = finite[:-1] != finite[1:]  # borda do domínio ou divisor zero
+	if len(y) >= 3:
+		with np.errstate(invalid="ignore"):
+			bend = np.abs(y[:-2] - 2 * y[1:-1] + y[2:]) > tolerance * _scale(y)
+		mask[:-1] |= bend
+		mask[1:] |= bend
+	return mask
+
+
+def _break_jumps(x: np.ndarray, y: np.ndarray) -> Samples:
+	"""Insere NaN nos saltos: intervalos com variação muito maior que a dos vizinhos."""
+	if len(y) < 3:
+		return Samples(x, y)
+	step = np.abs(np.diff(y))
+	step = np.where(np.isfinite(step), step, 0.0)
+	neighbours = np.maximum(np.concatenate(([0.0], step[:-1])), np.concatenate((step[1:], [0.0])))
+	jumps = np.flatnonzero((step > 8 * neighbours) & (step > TOLERANCE * _scale(y)))
+	if not len(jumps):
+		return Samples(x, y)
+	middle = (x[jumps] + x[jumps + 1]) / 2
+	return Samples(np.insert(x, jumps + 1, middle), np.insert(y, jumps + 1, np.nan))
+
+
+def sample(
+	function: VectorFunction,
+	start: float,
+	stop: float,
+	points: int = TILE_POINTS,
+	max_depth: int = MAX_DEPTH,
+	tolerance: float = TOLERANCE,
+) -> Samples:
+	"""Amostra function em [start, stop]: grade uniforme refinada onde a curva muda rápido."""
+	x = np.linspace(start, stop, points)
+	y = function(x)
+	for _ in range(max_depth):
+		mask = _refine_mask(y, tolerance)
+		if not mask.any():
+			break
+		indices = np.flatnonzero(mask)
+		middle = (x[indices] + x[indices + 1]) / 2
+		# Todos os pontos novos do nível em uma única avaliação
+		x = np.insert(x, indices + 1, middle)
+		y = np.insert(y, indices + 1, function(middle))
+	return _break_jumps(x, y)
+
+
+class SampleCache:
+	"""Cache LRU de blocos amostrados, indexado por (expressão, nível, índice do bloco).
+
+	Protegido por um lock, como `memoizacao.OperationCache`: uma instância é compartilhada
+	pelas sessões do Streamlit (threads). A amostragem roda fora do lock.
+	"""
+
+	def __init__(self, capacity: int = 512) -> None:
+		if capacity < 1:
+			raise ValueError("capacity deve ser >= 1")
+		self.capacity = capacity
+		self.hits = 0
+		self.misses = 0
+		self._tiles: "OrderedDict[Tuple[str, int, int], Samples]" = OrderedDict()
+		self._lock = Lock()
+
+	def tile(self, expression_text: str, level: int, index: int) -> Samples:
+		"""Amostras de [index * 2**level, (index + 1) * 2**level]."""
+		key = (normalize_expression(expression_text), level, index)
+		tiles = self._tiles
+		with self._lock:
+			samples = tiles.get(key)
+			if samples is not None:
+				self.hits += 1
+				tiles.move_to_end(key)
+				return samples
+			self.misses += 1
+		width = math.ldexp(1.0, level)
+		samples = sample(compile_function(key[0]), index * width, (index + 1) * width)
+		with self._lock:
+			tiles[key] = samples
+			tiles.move_to_end(key)
+			while len(tiles) > self.capacity:
+				tiles.popitem(last=False)
+		return samples
+
+	def clear(self) -> None:
+		with self._lock:
+			self._tiles.clear()
+			self.hits = 0
+			self.misses = 0
+
+	def __len__(self) -> int:
+		return len(self._tiles)
+
+	def info(self) -> Dict[str, int]:
+		with self._lock:
+			return {"hits": self.hits, "misses": self.misses, "size": len(self._tiles), "capacity": self.capacity}
+
+
+def tile_range(start: float, stop: float) -> Tuple[int, int, int]:
+	"""(nível, primeiro índice, último índice) dos blocos que cobrem [start, stop]."""
+	if not (math.isfinite(start) and math.isfinite(stop)) or stop <= start:
+		raise ValueError("o intervalo precisa de início menor que o fim")
+	level = math.floor(math.log2((stop - start) / TILES_PER_VIEW))
+	width = math.ldexp(1.0, level)
+	return level, math.floor(start / width), math.ceil(stop / width) - 1
+
+
+def plot_points(expression_text: str, start: float, stop: float, cache: Optional[SampleCache] = None) -> Samples:
+	"""Pontos de [start, stop] montados a partir dos blocos (calculados ou do cache).
+
+	Raises:
+		ExpressionError: expressão inválida para o gráfico.
+		ValueError: intervalo vazio ou infinito.
+	"""
+	cache = cache if cache is not None else default_cache
+	level, first, last = tile_range(start, stop)
+	xs: List[np.ndarray] = []
+	ys: List[np.ndarray] = []
+	for index in range(first, last + 1):
+		tile = cache.tile(expression_text, level, index)
+		# O primeiro ponto de um bloco repete o último do anterior
+		skip = 1 if xs else 0
+		xs.append(tile.x[skip:])
+		ys.append(tile.y[skip:])
+	x = np.concatenate(xs)
+	y = np.concatenate(ys)
+	inside = (x >= start) & (x <= stop)
+	return Samples(x[inside], y[inside])
+
+
+default_cache = SampleCache()
@@ -0,0 +1,410 @@
+"""
+Histórico de operações da calculadora
+
+`RingHistory` é um buffer circular de tamanho fixo: `append` é O(1) (sobrescreve a
+entrada mais antiga quando cheio, sem deslocar a lista) e `last(n)` percorre apenas as
+n entradas mais recentes. A capacidade pode ser definida pela variável de ambiente
+CALCULADORA_HISTORY_SIZE.
+
+`ColumnarHistory` é o mesmo buffer circular para operações "a op b = resultado", mas
+em colunas (`array`): horário e números em float64 e o operador como código de 2 bytes,
+cerca de 34 bytes por entrada em vez de um dict com datetime e textos. O texto é
+montado só na exibição (`last` devolve `OperationRecord`).
+
+`SQLiteHistoryStore` persiste o histórico em um arquivo SQLite (CALCULADORA_HISTORY_DB):
+as escritas vão para uma fila e são gravadas em lote por uma thread própria, sem
+bloquear o cálculo; as leituras são paginadas e usam índices por horário e operador.
+Cada entrada pode ter um dono (`owner`, ex.: a sessão da versão web), usado para filtrar
+leituras e limpezas quando várias sessões compartilham o mesmo banco.
+"""
+
+from array import array
+from typing import Dict, Generic, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+
+T = TypeVar("T")
+
+HISTORY_SIZE_ENV = "CALCULADORA_HISTORY_SIZE"
+HISTORY_DB_ENV = "CALCULADORA_HISTORY_DB"
+
+
+def history_capacity(default: int) -> int:
+	"""Capacidade configurada em CALCULADORA_HISTORY_SIZE, ou `default` se ausente/inválida."""
+	raw_value = os.environ.get(HISTORY_SIZE_ENV, "").strip()
+	if not raw_value:
+		return default
+	try:
+		capacity = int(raw_value)
+	except ValueError:
+		return default
+	return capacity if capacity > 0 else default
+
+
+class RingHistory(Generic[T]):
+	"""Buffer circular com capacidade fixa e append O(1)."""
+
+	__slots__ = ("capacity", "dropped", "_slots", "_start", "_size")
+
+	def __init__(self, capacity: int) -> None:
+		if capacity < 1:
+			raise ValueError("capacity deve ser >= 1")
+		self.capacity = capacity
+		self.dropped = 0  # entradas sobrescritas desde a criação/limpeza
+		self._slots: List[Optional[T]] = [None] * capacity
+		self._start = 0
+		self._size = 0
+
+	def append(self, item: T) -> None:
+		capacity = self.capacity
+		if self._size < capacity:
+			self._slots[(self._start + self._size) % capacity] = item
+			self._size += 1
+		else:
+			self._slots[self._start] = item
+			self._start = (self._start + 1) % capacity
+			self.dropped += 1
+
+	def clear(self) -> None:
+		self._slots = [None] * self.capacity
+		self._start = 0
+		self._size = 0
+		self.dropped = 0
+
+	def last(self, count: int) -> List[T]:
+		"""As `count` entradas mais recentes, da mais antiga para a mais nova."""
+		count = min(max(count, 0), self._size)
+		capacity = self.capacity
+		first = self._start + self._size - count
+		return [self._slots[(first + offset) % capacity] for offset in range(count)]  # type: ignore[misc]
+
+	def newest(self) -> Optional[T]:
+		if not self._size:
+			return None
+		return self._slots[(self._start + self._size - 1) % self.capacity]
+
+	def __len__(self) -> int:
+		return self._size
+
+	def __bool__(self) -> bool:
+		return self._size > 0
+
+	def __iter__(self) -> Iterator[T]:
+		"""Percorre da entrada mais antiga para a mais nova."""
+		slots = self._slots
+		capacity = self.capacity
+		start = self._start
+		for offset in range(self._size):
+			yield slots[(start + offset) % capacity]  # type: ignore[misc]
+
+	def __reversed__(self) -> Iterator[T]:
+		slots = self._slots
+		capacity = self.capacity
+		end = self._start + self._size - 1
+		for offset in range(self._size):
+			yield slots[(end - offset) % capacity]  # type: ignore[misc]
+
+	def __repr__(self) -> str:
+		return f"RingHistory(capacity={self.capacity}, size={self._size})"
+
+
+class OperationRecord(NamedTuple):
+	timestamp: float  # segundos desde a época (time.time())
+	a: float
+	operation: str
+	b: float
+	result: float
+
+
+class ColumnarHistory:
+	"""Buffer circular de operações em colunas, com append O(1) e sem objetos por entrada.
+
+	Números que não são float (Decimal, Fraction, int) são guardados à parte, sem
+	conversão, para que a reutilização do resultado continue exata.
+	"""
+
+	__slots__ = (
+		"capacity", "dropped", "_timestamps", "_a", "_b", "_results", "_operations",
+		"_exact", "_codes", "_symbols", "_start", "_size",
+	)
+
+	def __init__(self, capacity: int) -> None:
+		if capacity < 1:
+			raise ValueError("capacity deve ser >= 1")
+		self.capacity = capacity
+		self._codes: Dict[str, int] = {}
+		self._symbols: List[str] = []
+		self.clear()
+
+	def clear(self) -> None:
+		capacity = self.capacity
+		zeros = array("d", bytes(8 * capacity))
+		self._timestamps = zeros
+		self._a = array("d", zeros)
+		self._b = array("d", zeros)
+		self._results = array("d", zeros)
+		self._operations = array("H", bytes(2 * capacity))
+		self._exact: Dict[Tuple[int, int], object] = {}  # (coluna, posição) -> valor não float
+		self._start = 0
+		self._size = 0
+		self.dropped = 0
+
+	def append(self, a: float, operation: str, b: float, result: float, timestamp: Optional[float] = None) -> None:
+		capacity = self.capacity
+		if self._size < capacity:
+			index = (self._start + self._size) % capacity
+			self._size += 1
+		else:
+			index = self._start
+			self._start = (self._start + 1) % capacity
+			self.dropped += 1
+		code = self._codes.get(operation)
+		if code is None:
+			code = self._codes[operation] = len(self._symbols)
+			self._symbols.append(operation)
+		self._timestamps[index] = time.time() if timestamp is None else timestamp
+		self._operations[index] = code
+		exact = self._exact
+		if exact:
+			for column in range(3):
+				exact.pop((column, index), None)
+		for column, values, value in ((0, self._a, a), (1, self._b, b), (2, self._results, result)):
+			if type(value) is float:
+				values[index] = value
+			else:
+				values[index] = float("nan")
+				exact[(column, index)] = value
+
+	def _record(self, index: int) -> OperationRecord:
+		exact = self._exact
+		a, b, result = self._a[index], self._b[index], self._results[index]
+		if exact:
+			a = exact.get((0, index), a)
+			b = exact.get((1, index), b)
+			result = exact.get((2, index), result)
+		return OperationRecord(self._timestamps[index], a, self._symbols[self._operations[index]], b, result)
+
+	def last(self, count: int) -> List[OperationRecord]:
+		"""As `count` operações mais recentes, da mais antiga para a mais nova."""
+		count = min(max(count, 0), self._size)
+		capacity = self.capacity
+		first = self._start + self._size - count
+		return [self._record((first + offset) % capacity) for offset in range(count)]
+
+	def __len__(self) -> int:
+		return self._size
+
+	def __bool__(self) -> bool:
+		return self._size > 0
+
+	def __iter__(self) -> Iterator[OperationRecord]:
+		return iter(self.last(self._size))
+
+	def __repr__(self) -> str:
+		return f"ColumnarHistory(capacity={self.capacity}, size={self._size})"
+
+
+class HistoryEntry(NamedTuple):
+	timestamp: float  # segundos desde a época (time.time())
+	expression: str
+	result: str
+	operation: Optional[str]
+	owner: Optional[str] = None  # sessão dona da entrada (None: CLI / sem dono)
+
+
+def history_db_path(default: Optional[str] = None) -> Optional[str]:
+	"""Caminho configurado em CALCULADORA_HISTORY_DB, ou `default`."""
+	return os.environ.get(HISTORY_DB_ENV, "").strip() or default
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+	id INTEGER PRIMARY KEY,
+	timestamp REAL NOT NULL,
+	expression TEXT NOT NULL,
+	result TEXT NOT NULL,
+	operation TEXT,
+	owner TEXT
+);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp);
+CREATE INDEX IF NOT EXISTS history_operation ON history (operation, timestamp);
+"""
+
+# Índice criado depois da migração de bancos anteriores à coluna owner
+_OWNER_INDEX = "CREATE INDEX IF NOT EXISTS history_owner ON history (owner, timestamp)"
+
+_STOP = object()
+_FLUSH = object()  # pedido de gravação imediata (um leitor está esperando)
+
+
+class SQLiteHistoryStore:
+	"""Histórico persistente em SQLite com escrita em lote em segundo plano.
+
+	Args:
+		path: arquivo do banco (":memory:" não é suportado, pois leitura e escrita usam conexões separadas).
+		batch_size: máximo de entradas gravadas por transação.
+		flush_interval: tempo máximo (s) que uma entrada espera na fila antes de ser gravada.
+	"""
+
+	def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.2) -> None:
+		self.path = path
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+		self._queue: "queue.Queue[object]" = queue.Queue()
+		self._closed = False
+
+		setup = sqlite3.connect(path)
+		try:
+			setup.execute("PRAGMA journal_mode=WAL")
+			setup.executescript(_SCHEMA)
+			columns = {row[1] for row in setup.execute("PRAGMA table_info(history)")}
+			if "owner" not in columns:
+				setup.execute("ALTER TABLE history ADD COLUMN owner TEXT")
+			setup.execute(_OWNER_INDEX)
+			setup.commit()
+		finally:
+			setup.close()
+
+		self._reader = sqlite3.connect(path, check_same_thread=False)
+		self._reader_lock = threading.Lock()
+		self._writer = threading.Thread(target=self._write_loop, name="historico-sqlite", daemon=True)
+		self._writer.start()
+
+	# -- escrita -------------------------------------------------------------
+
+	def append(
+		self,
+		expression: str,
+		result: str,
+		operation: Optional[str] = None,
+		timestamp: Optional[float] = None,
+		owner: Optional[str] = None,
+	) -> None:
+		"""Enfileira uma entrada; retorna imediatamente."""
+		if self._closed:
+			raise RuntimeError("histórico já foi fechado")
+		self._queue.put(HistoryEntry(time.time() if timestamp is None else timestamp, expression, result, operation, owner))
+
+	def _write_loop(self) -> None:
+		connection = sqlite3.connect(self.path)
+		pending_queue = self._queue
+		try:
+			while True:
+				item = pending_queue.get()
+				batch: List[HistoryEntry] = []
+				taken = 1
+				stop = item is _STOP
+				try:
+					if not stop and item is not _FLUSH:
+						batch.append(item)  # type: ignore[arg-type]
+						deadline = time.monotonic() + self.flush_interval
+						while len(batch) < self.batch_size:
+							remaining = deadline - time.monotonic()
+							try:
+								item = pending_queue.get(timeout=remaining) if remaining > 0 else pending_queue.get_nowait()
+							except queue.Empty:
+								break
+							taken += 1
+							if item is _STOP:
+								stop = True
+								break
+							if item is _FLUSH:
+								break
+							batch.append(item)  # type: ignore[arg-type]
+					if batch:
+						with connection:
+							connection.executemany(
+								"INSERT INTO history (timestamp, expression, result, operation, owner) VALUES (?, ?, ?, ?, ?)",
+								batch,
+							)
+				except sqlite3.Error:
+					# Banco bloqueado, disco cheio...: o lote é descartado, mas a thread continua
+					# viva e flush() não fica esperando para sempre
+					import logging  # só no erro: carregar logging custa ~10 ms na inicialização da CLI
+
+					logging.getLogger(__name__).exception("histórico: %d entrada(s) não gravada(s) em %s", len(batch), self.path)
+				finally:
+					for _ in range(taken):
+						pending_queue.task_done()
+				if stop:
+					break
+		finally:
+			connection.close()
+
+	def flush(self) -> None:
+		"""Espera até que todas as entradas enfileiradas estejam gravadas (sem esperar `flush_interval`)."""
+		if self._queue.unfinished_tasks and not self._closed:
+			self._queue.put(_FLUSH)
+		self._queue.join()
+
+	def close(self) -> None:
+		if self._closed:
+			return
+		self._closed = True
+		self._queue.put(_STOP)
+		self._writer.join()
+		with self._reader_lock:
+			self._reader.close()
+
+	# -- leitura -------------------------------------------------------------
+
+	def _query(self, sql: str, parameters: tuple = ()) -> List[tuple]:
+		with self._reader_lock:
+			return self._reader.execute(sql, parameters).fetchall()
+
+	@staticmethod
+	def _where(operation: Optional[str], owner: Optional[str]) -> Tuple[str, tuple]:
+		"""Filtro por operador e/ou dono (None: sem filtro)."""
+		conditions = []
+		parameters: tuple = ()
+		if operation is not None:
+			conditions.append("operation = ?")
+			parameters += (operation,)
+		if owner is not None:
+			conditions.append("owner = ?")
+			parameters += (owner,)
+		return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+	def page(
+		self,
+		limit: int = 10,
+		offset: int = 0,
+		operation: Optional[str] = None,
+		wait_pending: bool = True,
+		owner: Optional[str] = None,
+	) -> List[HistoryEntry]:
+		"""Entradas da mais nova para a mais antiga, `limit` por página (de um dono, se `owner`)."""
+		if wait_pending:
+			self.flush()
+		where, parameters = self._where(operation, owner)
+		rows = self._query(
+			f"SELECT timestamp, expression, result, operation, owner FROM history{where} "
+			"ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+			parameters + (limit, offset),
+		)
+		return [HistoryEntry(*row) for row in rows]
+
+	def count(self, operation: Optional[str] = None, owner: Optional[str] = None) -> int:
+		self.flush()
+		where, parameters = self._where(operation, owner)
+		return self._query(f"SELECT COUNT(*) FROM history{where}", parameters)[0][0]
+
+	def operation_counts(self, owner: Optional[str] = None) -> Dict[str, int]:
+		"""Quantidade de entradas por operador (usa o índice de operador)."""
+		self.flush()
+		where, parameters = self._where(None, owner)
+		where += " AND operation IS NOT NULL" if where else " WHERE operation IS NOT NULL"
+		rows = self._query(f"SELECT operation, COUNT(*) FROM history{where} GROUP BY operation", parameters)
+		return {operation: count for operation, count in rows}
+
+	def clear(self, owner: Optional[str] = None) -> None:
+		"""Apaga as entradas de `owner` (todas, sem dono informado)."""
+		self.flush()
+		where, parameters = self._where(None, owner)
+		with self._reader_lock:
+			with self._reader:
+				self._reader.execute(f"DELETE FROM history{where}", parameters)
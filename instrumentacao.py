@@ -0,0 +1,206 @@
+"""
+Instrumentação da calculadora: contadores e latência por operador
+
+`metrics` (instância do processo) registra, para cada operador despachado pelo registro
+(operacoes.apply_operation) e para as etapas de interpretação ("parse" e "expressão"):
+- quantidade de chamadas;
+- erros por tipo (divisão por zero, entrada inválida, estouro, ...);
+- histograma de latência com limites fixos (sem guardar amostras).
+
+Desligada (padrão), cada ponto instrumentado custa apenas a leitura de `metrics.enabled`.
+Ligue com `CALCULADORA_METRICS=1` (CLI e versão web) ou `--metrics` na CLI. No lote em
+paralelo, as métricas de cada processo de trabalho são somadas às do processo principal.
+`to_prometheus()` exporta no formato texto do Prometheus; `format_table()` gera a tabela
+mostrada pelo comando 'm' da CLI.
+
+Apenas a biblioteca padrão é usada.
+"""
+
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+import os
+
+T = TypeVar("T")
+
+METRICS_ENV = "CALCULADORA_METRICS"
+
+# Limites superiores (s) dos baldes do histograma de latência
+LATENCY_BUCKETS: Tuple[float, ...] = (
+	0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.1, 1.0,
+)
+
+
+def error_kind(error: BaseException) -> str:
+	"""Classifica um erro de operação para os contadores."""
+	if isinstance(error, ZeroDivisionError):
+		return "division_by_zero"
+	if isinstance(error, OverflowError):
+		return "overflow"
+	if isinstance(error, (ValueError, TypeError)):
+		return "invalid_input"
+	if isinstance(error, ArithmeticError):
+		return "arithmetic"
+	return "other"
+
+
+class OperatorMetrics:
+	"""Contadores e histograma de latência de um operador."""
+
+	__slots__ = ("count", "errors", "buckets", "total_seconds")
+
+	def __init__(self) -> None:
+		self.count = 0
+		self.errors: Dict[str, int] = {}
+		self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # o último é o +Inf
+		self.total_seconds = 0.0
+
+	def observe(self, seconds: float) -> None:
+		self.count += 1
+		self.total_seconds += seconds
+		self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+	def merge(self, other: "OperatorMetrics") -> None:
+		"""Soma as observações de outro processo (ex.: lote em paralelo)."""
+		self.count += other.count
+		self.total_seconds += other.total_seconds
+		for kind, count in other.errors.items():
+			self.errors[kind] = self.errors.get(kind, 0) + count
+		self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other.buckets)]
+
+	@property
+	def error_count(self) -> int:
+		return sum(self.errors.values())
+
+	def quantile(self, fraction: float) -> Optional[float]:
+		"""Limite superior do balde que contém o quantil (None sem observações)."""
+		if not self.count:
+			return None
+		target = fraction * self.count
+		seen = 0
+		for bound, bucket_count in zip(LATENCY_BUCKETS, self.buckets):
+			seen += bucket_count
+			if seen >= target:
+				return bound
+		return float("inf")
+
+
+class Metrics:
+	"""Métricas por operador. Desligada, `measure` chama a função direto."""
+
+	__slots__ = ("enabled", "operators")
+
+	def __init__(self, enabled: bool = False) -> None:
+		self.enabled = enabled
+		self.operators: Dict[str, OperatorMetrics] = {}
+
+	def _operator(self, name: str) -> OperatorMetrics:
+		operator_metrics = self.operators.get(name)
+		if operator_metrics is None:
+			operator_metrics = self.operators[name] = OperatorMetrics()
+		return operator_metrics
+
+	def measure(self, name: str, function: Callable[..., T], *args) -> T:
+		"""Chama function(*args) registrando latência e, se falhar, o tipo do erro."""
+		if not self.enabled:
+			return function(*args)
+		operator_metrics = self._operator(name)
+		started = perf_counter()
+		try:
+			return function(*args)
+		except Exception as error:
+			kind = error_kind(error)
+			operator_metrics.errors[kind] = operator_metrics.errors.get(kind, 0) + 1
+			raise
+		finally:
+			operator_metrics.observe(perf_counter() - started)
+
+	def reset(self) -> None:
+		self.operators = {}
+
+	def merge(self, operators: Dict[str, OperatorMetrics]) -> None:
+		"""Soma os contadores de outro processo (`operators` de outra instância)."""
+		for name, operator_metrics in operators.items():
+			self._operator(name).merge(operator_metrics)
+
+	def format_table(self) -> str:
+		"""Tabela legível (comando 'm' da CLI)."""
+		if not self.operators:
+			return "Nenhuma operação registrada." if self.enabled else "Métricas desligadas (use --metrics ou CALCULADORA_METRICS=1)."
+		lines = [f"{'operador':<10} {'chamadas':>9} {'erros':>6} {'média':>10} {'p50':>9} {'p99':>9}  erros por tipo"]
+		for name, operator_metrics in sorted(self.operators.items()):
+			mean = operator_metrics.total_seconds / operator_metrics.count if operator_metrics.count else 0.0
+			kinds = ", ".join(f"{kind}={count}" for kind, count in sorted(operator_metrics.errors.items()))
+			lines.append(
+				f"{name:<10} {operator_metrics.count:>9} {operator_metrics.error_count:>6} "
+				f"{_format_seconds(mean):>10} {_format_seconds(operator_metrics.quantile(0.5)):>9} "
+				f"{_format_seconds(operator_metrics.quantile(0.99)):>9}  {kinds}"
+			)
+		return "\n".join(lines)
+
+	def rows(self) -> List[Dict[str, object]]:
+		"""Uma linha por operador (painel da versão web)."""
+		return [
+			{
+				"operador": name,
+				"chamadas": operator_metrics.count,
+				"erros": operator_metrics.error_count,
+				"média (µs)": round(operator_metrics.total_seconds / operator_metrics.count * 1e6, 2) if operator_metrics.count else 0.0,
+				"p99 (≤ µs)": _microseconds(operator_metrics.quantile(0.99)),
+			}
+			for name, operator_metrics in sorted(self.operators.items())
+		]
+
+	def to_prometheus(self, prefix: str = "calculadora") -> str:
+		"""Exportação no formato texto do Prometheus (versão 0.0.4)."""
+		lines = [
+			f"# HELP {prefix}_operations_total Chamadas por operador.",
+			f"# TYPE {prefix}_operations_total counter",
+		]
+		items = sorted(self.operators.items())
+		for name, operator_metrics in items:
+			lines.append(f'{prefix}_operations_total{{operator="{_escape(name)}"}} {operator_metrics.count}')
+		lines += [
+			f"# HELP {prefix}_errors_total Erros por operador e tipo.",
+			f"# TYPE {prefix}_errors_total counter",
+		]
+		for name, operator_metrics in items:
+			for kind, count in sorted(operator_metrics.errors.items()):
+				lines.append(f'{prefix}_errors_total{{operator="{_escape(name)}",kind="{kind}"}} {count}')
+		lines += [
+			f"# HELP {prefix}_operation_duration_seconds Latência por operador.",
+			f"# TYPE {prefix}_operation_duration_seconds histogram",
+		]
+		for name, operator_metrics in items:
+			label = _escape(name)
+			cumulative = 0
+			for bound, bucket_count in zip(LATENCY_BUCKETS, operator_metrics.buckets):
+				cumulative += bucket_count
+				lines.append(f'{prefix}_operation_duration_seconds_bucket{{operator="{label}",le="{bound:g}"}} {cumulative}')
+			lines.append(f'{prefix}_operation_duration_seconds_bucket{{operator="{label}",le="+Inf"}} {operator_metrics.count}')
+			lines.append(f'{prefix}_operation_duration_seconds_sum{{operator="{label}"}} {operator_metrics.total_seconds:.9f}')
+			lines.append(f'{prefix}_operation_duration_seconds_count{{operator="{label}"}} {operator_metrics.count}')
+		return "\n".join(lines) + "\n"
+
+
+def _escape(label: str) -> str:
+	return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+	if seconds is None:
+		return "-"
+	if seconds == float("inf"):
+		return "> 1 s"
+	if seconds < 0.001:
+		return f"{seconds * 1e6:.1f} µs"
+	return f"{seconds * 1000:.2f} ms"
+
+
+def _microseconds(seconds: Optional[float]) -> Optional[float]:
+	if seconds is None or seconds == float("inf"):
+		return None
+	return round(seconds * 1e6, 2)
+
+
+metrics = Metrics(enabled=os.environ.get(METRICS_ENV, "").strip() not in ("", "0"))
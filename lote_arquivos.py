@@ -0,0 +1,225 @@
+"""
+Cálculo em lote de arquivos CSV/Parquet (pandas + NumPy)
+
+Cada linha do arquivo é uma operação, em colunas `a`, `op` e `b` ou em uma coluna
+`expression` (também aceita `expressao`/`expressão`). O arquivo é lido e gravado em
+blocos de `chunk_rows` linhas, então a memória não cresce com o tamanho do arquivo:
+- `a op b`: uma passada vetorizada por bloco (vetorizado.calculate_vectorized), com a
+  mesma semântica do despacho pelo registro: divisor zero, resultado complexo e
+  estouro viram erro da linha, com as mensagens da calculadora;
+- expressões: cada expressão distinta do bloco é avaliada uma vez pelo motor com cache.
+
+O resultado tem as colunas originais mais `resultado` e `erro` (vazio quando deu certo).
+`BulkSummary` acumula contagens, erros e mínimo/máximo/média entre os blocos.
+
+Este módulo importa pandas e NumPy: a versão web só o carrega quando um arquivo é
+enviado, para não pesar na partida. Parquet requer pyarrow.
+"""
+
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from calculadora import ZERO_DIVISOR_MESSAGES, describe_error, evaluate_line
+from operacoes import UnknownOperator, canonical_symbol
+from vetorizado import VECTOR_FUNCTIONS, calculate_vectorized
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+EXPRESSION_COLUMNS = ("expression", "expressao", "expressão")
+
+RESULT_COLUMN = "resultado"
+ERROR_COLUMN = "erro"
+
+
+class BulkSummary:
+	"""Agregados de um processamento em lote, atualizados bloco a bloco."""
+
+	__slots__ = ("rows", "ok", "errors", "counts", "minimum", "maximum", "total")
+
+	def __init__(self) -> None:
+		self.rows = 0
+		self.ok = 0
+		self.errors: Dict[str, int] = {}
+		self.counts: Dict[str, int] = {}  # operações bem-sucedidas por operador
+		self.minimum: Optional[float] = None
+		self.maximum: Optional[float] = None
+		self.total = 0.0
+
+	def update(self, results: np.ndarray, errors: np.ndarray, operators: Optional[np.ndarray] = None) -> None:
+		self.rows += len(results)
+		ok = errors == ""
+		values = results[ok]
+		self.ok += len(values)
+		if len(values):
+			finite = values[np.isfinite(values)]
+			if len(finite):
+				self.total += float(finite.sum())
+				low, high = float(finite.min()), float(finite.max())
+				self.minimum = low if self.minimum is None else min(self.minimum, low)
+				self.maximum = high if self.maximum is None else max(self.maximum, high)
+		if operators is not None and len(values):
+			symbols, counts = np.unique(operators[ok].astype(str), return_counts=True)
+			for symbol, count in zip(symbols, counts):
+				self.counts[str(symbol)] = self.counts.get(str(symbol), 0) + int(count)
+		if not ok.all():
+			messages, counts = np.unique(errors[~ok].astype(str), return_counts=True)
+			for message, count in zip(messages, counts):
+				self.errors[str(message)] = self.errors.get(str(message), 0) + int(count)
+
+	@property
+	def error_count(self) -> int:
+		return self.rows - self.ok
+
+	@property
+	def mean(self) -> Optional[float]:
+		return self.total / self.ok if self.ok and self.minimum is not None else None
+
+	def __repr__(self) -> str:
+		return f"BulkSummary(rows={self.rows}, ok={self.ok}, errors={self.error_count})"
+
+
+def iter_frames(source: BinaryIO, file_name: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+	"""Lê o arquivo em blocos de até `chunk_rows` linhas (CSV ou, pela extensão, Parquet)."""
+	if file_name.lower().endswith((".parquet", ".pq")):
+		try:
+			import pyarrow.parquet as pq
+		except ImportError:
+			raise ValueError("a leitura de Parquet requer o pacote pyarrow") from None
+		for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+			yield batch.to_pandas()
+		return
+	# Tudo como texto: operandos com vírgula decimal são convertidos em _numeric
+	yield from pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False, skipinitialspace=True)
+
+
+def _numeric(series: pd.Series) -> pd.Series:
+	if pd.api.types.is_numeric_dtype(series):
+		return series.astype(np.float64)
+	text = series.astype(str).str.strip().str.replace(",", ".", regex=False)
+	return pd.to_numeric(text, errors="coerce")
+
+
+def _vector_symbol(raw_symbol: str) -> str:
+	"""Símbolo canônico do operador ou "" quando não há versão vetorizada."""
+	try:
+		symbol = canonical_symbol(raw_symbol)
+	except UnknownOperator:
+		return ""
+	return symbol if symbol in VECTOR_FUNCTIONS else ""
+
+
+def _compute_operations(frame: pd.DataFrame, a_column: str, op_column: str, b_column: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+	a = _numeric(frame[a_column]).to_numpy(dtype=np.float64)
+	b = _numeric(frame[b_column]).to_numpy(dtype=np.float64)
+	raw_operators = frame[op_column].astype(str).str.strip()
+	mapping = {raw: _vector_symbol(raw) for raw in pd.unique(raw_operators)}
+	operators = raw_operators.map(mapping).to_numpy(dtype=object)
+
+	rows = len(frame)
+	results = np.full(rows, np.nan)
+	errors = np.full(rows, "", dtype=object)
+	known = operators != ""
+	errors[~known] = "operador não suportado"
+	invalid_operand = known & (np.isnan(a) | np.isnan(b))
+	errors[invalid_operand] = "operando inválido"
+	valid = known & ~invalid_operand
+	if not valid.any():
+		return results, errors, operators
+
+	computed = calculate_vectorized(a[valid], b[valid], operators[valid].astype(str))
+	results[valid] = computed.values
+	zero_divisor = np.zeros(rows, dtype=bool)
+	zero_divisor[valid] = computed.zero_divisor
+	for symbol, message in ZERO_DIVISOR_MESSAGES.items():
+		errors[zero_divisor & (operators == symbol)] = message
+	# Mesmos casos em que a operação escalar levanta erro em vez de devolver nan/inf
+	finite_inputs = valid & ~zero_divisor & np.isfinite(a) & np.isfinite(b)
+	zero_power = finite_inputs & (operators == "**") & (a == 0) & (b < 0)
+	errors[zero_power] = "zero elevado a expoente negativo"
+	errors[finite_inputs & ~zero_power & np.isnan(results)] = "resultado complexo não suportado"
+	errors[finite_inputs & ~zero_power & np.isinf(results)] = "resultado grande demais para ser representado"
+	results[errors != ""] = np.nan
+	return results, errors, operators
+
+
+def _evaluate_text(text: str) -> Tuple[float, str]:
+	try:
+		return float(evaluate_line(text)), ""
+	except (ArithmeticError, ValueError, TypeError) as error:
+		return np.nan, describe_error(error, text)
+
+
+def _compute_expressions(frame: pd.DataFrame, column: str) -> Tuple[np.ndarray, np.ndarray]:
+	texts = frame[column].astype(str).str.strip()
+	# Cada expressão distinta do bloco é avaliada uma única vez
+	evaluated = {text: _evaluate_text(text) for text in pd.unique(texts)}
+	pairs = texts.map(evaluated)
+	results = np.fromiter((pair[0] for pair in pairs), dtype=np.float64, count=len(pairs))
+	errors = np.fromiter((pair[1] for pair in pairs), dtype=object, count=len(pairs))
+	return results, errors
+
+
+def compute_frame(frame: pd.DataFrame, summary: Optional[BulkSummary] = None) -> pd.DataFrame:
+	"""Calcula um bloco e devolve-o com as colunas `resultado` e `erro`.
+
+	Raises:
+		ValueError: o bloco não tem `a`, `op` e `b` nem uma coluna de expressões.
+	"""
+	columns = {str(name).strip().lower(): name for name in frame.columns}
+	expression_column = next((columns[name] for name in EXPRESSION_COLUMNS if name in columns), None)
+	operators = None
+	if expression_column is not None:
+		results, errors = _compute_expressions(frame, expression_column)
+	elif all(name in columns for name in ("a", "op", "b")):
+		results, errors, operators = _compute_operations(frame, columns["a"], columns["op"], columns["b"])
+	else:
+		raise ValueError("o arquivo precisa das colunas a, op e b ou de uma coluna expression")
+	if summary is not None:
+		summary.update(results, errors, operators)
+	output = frame.copy()
+	output[RESULT_COLUMN] = results
+	output[ERROR_COLUMN] = errors
+	return output
+
+
+def process_file(
+	source: BinaryIO,
+	file_name: str,
+	output_path: str,
+	output_format: str = "csv",
+	chunk_rows: int = DEFAULT_CHUNK_ROWS,
+	progress: Optional[Callable[[int], None]] = None,
+) -> BulkSummary:
+	"""Lê, calcula e grava o arquivo bloco a bloco; `progress` recebe as linhas já processadas."""
+	if output_format not in OUTPUT_FORMATS:
+		raise ValueError(f"formato de saída desconhecido: {output_format!r}")
+	summary = BulkSummary()
+	parquet_writer = None
+	try:
+		for index, frame in enumerate(iter_frames(source, file_name, chunk_rows)):
+			output = compute_frame(frame, summary)
+			if output_format == "csv":
+				output.to_csv(output_path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+			else:
+				import pyarrow as pa
+				import pyarrow.parquet as pq
+
+				table = pa.Table.from_pandas(output, preserve_index=False)
+				if parquet_writer is None:
+					parquet_writer = pq.ParquetWriter(output_path, table.schema)
+				parquet_writer.write_table(table)
+			if progress is not None:
+				progress(summary.rows)
+	finally:
+		if parquet_writer is not None:
+			parquet_writer.close()
+	return summary
+
+
+def summary_rows(summary: BulkSummary) -> List[Dict[str, object]]:
+	"""Erros por mensagem, para exibição em tabela."""
+	return [{"erro": message, "linhas": count} for message, count in sorted(summary.errors.items(), key=lambda item: -item[1])]
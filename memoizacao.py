@@ -0,0 +1,167 @@
+"""
+Cache de resultados (memoização) das operações puras
+
+`OperationCache` guarda resultados por (operador, operandos) e é consultado por
+operacoes.apply_operation quando instalado com `operacoes.use_operation_cache()`.
+O cache é opcional e limitado de duas formas:
+- quantidade de entradas (`max_entries`);
+- memória estimada com sys.getsizeof (`max_bytes`); resultados maiores que
+  `max_item_bytes` não são guardados.
+
+Acima de qualquer limite, as entradas menos usadas recentemente (LRU) saem primeiro;
+com a política "size", sai primeiro a maior entrada entre as `SIZE_CANDIDATES` menos
+recentes, liberando mais memória por remoção sem descartar o que é usado com frequência.
+
+Os operandos entram na chave com o tipo (2, 2.0 e Decimal("2") dão resultados de tipos
+diferentes); com Decimal, a precisão do contexto atual também. Erros não são guardados.
+As operações são protegidas por um lock, então uma instância pode ser compartilhada
+entre threads (ex.: sessões do Streamlit).
+
+Apenas a biblioteca padrão é usada.
+"""
+
+from collections import OrderedDict
+from decimal import Decimal, getcontext
+from threading import Lock
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple, TypeVar
+import os
+import sys
+
+T = TypeVar("T")
+
+EVICTION_POLICIES = ("lru", "size")
+
+# Entradas do cache da versão web (configuração do processo; vazio ou 0 desliga)
+MEMO_ENV = "CALCULADORA_MEMO"
+
+# Operadores memoizados por padrão: os de custo variável (potência e raiz)
+DEFAULT_SYMBOLS = ("**", "√")
+
+# Quantas entradas antigas são comparadas pela política "size"
+SIZE_CANDIDATES = 8
+
+
+def memo_entries() -> Optional[int]:
+	"""Tamanho configurado em CALCULADORA_MEMO; None se ausente, zero ou inválido (sem cache)."""
+	raw_value = os.environ.get(MEMO_ENV, "").strip()
+	try:
+		entries = int(raw_value)
+	except ValueError:
+		return None
+	return entries if entries > 0 else None
+
+
+class OperationCache:
+	"""Memoização limitada por entradas e por bytes, com contadores de acertos e remoções."""
+
+	def __init__(
+		self,
+		max_entries: int = 4096,
+		max_bytes: int = 64 * 1024 * 1024,
+		max_item_bytes: int = 8 * 1024 * 1024,
+		policy: str = "lru",
+		symbols: Iterable[str] = DEFAULT_SYMBOLS,
+	) -> None:
+		if max_entries < 1 or max_bytes < 1:
+			raise ValueError("max_entries e max_bytes devem ser maiores que zero")
+		if policy not in EVICTION_POLICIES:
+			raise ValueError(f"política desconhecida: {policy!r} (use {', '.join(EVICTION_POLICIES)})")
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.max_item_bytes = min(max_item_bytes, max_bytes)
+		self.policy = policy
+		self.symbols: FrozenSet[str] = frozenset(symbols)
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.bytes = 0
+		self._entries: "OrderedDict[Tuple[object, ...], Tuple[object, int]]" = OrderedDict()
+		self._lock = Lock()
+
+	@staticmethod
+	def make_key(symbol: str, a: object, b: object) -> Tuple[object, ...]:
+		key: Tuple[object, ...] = (symbol, a.__class__, a, b.__class__, b)
+		if a.__class__ is Decimal or b.__class__ is Decimal:
+			key += (getcontext().prec,)
+		return key
+
+	def get_or_compute(self, symbol: str, a: object, b: object, compute: Callable[..., T], *args) -> T:
+		"""Resultado guardado para (symbol, a, b) ou calculado por compute(*args) e guardado."""
+		key = self.make_key(symbol, a, b)
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is not None:
+				self.hits += 1
+				self._entries.move_to_end(key)
+				return entry[0]
+			self.misses += 1
+		# Calcula fora do lock: uma potência cara não bloqueia as outras threads
+		value = compute(*args)
+		size = sys.getsizeof(value) + sys.getsizeof(a) + sys.getsizeof(b)
+		if size <= self.max_item_bytes:
+			with self._lock:
+				self._store(key, value, size)
+		return value
+
+	def _store(self, key: Tuple[object, ...], value: object, size: int) -> None:
+		entries = self._entries
+		previous = entries.pop(key, None)
+		if previous is not None:
+			self.bytes -= previous[1]
+		entries[key] = (value, size)
+		self.bytes += size
+		while len(entries) > self.max_entries or self.bytes > self.max_bytes:
+			victim = self._victim()
+			self.bytes -= entries.pop(victim)[1]
+			self.evictions += 1
+
+	def _victim(self) -> Tuple[object, ...]:
+		entries = self._entries
+		if self.policy == "lru":
+			return next(iter(entries))
+		oldest = []
+		for key in entries:
+			oldest.append(key)
+			if len(oldest) == SIZE_CANDIDATES:
+				break
+		return max(oldest, key=lambda candidate: entries[candidate][1])
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
+			self.bytes = 0
+			self.hits = 0
+			self.misses = 0
+			self.evictions = 0
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	@property
+	def hit_rate(self) -> float:
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+	def info(self) -> Dict[str, object]:
+		return {
+			"entries": len(self._entries),
+			"max_entries": self.max_entries,
+			"bytes": self.bytes,
+			"max_bytes": self.max_bytes,
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_rate": round(self.hit_rate, 4),
+			"evictions": self.evictions,
+			"policy": self.policy,
+		}
+
+	def describe(self) -> str:
+		"""Resumo de uma linha (comando 'm' da CLI)."""
+		return (
+			f"Cache de resultados: {len(self._entries)}/{self.max_entries} entradas, "
+			f"{self.bytes / 1024:.1f} KiB | acertos {self.hits} | falhas {self.misses} | "
+			f"taxa {self.hit_rate:.1%} | remoções {self.evictions} ({self.policy})"
+		)
+
+	def __repr__(self) -> str:
+		return f"OperationCache(entries={len(self._entries)}, hits={self.hits}, misses={self.misses})"
@@ -0,0 +1,209 @@
+"""
+Backends numéricos da calculadora
+
+Define como os literais viram números e como esses números são exibidos:
+- "float" (padrão): ponto flutuante binário; com `exact`, inteiros continuam `int`;
+- "decimal": `decimal.Decimal` com precisão configurável (0.1 + 0.2 == 0.3);
+- "fraction": `fractions.Fraction`, racionais exatos (1/3 + 1/3 == 2/3).
+
+As operações do registro (operacoes.py) funcionam com qualquer um deles. No backend
+decimal, o contexto (precisão, arredondamento e exceções) é criado uma única vez por
+backend e instalado com `activate()`; as operações usam os operadores do próprio
+Decimal, sem criar contextos por operação.
+
+Apenas a biblioteca padrão é usada.
+"""
+
+from decimal import ROUND_FLOOR, ROUND_HALF_EVEN, Context, Decimal, InvalidOperation, setcontext
+from fractions import Fraction
+from typing import Tuple, Union
+import functools
+
+Number = Union[int, float, Decimal, Fraction]
+
+BACKEND_NAMES = ("float", "decimal", "fraction")
+
+# Precisão padrão do backend decimal (dígitos significativos), a mesma do módulo decimal
+DEFAULT_PRECISION = 28
+
+# Inteiros com mais dígitos que isso são exibidos em notação científica aproximada
+MAX_EXACT_DIGITS = 4000
+_EXACT_LIMIT = 10 ** MAX_EXACT_DIGITS
+
+# log10 aproximado de inteiros grandes, a partir dos bits mais significativos: 160 bits e
+# 50 dígitos de precisão sobram para a mantissa de 15 dígitos
+_TOP_BITS = 160
+_LOG_CONTEXT = Context(prec=50)
+_LOG10_2 = _LOG_CONTEXT.log10(Decimal(2))
+_LOG_TOLERANCE = Decimal("1e-20")
+
+# Decimais com expoente fora desse intervalo são exibidos em notação científica
+_PLAIN_EXPONENTS = range(-7, 28)
+
+
+class FloatBackend:
+	"""Ponto flutuante binário (comportamento original da calculadora)."""
+
+	__slots__ = ()
+	name = "float"
+	key: Tuple[object, ...] = ("float",)
+
+	def parse(self, text: str, exact: bool = False) -> Number:
+		"""Converte um literal já com ponto decimal. Com `exact`, inteiros viram `int`."""
+		if exact and text.lstrip("+-").isdigit():
+			return int(text)
+		return float(text)
+
+	def convert(self, value: Number) -> Number:
+		return float(value)
+
+	def activate(self) -> None:
+		pass
+
+	def __repr__(self) -> str:
+		return "FloatBackend()"
+
+
+class DecimalBackend:
+	"""Decimal com precisão fixa; o contexto é reutilizado por todas as operações."""
+
+	__slots__ = ("precision", "context", "key", "_create")
+	name = "decimal"
+
+	def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+		if precision < 1:
+			raise ValueError("a precisão deve ser maior que zero")
+		self.precision = precision
+		# Overflow vira Infinity (como no float); operações sem resultado levantam InvalidOperation
+		self.context = Context(prec=precision, rounding=ROUND_HALF_EVEN, traps=[InvalidOperation])
+		self.key: Tuple[object, ...] = ("decimal", precision)
+		self._create = self.context.create_decimal
+
+	def parse(self, text: str, exact: bool = False) -> Number:
+		try:
+			return self._create(text)
+		except InvalidOperation:
+			raise ValueError(f"número inválido: {text!r}") from None
+
+	def convert(self, value: Number) -> Number:
+		if type(value) is Decimal:
+			return value
+		if isinstance(value, float):
+			# repr dá o literal mais curto (0.1 -> "0.1"), não a expansão binária
+			return self._create(repr(value))
+		if isinstance(value, Fraction):
+			return self.context.divide(Decimal(value.numerator), Decimal(value.denominator))
+		return self._create(value)
+
+	def activate(self) -> None:
+		"""Instala o contexto na thread atual (operadores do Decimal passam a usá-lo)."""
+		setcontext(self.context)
+
+	def __repr__(self) -> str:
+		return f"DecimalBackend(precision={self.precision})"
+
+
+class FractionBackend:
+	"""Racionais exatos."""
+
+	__slots__ = ()
+	name = "fraction"
+	key: Tuple[object, ...] = ("fraction",)
+
+	def parse(self, text: str, exact: bool = False) -> Number:
+		return Fraction(text)
+
+	def convert(self, value: Number) -> Number:
+		if isinstance(value, float):
+			return Fraction(repr(value))
+		return Fraction(value)
+
+	def activate(self) -> None:
+		pass
+
+	def __repr__(self) -> str:
+		return "FractionBackend()"
+
+
+NumericBackend = Union[FloatBackend, DecimalBackend, FractionBackend]
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend(name: str = "float", precision: int = DEFAULT_PRECISION) -> NumericBackend:
+	"""Backend pelo nome. Instâncias são reaproveitadas (um contexto decimal por precisão).
+
+	Raises:
+		ValueError: nome desconhecido ou precisão inválida.
+	"""
+	if name == "float":
+		return FloatBackend()
+	if name == "decimal":
+		return DecimalBackend(precision)
+	if name == "fraction":
+		return FractionBackend()
+	raise ValueError(f"backend numérico desconhecido: {name!r} (use {', '.join(BACKEND_NAMES)})")
+
+
+_current: NumericBackend = get_backend()
+
+
+def current_backend() -> NumericBackend:
+	"""Backend usado pela CLI e pelo motor de expressões."""
+	return _current
+
+
+def use_backend(name: str = "float", precision: int = DEFAULT_PRECISION) -> NumericBackend:
+	"""Seleciona o backend do processo e ativa seu contexto na thread atual."""
+	global _current
+	backend = get_backend(name, precision)
+	backend.activate()
+	_current = backend
+	return backend
+
+
+def format_integer(value: int) -> str:
+	"""Inteiro exato até MAX_EXACT_DIGITS dígitos; acima disso, mantissa e expoente aproximados.
+
+	O formato aproximado custa o mesmo para qualquer tamanho: só os bits mais
+	significativos entram no logaritmo.
+	"""
+	magnitude = abs(value)
+	if magnitude < _EXACT_LIMIT:
+		return str(value)
+	context = _LOG_CONTEXT
+	shift = magnitude.bit_length() - _TOP_BITS
+	logarithm = context.add(context.log10(Decimal(magnitude >> shift)), context.multiply(Decimal(shift), _LOG10_2))
+	exponent = int(logarithm.to_integral_value(rounding=ROUND_FLOOR))
+	nearest = int(logarithm.to_integral_value())
+	if abs(context.subtract(logarithm, Decimal(nearest))) < _LOG_TOLERANCE:
+		# Perto de uma potência de 10 (ex.: 10 ** k ou 10 ** k - 1) a estimativa não decide
+		# o número de dígitos; a comparação exata decide
+		exponent = nearest if magnitude >= 10 ** nearest else nearest - 1
+	fraction = min(max(context.subtract(logarithm, Decimal(exponent)), Decimal(0)), Decimal(1))
+	digits = exponent + 1
+	mantissa = f"{float(context.power(Decimal(10), fraction)):.15g}"
+	if mantissa == "10":
+		# 9,999... arredondado para 15 dígitos
+		mantissa, exponent = "1", exponent + 1
+	sign = "-" if value < 0 else ""
+	return f"{sign}{mantissa}e+{exponent} ({digits} dígitos)"
+
+
+def format_decimal(value: Decimal) -> str:
+	"""Decimal sem zeros à direita; notação científica só para expoentes extremos."""
+	if not value.is_finite():
+		return str(value)
+	if not value:
+		return "0"
+	normalized = value.normalize()
+	if normalized.adjusted() in _PLAIN_EXPONENTS:
+		return format(normalized, "f")
+	return str(normalized)
+
+
+def format_fraction(value: Fraction) -> str:
+	"""Fração irredutível ('1/3'); inteiros sem denominador."""
+	if value.denominator == 1:
+		return format_integer(value.numerator)
+	return f"{format_integer(value.numerator)}/{format_integer(value.denominator)}"
+
@@ -0,0 +1,325 @@
+"""
+Registro único de operações da calculadora
+
+Tabela de símbolo (ou apelido) -> operação, compartilhada pela CLI (calculadora.py),
+pela versão web (calculadora_streamlit.py), pelo motor de expressões e pelo modo
+vetorizado. Cada operação traz a função e os metadados necessários para despachá-la:
+aridade e a mensagem usada quando o divisor não pode ser zero.
+
+A potência passa por `guarded_power`: com operandos inteiros o tamanho do resultado é
+estimado antes do cálculo. Resultados pequenos são calculados direto; os maiores rodam
+em um processo isolado, com limite de tempo e de memória; acima de `max_digits` (ou
+quando o isolamento está desligado, como nos servidores) a conta é recusada com
+`OperationTooExpensive`. A multiplicação (`guarded_multiply`) segue o mesmo limite de
+recusa: no modo exato, "_*_" repetido faria o inteiro crescer sem limite.
+
+As funções aceitam float, int, Decimal e Fraction (ver numeros.py). No Decimal, "%" e
+"//" seguem a mesma convenção do float (arredondamento para baixo, resto com o sinal do
+divisor) em vez do truncamento nativo do módulo decimal.
+
+`apply_operation` alimenta as métricas por operador (instrumentacao.py) quando ligadas e,
+com um cache instalado por `use_operation_cache`, reaproveita resultados de potências e
+raízes já calculadas (memoizacao.py).
+
+Este módulo usa apenas a biblioteca padrão, para que a importação seja barata em
+processos de trabalho e na CLI (sem pandas, plotly ou Streamlit).
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+import math
+import operator
+
+from instrumentacao import metrics
+from memoizacao import OperationCache
+
+
+class UnknownOperator(ValueError):
+	"""Símbolo que não corresponde a nenhuma operação registrada."""
+	pass
+
+
+class DivisionByZero(ZeroDivisionError):
+	"""Divisor zero em '/', '%' ou '//'. O atributo `operator` indica qual deles."""
+
+	def __init__(self, operator_symbol: str) -> None:
+		message = OPERATIONS[operator_symbol].zero_divisor_message if operator_symbol in OPERATIONS else None
+		super().__init__(message or operator_symbol)
+		self.operator = operator_symbol
+
+
+class OperationTooExpensive(ArithmeticError):
+	"""A operação excede o orçamento de custo (tamanho estimado, tempo ou memória)."""
+	pass
+
+
+class PowerLimits:
+	"""Orçamento da potência inteira. Altere os atributos de `power_limits` para configurar."""
+
+	__slots__ = ("inline_digits", "max_digits", "timeout", "memory_bytes", "isolate")
+
+	def __init__(
+		self,
+		inline_digits: int = 10_000,
+		max_digits: int = 5_000_000,
+		timeout: float = 2.0,
+		memory_bytes: int = 512 * 1024 * 1024,
+		isolate: bool = True,
+	) -> None:
+		self.inline_digits = inline_digits  # até aqui calcula no próprio processo
+		self.max_digits = max_digits  # acima disso recusa sem calcular
+		self.timeout = timeout  # tempo máximo (s) do processo isolado
+		self.memory_bytes = memory_bytes  # limite de memória do processo isolado (Unix)
+		self.isolate = isolate  # False: recusa tudo acima de inline_digits
+
+	@property
+	def refuse_above(self) -> int:
+		"""Maior resultado exato aceito, em dígitos: max_digits, ou inline_digits sem o processo isolado."""
+		return self.max_digits if self.isolate else self.inline_digits
+
+
+power_limits = PowerLimits()
+
+
+def estimate_power_digits(a: float, b: float) -> float:
+	"""Estimativa do número de dígitos decimais de a ** b (sem calcular a potência)."""
+	magnitude = abs(a)
+	if magnitude <= 1 or b <= 0:
+		return 1.0
+	return b * math.log10(magnitude) + 1
+
+
+def _power_worker(connection, a: int, b: int, memory_bytes: int) -> None:
+	try:
+		try:
+			import resource
+			resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+		except (ImportError, ValueError, OSError):
+			pass  # sem limite de memória nesta plataforma; o limite de tempo continua valendo
+		connection.send(("ok", a ** b))
+	except MemoryError:
+		connection.send(("error", "memória insuficiente"))
+	finally:
+		connection.close()
+
+
+def _isolated_power(a: int, b: int, limits: PowerLimits) -> int:
+	import multiprocessing
+
+	receiver, sender = multiprocessing.Pipe(duplex=False)
+	process = multiprocessing.Process(target=_power_worker, args=(sender, a, b, limits.memory_bytes), daemon=True)
+	process.start()
+	sender.close()
+	try:
+		if not receiver.poll(limits.timeout):
+			raise OperationTooExpensive(f"potência excedeu o tempo limite de {limits.timeout:g} s")
+		try:
+			status, value = receiver.recv()
+		except EOFError:
+			raise OperationTooExpensive("potência interrompida (limite de memória)") from None
+		if status != "ok":
+			raise OperationTooExpensive(f"potência interrompida ({value})")
+		return value
+	finally:
+		receiver.close()
+		if process.is_alive():
+			process.kill()
+		process.join()
+
+
+def exact_power_digits(a: float, b: float) -> Optional[float]:
+	"""Dígitos estimados de a ** b quando o resultado é exato (int ou Fraction); None quando o custo é constante.
+
+	Inteiro elevado a expoente int negativo vira float e tem custo constante; uma fração
+	elevada a expoente negativo continua exata e é estimada por abs(b).
+	"""
+	if type(a) is float or type(b) is float:
+		# Caminho comum: sem as checagens de ABC (Fraction) abaixo
+		return None
+	if isinstance(a, int) and isinstance(b, int):
+		return estimate_power_digits(a, b) if b >= 0 else None
+	if isinstance(a, (int, Fraction)) and isinstance(b, (int, Fraction)) and b.denominator == 1:
+		# Fração elevada a inteiro também é exata: cresce com o maior dos dois termos
+		return estimate_power_digits(max(abs(a.numerator), a.denominator), abs(int(b)))
+	return None
+
+
+def guarded_power(a: float, b: float) -> float:
+	"""a ** b com estimativa de custo para resultados exatos (int e Fraction).
+
+	Potências de custo constante (ver `exact_power_digits`) seguem direto; o excesso
+	vira OverflowError, como antes.
+
+	Raises:
+		OperationTooExpensive: resultado estimado acima do orçamento.
+		ValueError: resultado complexo (base negativa com expoente fracionário).
+	"""
+	digits = exact_power_digits(a, b)
+	if digits is None:
+		result = a ** b
+		if type(result) is complex:
+			# Base negativa com expoente fracionário: o float do Python devolveria um complexo
+			raise ValueError("resultado complexo não suportado")
+		return result
+	limits = power_limits
+	if digits <= limits.inline_digits:
+		return a ** b
+	if digits > limits.refuse_above:
+		raise OperationTooExpensive(f"potência grande demais: cerca de {digits:.0f} dígitos (limite {limits.refuse_above})")
+	return _isolated_power(a, b, limits)
+
+
+_LOG10_2 = math.log10(2)
+
+
+def exact_product_digits(a: float, b: float) -> Optional[float]:
+	"""Dígitos estimados de a * b quando os dois fatores são exatos (int ou Fraction); None nos demais."""
+	bits = 0
+	for factor in (a, b):
+		if type(factor) is int:
+			bits += factor.bit_length()
+		elif type(factor) is Fraction:
+			bits += max(factor.numerator.bit_length(), factor.denominator.bit_length())
+		else:
+			return None
+	return bits * _LOG10_2
+
+
+def guarded_multiply(a: float, b: float) -> float:
+	"""a * b com o limite de recusa de `power_limits` para resultados exatos (int e Fraction).
+
+	Raises:
+		OperationTooExpensive: resultado estimado acima de `power_limits.refuse_above`.
+	"""
+	if type(a) is float or type(b) is float:
+		return a * b
+	digits = exact_product_digits(a, b)
+	if digits is not None and digits > power_limits.refuse_above:
+		raise OperationTooExpensive(f"multiplicação grande demais: cerca de {digits:.0f} dígitos (limite {power_limits.refuse_above})")
+	return a * b
+
+
+def floor_divide(a: float, b: float) -> float:
+	"""a // b; no Decimal, arredonda para baixo como no float (o nativo trunca)."""
+	if type(a) is Decimal or type(b) is Decimal:
+		quotient, remainder = divmod(a, b)
+		if remainder and (remainder < 0) != (b < 0):
+			quotient -= 1
+		return quotient
+	return a // b
+
+
+def modulo(a: float, b: float) -> float:
+	"""a % b; no Decimal, o resto tem o sinal do divisor como no float."""
+	if type(a) is Decimal or type(b) is Decimal:
+		remainder = a % b
+		if remainder and (remainder < 0) != (b < 0):
+			remainder += b
+		return remainder
+	return a % b
+
+
+def square_root(value: float) -> float:
+	"""Raiz quadrada; Decimal mantém a precisão do contexto."""
+	if type(value) is Decimal:
+		if value < 0:
+			raise ValueError("math domain error")
+		return value.sqrt()
+	return math.sqrt(value)
+
+
+class Operation(NamedTuple):
+	symbol: str  # símbolo canônico (o mesmo da CLI)
+	name: str
+	function: Callable[..., float]
+	arity: int
+	aliases: Tuple[str, ...] = ()
+	zero_divisor_message: Optional[str] = None  # preenchida quando o divisor não pode ser zero
+
+	@property
+	def checks_zero_divisor(self) -> bool:
+		return self.zero_divisor_message is not None
+
+
+_REGISTERED_OPERATIONS = (
+	Operation("+", "Soma", operator.add, 2),
+	Operation("-", "Subtração", operator.sub, 2),
+	Operation("*", "Multiplicação", guarded_multiply, 2, ("×",)),
+	Operation("/", "Divisão", operator.truediv, 2, ("÷",), "divisão por zero não é permitida"),
+	Operation("**", "Potência", guarded_power, 2, ("^",)),
+	Operation("%", "Módulo", modulo, 2, ("mod",), "módulo por zero não é permitido"),
+	Operation("//", "Divisão inteira", floor_divide, 2, (), "divisão inteira por zero não é permitida"),
+	Operation("√", "Raiz quadrada", square_root, 1, ("sqrt",)),
+)
+
+# Operações pelo símbolo canônico, na ordem do menu
+OPERATIONS: Dict[str, Operation] = {operation.symbol: operation for operation in _REGISTERED_OPERATIONS}
+
+# Símbolo ou apelido -> operação (consulta O(1))
+_LOOKUP: Dict[str, Operation] = {
+	symbol: operation
+	for operation in _REGISTERED_OPERATIONS
+	for symbol in (operation.symbol,) + operation.aliases
+}
+
+BINARY_SYMBOLS = tuple(symbol for symbol, operation in OPERATIONS.items() if operation.arity == 2)
+
+
+def get_operation(symbol: str) -> Operation:
+	"""Retorna a operação de um símbolo ou apelido (ex.: '×', 'mod', '^')."""
+	try:
+		return _LOOKUP[symbol]
+	except KeyError:
+		raise UnknownOperator(f"operador não suportado: {symbol!r}") from None
+
+
+def canonical_symbol(symbol: str) -> str:
+	"""Converte um símbolo ou apelido para o símbolo canônico ('×' -> '*')."""
+	return get_operation(symbol).symbol
+
+
+# Cache de resultados opcional, consultado por apply_operation (ver use_operation_cache)
+operation_cache: Optional[OperationCache] = None
+
+
+def use_operation_cache(cache: Optional[OperationCache]) -> Optional[OperationCache]:
+	"""Instala (ou remove, com None) o cache de resultados do processo."""
+	global operation_cache
+	operation_cache = cache
+	return cache
+
+
+def apply_operation(symbol: str, a: float, b: Optional[float] = None) -> float:
+	"""Despacha a operação pelo registro.
+
+	Raises:
+		UnknownOperator: símbolo desconhecido.
+		DivisionByZero: divisor zero em '/', '%' ou '//'.
+		OperationTooExpensive: potência ou produto exato acima do orçamento (ver `power_limits`).
+		ValueError: valor fora do domínio (ex.: raiz de número negativo).
+	"""
+	operation = get_operation(symbol)
+	if metrics.enabled or operation_cache is not None:
+		return metrics.measure(operation.symbol, _dispatch, operation, a, b)
+	# Mesmo corpo de _compute, em linha: sem métricas nem cache não há chamada extra
+	if operation.arity == 1:
+		return operation.function(a)
+	if operation.zero_divisor_message is not None and b == 0:
+		raise DivisionByZero(operation.symbol)
+	return operation.function(a, b)
+
+
+def _dispatch(operation: Operation, a: float, b: Optional[float]) -> float:
+	cache = operation_cache
+	if cache is not None and operation.symbol in cache.symbols:
+		return cache.get_or_compute(operation.symbol, a, b, _compute, operation, a, b)
+	return _compute(operation, a, b)
+
+
+def _compute(operation: Operation, a: float, b: Optional[float]) -> float:
+	if operation.arity == 1:
+		return operation.function(a)
+	if operation.zero_divisor_message is not None and b == 0:
+		raise DivisionByZero(operation.symbol)
+	return operation.function(a, b)
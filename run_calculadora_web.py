@@ -6,11 +6,25 @@ Este script facilita a execução da calculadora web, verificando dependências
 e iniciando o servidor Streamlit automaticamente.
 """
 
+import argparse
+import hashlib
+import operator
+import re
 import subprocess
 import sys
 import os
 from pathlib import Path
 
+BASE_DIR = Path(__file__).resolve().parent
+REQUIREMENTS_FILE = BASE_DIR / "requirements_streamlit.txt"
+STAMP_FILE = BASE_DIR / ".calculadora_deps.stamp"
+APP_FILE = BASE_DIR / "calculadora_streamlit.py"
+
+DEFAULT_PORT = 8501
+DEFAULT_ADDRESS = "localhost"
+
+_REQUIREMENT_LINE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:(==|>=|<=|~=|>|<)\s*([^\s;#]+))?")
+
 def check_python_version():
     """Verifica se a versão do Python é compatível"""
     if sys.version_info < (3, 8):
@@ -20,44 +34,140 @@ def check_python_version():
     print(f"✅ Python {sys.version_info.major}.{sys.version_info.minor} detectado")
     return True
 
-def install_requirements():
-    """Instala as dependências necessárias"""
-    requirements_file = "requirements_streamlit.txt"
-    
+def parse_version(text):
+    """Converte '1.37.0' (ou '2.0.0rc1') em uma tupla de inteiros (os zeros finais são mantidos: contam no ~=)"""
+    parts = []
+    for piece in text.split("."):
+        digits = re.match(r"\d+", piece)
+        if not digits:
+            break
+        parts.append(int(digits.group()))
+    return tuple(parts)
+
+def pad_versions(installed, required):
+    """Completa as duas tuplas com zeros até o mesmo tamanho ('1.3' == '1.3.0')"""
+    length = max(len(installed), len(required))
+    return installed + (0,) * (length - len(installed)), required + (0,) * (length - len(required))
+
+def compatible_release(installed, required):
+    """~=: installed >= required com o mesmo prefixo (~=1.30 aceita 1.31, não 2.0; ~=1.30.0 não aceita 1.31)"""
+    prefix = max(len(required) - 1, 1)
+    padded_installed, padded_required = pad_versions(installed, required)
+    return padded_installed >= padded_required and padded_installed[:prefix] == padded_required[:prefix]
+
+def parse_requirements(requirements_file):
+    """Lê linhas como 'pacote>=1.0' do arquivo de dependências"""
+    requirements = []
+    with open(requirements_file, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.split("#", 1)[0].strip()
+            if not line or line.startswith("-"):
+                continue
+            match = _REQUIREMENT_LINE.match(line)
+            if match:
+                requirements.append(match.groups())
+    return requirements
+
+def missing_requirements(requirements_file):
+    """Retorna as dependências ausentes ou com versão incompatível (via importlib.metadata)"""
+    from importlib import metadata
+
+    comparisons = {
+        "==": lambda installed, required: operator.eq(*pad_versions(installed, required)),
+        ">=": lambda installed, required: operator.ge(*pad_versions(installed, required)),
+        "<=": lambda installed, required: operator.le(*pad_versions(installed, required)),
+        ">": lambda installed, required: operator.gt(*pad_versions(installed, required)),
+        "<": lambda installed, required: operator.lt(*pad_versions(installed, required)),
+        "~=": compatible_release,
+    }
+    missing = []
+    for name, operator_symbol, required_version in parse_requirements(requirements_file):
+        try:
+            installed_version = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            missing.append(f"{name} (não instalado)")
+            continue
+        if operator_symbol and not comparisons[operator_symbol](parse_version(installed_version), parse_version(required_version)):
+            missing.append(f"{name} {installed_version} (requer {operator_symbol}{required_version})")
+    return missing
+
+def requirements_hash(requirements_file):
+    """Hash do arquivo de dependências, usado como chave do stamp"""
+    return hashlib.sha256(Path(requirements_file).read_bytes()).hexdigest()
+
+def read_stamp(stamp_file=STAMP_FILE):
+    try:
+        return Path(stamp_file).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+def write_stamp(digest, stamp_file=STAMP_FILE):
+    try:
+        Path(stamp_file).write_text(digest + "\n", encoding="utf-8")
+    except OSError as e:
+        print(f"⚠️  Não foi possível gravar {stamp_file}: {e}")
+
+def install_requirements(requirements_file=REQUIREMENTS_FILE, force=False):
+    """Instala as dependências apenas quando faltam pacotes ou o arquivo mudou"""
     if not os.path.exists(requirements_file):
         print(f"❌ Arquivo {requirements_file} não encontrado!")
         return False
     
+    digest = requirements_hash(requirements_file)
+    missing = missing_requirements(requirements_file)
+    file_changed = read_stamp() not in (None, digest)
+    
+    if not force and not missing and not file_changed:
+        print("✅ Dependências já instaladas")
+        write_stamp(digest)
+        return True
+    
+    if missing:
+        print("📦 Dependências pendentes: " + ", ".join(missing))
+    elif file_changed:
+        print(f"📦 {Path(requirements_file).name} mudou desde a última instalação")
     print("📦 Instalando dependências...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", requirements_file])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", str(requirements_file)])
         print("✅ Dependências instaladas com sucesso!")
+        write_stamp(digest)
         return True
     except subprocess.CalledProcessError as e:
+        if not missing:
+            # Ex.: máquina sem acesso à rede, mas com tudo o que o app precisa já instalado
+            print(f"⚠️  pip falhou ({e}), mas as dependências instaladas atendem aos requisitos")
+            return True
         print(f"❌ Erro ao instalar dependências: {e}")
         return False
 
-def run_streamlit():
+def run_streamlit(port=DEFAULT_PORT, address=DEFAULT_ADDRESS, headless=None):
     """Executa a aplicação Streamlit"""
-    app_file = "calculadora_streamlit.py"
+    app_file = APP_FILE
     
     if not os.path.exists(app_file):
         print(f"❌ Arquivo {app_file} não encontrado!")
         return False
     
     print("🚀 Iniciando Calculadora Streamlit...")
-    print("🌐 A aplicação será aberta no seu navegador automaticamente")
+    if headless:
+        print(f"🌐 Acesse http://{address}:{port} no navegador")
+    else:
+        print("🌐 A aplicação será aberta no seu navegador automaticamente")
     print("📱 Para acessar de outros dispositivos, use o endereço local mostrado")
     print("⏹️  Para parar, pressione Ctrl+C no terminal")
     print("-" * 50)
     
+    command = [
+        sys.executable, "-m", "streamlit", "run", str(app_file),
+        "--server.port", str(port),
+        "--server.address", address
+    ]
+    if headless is not None:
+        command += ["--server.headless", "true" if headless else "false"]
+    
     try:
         # Executa o Streamlit
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", app_file,
-            "--server.port", "8501",
-            "--server.address", "localhost"
-        ])
+        subprocess.run(command, cwd=BASE_DIR)
     except KeyboardInterrupt:
         print("\n👋 Calculadora encerrada pelo usuário")
     except Exception as e:
@@ -66,8 +176,44 @@ def run_streamlit():
     
     return True
 
-def main():
+def port_number(text):
+    """Porta TCP válida (1 a 65535), para --port e CALCULADORA_PORT"""
+    try:
+        port = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"porta inválida: {text!r} (use um número de 1 a 65535)") from None
+    if not 1 <= port <= 65535:
+        raise argparse.ArgumentTypeError(f"porta fora do intervalo: {port} (use um número de 1 a 65535)")
+    return port
+
+def parse_args(argv=None):
+    """Opções de linha de comando (também lidas de CALCULADORA_PORT/ADDRESS)"""
+    parser = argparse.ArgumentParser(description="Inicia a Calculadora Python (interface web)")
+    parser.add_argument("--port", type=port_number, default=None,
+                        help=f"porta do servidor (padrão: {DEFAULT_PORT})")
+    parser.add_argument("--address", default=os.environ.get("CALCULADORA_ADDRESS", DEFAULT_ADDRESS),
+                        help=f"endereço de escuta (padrão: {DEFAULT_ADDRESS}; use 0.0.0.0 para a rede)")
+    headless = parser.add_mutually_exclusive_group()
+    headless.add_argument("--headless", dest="headless", action="store_true", default=None,
+                          help="não abre o navegador")
+    headless.add_argument("--no-headless", dest="headless", action="store_false",
+                          help="abre o navegador (sobrepõe .streamlit/config.toml)")
+    install = parser.add_mutually_exclusive_group()
+    install.add_argument("--skip-install", action="store_true", help="não verifica nem instala dependências")
+    install.add_argument("--force-install", action="store_true", help="executa o pip mesmo com dependências satisfeitas")
+    args = parser.parse_args(argv)
+    if args.port is None:
+        # CALCULADORA_PORT só é validada quando usada (--port tem prioridade)
+        environment_port = os.environ.get("CALCULADORA_PORT", "").strip()
+        try:
+            args.port = port_number(environment_port) if environment_port else DEFAULT_PORT
+        except argparse.ArgumentTypeError as e:
+            parser.error(f"CALCULADORA_PORT: {e}")
+    return args
+
+def main(argv=None):
     """Função principal"""
+    args = parse_args(argv)
     print("🧮 Calculadora Python - Interface Web")
     print("=" * 40)
     
@@ -75,12 +221,12 @@ def main():
     if not check_python_version():
         return 1
     
-    # Instala dependências
-    if not install_requirements():
+    # Instala dependências (apenas se necessário)
+    if not args.skip_install and not install_requirements(force=args.force_install):
         return 1
     
     # Executa a aplicação
-    if not run_streamlit():
+    if not run_streamlit(args.port, args.address, args.headless):
         return 1
     
     return 0
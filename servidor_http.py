@@ -0,0 +1,397 @@
+"""
+Serviço HTTP/JSON da calculadora (asyncio, apenas biblioteca padrão)
+
+Rotas:
+- POST /eval   {"expression": "(2+3)*_", "last_result": 4}
+               -> {"result": 20.0, "formatted": "20"}
+- POST /batch  JSON: ["2+3", "_*4"] ou {"expressions": [...], "last_result": 1}
+               -> {"results": [{"result": 5.0, "formatted": "5"}, ...]}
+               NDJSON (Content-Type: application/x-ndjson, uma expressão por linha, como
+               texto JSON ou {"expression": ...}) -> resposta NDJSON em streaming (chunked),
+               processada à medida que o corpo chega
+- GET  /health -> {"status": "ok"}
+- GET  /metrics -> contadores e latência por operador no formato texto do Prometheus
+               (coletados com --metrics ou CALCULADORA_METRICS=1)
+
+Em /batch, "_" encadeia com o resultado da linha anterior, como no modo em lote da CLI.
+Erros por expressão voltam como {"error": "..."} sem interromper o lote.
+
+As conexões são keep-alive (HTTP/1.1) e o corpo pode vir com Content-Length ou chunked.
+
+Uso:
+	python servidor_http.py --host 127.0.0.1 --port 8080
+	curl -s localhost:8080/eval -d '{"expression": "2**10"}'
+"""
+
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import math
+
+from calculadora import describe_error, evaluate_line, format_number
+from instrumentacao import metrics
+from operacoes import power_limits
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 16 * 1024 * 1024  # corpos lidos inteiros (/eval e /batch em JSON)
+MAX_LINE_SIZE = 64 * 1024  # cada linha de um lote NDJSON
+STREAM_FLUSH_SIZE = 16 * 1024  # bytes acumulados antes de enviar um chunk
+
+_REASONS = {
+	200: "OK",
+	400: "Bad Request",
+	404: "Not Found",
+	405: "Method Not Allowed",
+	411: "Length Required",
+	413: "Payload Too Large",
+	431: "Request Header Fields Too Large",
+	500: "Internal Server Error",
+}
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class HttpError(Exception):
+	def __init__(self, status: int, message: str) -> None:
+		super().__init__(message)
+		self.status = status
+
+
+class Request:
+	__slots__ = ("method", "path", "version", "headers", "body")
+
+	def __init__(self, method: str, path: str, version: str, headers: Dict[str, str], body: "RequestBody") -> None:
+		self.method = method
+		self.path = path
+		self.version = version
+		self.headers = headers
+		self.body = body
+
+	@property
+	def keep_alive(self) -> bool:
+		connection = self.headers.get("connection", "").lower()
+		if self.version == "HTTP/1.0":
+			return connection == "keep-alive"
+		return connection != "close"
+
+
+class RequestBody:
+	"""Corpo da requisição lido sob demanda (Content-Length ou chunked)."""
+
+	def __init__(self, reader: asyncio.StreamReader, headers: Dict[str, str]) -> None:
+		self._reader = reader
+		self.chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+		length = headers.get("content-length")
+		if length is not None and not self.chunked:
+			try:
+				self._remaining = int(length)
+			except ValueError:
+				raise HttpError(400, "Content-Length inválido") from None
+		else:
+			self._remaining = 0
+		self._chunk_remaining = 0
+		self.finished = not self.chunked and self._remaining == 0
+
+	async def read_some(self, max_size: int = 64 * 1024) -> bytes:
+		"""Próximo pedaço do corpo; b"" no fim."""
+		if self.finished:
+			return b""
+		reader = self._reader
+		if not self.chunked:
+			data = await reader.read(min(max_size, self._remaining))
+			if not data:
+				raise HttpError(400, "corpo incompleto")
+			self._remaining -= len(data)
+			self.finished = self._remaining == 0
+			return data
+		if self._chunk_remaining == 0:
+			size_line = await reader.readline()
+			try:
+				size = int(size_line.split(b";", 1)[0].strip(), 16)
+			except ValueError:
+				raise HttpError(400, "chunk inválido") from None
+			if size == 0:
+				# Trailers opcionais até a linha vazia
+				while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+					pass
+				self.finished = True
+				return b""
+			self._chunk_remaining = size
+		data = await reader.read(min(max_size, self._chunk_remaining))
+		if not data:
+			raise HttpError(400, "corpo incompleto")
+		self._chunk_remaining -= len(data)
+		if self._chunk_remaining == 0:
+			await reader.readline()  # CRLF após o chunk
+		return data
+
+	async def read_all(self, limit: int = MAX_BODY_SIZE) -> bytes:
+		parts: List[bytes] = []
+		total = 0
+		while True:
+			data = await self.read_some()
+			if not data:
+				return b"".join(parts)
+			total += len(data)
+			if total > limit:
+				raise HttpError(413, "corpo grande demais")
+			parts.append(data)
+
+	async def iter_lines(self) -> AsyncIterator[bytes]:
+		pending = b""
+		while True:
+			data = await self.read_some()
+			if not data:
+				break
+			pending += data
+			*lines, pending = pending.split(b"\n")
+			for line in lines:
+				yield line
+			if len(pending) > MAX_LINE_SIZE:
+				raise HttpError(413, "linha grande demais no lote")
+		if pending:
+			yield pending
+
+	async def discard(self) -> None:
+		while await self.read_some():
+			pass
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+	"""Lê a linha de requisição e os cabeçalhos; None quando o cliente fechou a conexão."""
+	try:
+		head = await reader.readuntil(b"\r\n\r\n")
+	except asyncio.IncompleteReadError as error:
+		if not error.partial.strip():
+			return None
+		raise HttpError(400, "requisição incompleta") from None
+	except asyncio.LimitOverrunError:
+		raise HttpError(431, "cabeçalhos grandes demais") from None
+	lines = head.decode("latin-1").split("\r\n")
+	try:
+		method, target, version = lines[0].split(" ", 2)
+	except ValueError:
+		raise HttpError(400, "linha de requisição inválida") from None
+	headers: Dict[str, str] = {}
+	for line in lines[1:]:
+		if line:
+			name, _, value = line.partition(":")
+			headers[name.strip().lower()] = value.strip()
+	return Request(method, target.split("?", 1)[0], version, headers, RequestBody(reader, headers))
+
+
+def _head(status: int, content_type: str, keep_alive: bool, length: Optional[int]) -> bytes:
+	lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}", f"Content-Type: {content_type}"]
+	if length is None:
+		lines.append("Transfer-Encoding: chunked")
+	else:
+		lines.append(f"Content-Length: {length}")
+	lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+	return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def json_response(status: int, payload: object, keep_alive: bool) -> bytes:
+	body = _dumps(payload).encode("utf-8")
+	return _head(status, "application/json; charset=utf-8", keep_alive, len(body)) + body
+
+
+def evaluate_item(text: str, last_result: Optional[float]) -> Tuple[Dict[str, object], Optional[float]]:
+	"""Avalia uma expressão e devolve (objeto de resposta, novo último resultado)."""
+	try:
+		result = evaluate_line(text, last_result)
+	except (ArithmeticError, ValueError) as error:
+		return {"error": describe_error(error, text)}, last_result
+	if isinstance(result, complex):
+		return {"error": f"resultado complexo não suportado: {text}"}, last_result
+	payload: Dict[str, object] = {"result": result if math.isfinite(result) else None, "formatted": format_number(result)}
+	return payload, result
+
+
+def _expression_from(item: object) -> str:
+	if isinstance(item, str):
+		return item
+	if isinstance(item, dict) and isinstance(item.get("expression"), str):
+		return item["expression"]
+	raise HttpError(400, "cada item deve ser um texto ou {\"expression\": ...}")
+
+
+def _last_result_from(payload: object) -> Optional[float]:
+	if isinstance(payload, dict) and payload.get("last_result") is not None:
+		value = payload["last_result"]
+		if isinstance(value, bool) or not isinstance(value, (int, float)):
+			raise HttpError(400, "last_result deve ser numérico")
+		return float(value)
+	return None
+
+
+def _load_json(body: bytes) -> object:
+	try:
+		return json.loads(body)
+	except ValueError:
+		raise HttpError(400, "JSON inválido") from None
+
+
+def evaluate_batch(items: Iterable[object], last_result: Optional[float]) -> List[Dict[str, object]]:
+	results = []
+	for item in items:
+		payload, last_result = evaluate_item(_expression_from(item), last_result)
+		results.append(payload)
+	return results
+
+
+async def handle_eval(request: Request, writer: asyncio.StreamWriter) -> None:
+	payload = _load_json(await request.body.read_all())
+	payload_result, _ = evaluate_item(_expression_from(payload), _last_result_from(payload))
+	status = 400 if "error" in payload_result else 200
+	writer.write(json_response(status, payload_result, request.keep_alive))
+
+
+async def handle_batch(request: Request, writer: asyncio.StreamWriter) -> None:
+	content_type = request.headers.get("content-type", "")
+	if "ndjson" not in content_type and "jsonl" not in content_type:
+		payload = _load_json(await request.body.read_all())
+		items = payload.get("expressions") if isinstance(payload, dict) else payload
+		if not isinstance(items, list):
+			raise HttpError(400, "esperado um array de expressões")
+		results = evaluate_batch(items, _last_result_from(payload))
+		writer.write(json_response(200, {"results": results}, request.keep_alive))
+		return
+
+	# NDJSON: cada linha é avaliada assim que chega e o resultado sai em chunks
+	writer.write(_head(200, "application/x-ndjson; charset=utf-8", request.keep_alive, None))
+	last_result: Optional[float] = None
+	buffer: List[str] = []
+	buffered = 0
+	try:
+		async for raw_line in request.body.iter_lines():
+			line = raw_line.strip()
+			if not line:
+				continue
+			try:
+				text = _expression_from(json.loads(line))
+			except (ValueError, HttpError):
+				text = line.decode("utf-8", errors="replace")  # texto puro também é aceito
+			payload, last_result = evaluate_item(text, last_result)
+			encoded = _dumps(payload) + "\n"
+			buffer.append(encoded)
+			buffered += len(encoded)
+			if buffered >= STREAM_FLUSH_SIZE:
+				_write_chunk(writer, "".join(buffer).encode("utf-8"))
+				buffer.clear()
+				buffered = 0
+				await writer.drain()
+	except HttpError as error:
+		# O status 200 já foi enviado: o erro vai como última linha e a conexão é fechada
+		buffer.append(_dumps({"error": str(error)}) + "\n")
+		_write_chunk(writer, "".join(buffer).encode("utf-8"))
+		writer.write(b"0\r\n\r\n")
+		await writer.drain()
+		raise ConnectionAbortedError(str(error)) from None
+	if buffer:
+		_write_chunk(writer, "".join(buffer).encode("utf-8"))
+	writer.write(b"0\r\n\r\n")
+
+
+def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+	writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+
+async def handle_health(request: Request, writer: asyncio.StreamWriter) -> None:
+	writer.write(json_response(200, {"status": "ok"}, request.keep_alive))
+
+
+async def handle_metrics(request: Request, writer: asyncio.StreamWriter) -> None:
+	body = metrics.to_prometheus().encode("utf-8")
+	writer.write(_head(200, "text/plain; version=0.0.4; charset=utf-8", request.keep_alive, len(body)) + body)
+
+
+ROUTES = {
+	"/eval": ("POST", handle_eval),
+	"/batch": ("POST", handle_batch),
+	"/health": ("GET", handle_health),
+	"/metrics": ("GET", handle_metrics),
+}
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+	"""Atende requisições em sequência na mesma conexão enquanto houver keep-alive."""
+	try:
+		while True:
+			try:
+				request = await read_request(reader)
+			except HttpError as error:
+				writer.write(json_response(error.status, {"error": str(error)}, keep_alive=False))
+				break
+			if request is None:
+				break
+
+			route = ROUTES.get(request.path)
+			try:
+				if request.headers.get("expect", "").lower() == "100-continue":
+					writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+				if route is None:
+					raise HttpError(404, f"rota não encontrada: {request.path}")
+				method, handler = route
+				if request.method != method:
+					raise HttpError(405, f"use {method} em {request.path}")
+				await handler(request, writer)
+			except HttpError as error:
+				writer.write(json_response(error.status, {"error": str(error)}, request.keep_alive))
+			except (ConnectionError, asyncio.IncompleteReadError):
+				raise
+			except Exception as error:
+				writer.write(json_response(500, {"error": f"erro interno: {error}"}, keep_alive=False))
+				await writer.drain()
+				break
+			if not request.body.finished:
+				# Corpo não consumido (ex.: rota inválida): descarta para manter a conexão alinhada
+				try:
+					await request.body.discard()
+				except HttpError:
+					break
+			await writer.drain()
+			if not request.keep_alive:
+				break
+	except (ConnectionError, asyncio.IncompleteReadError):
+		pass
+	finally:
+		writer.close()
+		try:
+			await writer.wait_closed()
+		except ConnectionError:
+			pass
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+	# O laço de eventos nunca espera por um processo isolado: potências acima do
+	# orçamento em linha são recusadas de imediato
+	power_limits.isolate = False
+	server = await asyncio.start_server(handle_connection, host, port, limit=MAX_HEADER_SIZE, backlog=1024)
+	addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets or [])
+	print(f"Calculadora HTTP em {addresses} (Ctrl+C para sair)")
+	async with server:
+		await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Serviço HTTP/JSON da calculadora")
+	parser.add_argument("--host", default=DEFAULT_HOST, help=f"endereço de escuta (padrão: {DEFAULT_HOST})")
+	parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"porta (padrão: {DEFAULT_PORT})")
+	parser.add_argument("--metrics", action="store_true", help="coleta métricas por operador (expostas em GET /metrics)")
+	args = parser.parse_args(argv)
+	if args.metrics:
+		metrics.enabled = True
+	try:
+		asyncio.run(serve(args.host, args.port))
+	except KeyboardInterrupt:
+		print("\nAté mais!")
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
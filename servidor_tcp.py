@@ -0,0 +1,191 @@
+"""
+Servidor TCP da calculadora: o REPL da CLI para vários clientes (asyncio, apenas biblioteca padrão)
+
+Cada conexão é uma sessão independente, com o mesmo protocolo de linhas do modo
+interativo e do lote (`nc localhost 7070` ou `telnet`):
+- uma expressão por linha ("2+3", "(2+3)*_", "taxa = 0.05") -> uma linha de resposta,
+  com o resultado formatado ou "Erro: ...", como no modo em lote;
+- "_" usa o último resultado da própria conexão;
+- "h" mostra o histórico da conexão (termina com uma linha vazia);
+- "v" lista as variáveis da conexão (termina com uma linha vazia);
+- "m" mostra as métricas do servidor, com --metrics (termina com uma linha vazia);
+- "c" limpa o último resultado;
+- "q", "0" ou "sair" encerram a conexão.
+
+Ao conectar, o servidor envia uma linha de boas-vindas. O estado de uma sessão ociosa é só
+um objeto `Session` pequeno: histórico e variáveis são criados no primeiro uso, e o buffer
+de leitura de cada conexão é limitado a `MAX_LINE_SIZE`, então milhares de conexões
+paradas custam poucos KB cada. Uma sessão sem atividade por `--idle-timeout` segundos é
+encerrada (0 desliga). Com `--exact`, potências e produtos inteiros acima de
+`power_limits.inline_digits` dígitos são recusados, para que nenhuma linha bloqueie o laço.
+
+Uso:
+	python servidor_tcp.py --host 127.0.0.1 --port 7070
+	python benchmarks/carga_tcp.py --spawn -c 200
+"""
+
+from typing import List, Optional
+import argparse
+import asyncio
+
+from calculadora import DEFAULT_HISTORY_SIZE, EXIT_COMMANDS, describe_error, describe_variable, evaluate_line, format_number
+from historico import RingHistory, history_capacity
+from instrumentacao import metrics
+from operacoes import power_limits
+from variaveis import VariableGraph, parse_assignment
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7070
+
+MAX_LINE_SIZE = 4 * 1024
+
+WELCOME = "Calculadora Python: uma expressão por linha (_ último resultado, h histórico, v variáveis, c limpar, q sair)\n"
+
+
+class Session:
+	"""Estado de uma conexão: último resultado, histórico e variáveis (criados sob demanda)."""
+
+	__slots__ = ("last_result", "history", "variables", "exact")
+
+	def __init__(self, exact: bool = False) -> None:
+		self.last_result: Optional[float] = None
+		self.history: Optional[RingHistory[str]] = None
+		self.variables: Optional[VariableGraph] = None
+		self.exact = exact
+
+	def record(self, entry: str) -> None:
+		if self.history is None:
+			self.history = RingHistory(history_capacity(DEFAULT_HISTORY_SIZE))
+		self.history.append(entry)
+
+	def handle(self, text: str) -> Optional[str]:
+		"""Resposta a uma linha (sem a quebra final); None encerra a sessão."""
+		command = text.lower()
+		if command in EXIT_COMMANDS:
+			return None
+		if command == "h":
+			items = self.history.last(10) if self.history is not None else []
+			return "\n".join(items) + "\n" if items else "Histórico vazio.\n"
+		if command == "v":
+			if not self.variables:
+				return "Nenhuma variável definida.\n"
+			return "\n".join(describe_variable(cell) for cell in self.variables) + "\n"
+		if command == "m":
+			return metrics.format_table() + "\n"
+		if command == "c":
+			self.last_result = None
+			return "Último resultado limpo."
+		assignment = parse_assignment(text)
+		if assignment is not None:
+			return self.assign(*assignment)
+		try:
+			result = evaluate_line(text, self.last_result, self.exact, self.variables.values if self.variables else None)
+		except (ArithmeticError, ValueError) as error:
+			return f"Erro: {describe_error(error, text)}"
+		self.last_result = result
+		formatted = format_number(result)
+		self.record(f"{text} = {formatted}")
+		return formatted
+
+	def assign(self, name: str, expression: str) -> str:
+		if self.variables is None:
+			self.variables = VariableGraph(self.exact)
+		try:
+			self.variables.set(name, expression, self.last_result)
+		except (ArithmeticError, ValueError) as error:
+			return f"Erro: {describe_error(error, expression)}"
+		cell = self.variables.get(name)
+		if cell.error is not None:
+			return f"Erro: {describe_variable(cell)}"
+		self.last_result = cell.value
+		self.record(f"{name} = {expression} = {format_number(cell.value)}")
+		return describe_variable(cell)
+
+
+class SessionServer:
+	"""Aceita conexões e atende cada uma com a própria `Session`."""
+
+	def __init__(self, exact: bool = False, idle_timeout: float = 0.0) -> None:
+		self.exact = exact
+		self.idle_timeout = idle_timeout or None
+		self.connections = 0
+
+	async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		session = Session(self.exact)
+		self.connections += 1
+		try:
+			writer.write(WELCOME.encode("utf-8"))
+			while True:
+				try:
+					line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+				except asyncio.TimeoutError:
+					writer.write("Sessão encerrada por inatividade.\n".encode("utf-8"))
+					break
+				except ValueError:
+					# Linha maior que MAX_LINE_SIZE (o StreamReader já descartou o excesso)
+					writer.write(f"Erro: linha maior que {MAX_LINE_SIZE} bytes.\n".encode("utf-8"))
+					break
+				if not line:
+					break
+				text = line.decode("utf-8", errors="replace").strip()
+				if not text or text.startswith("#"):
+					continue
+				response = session.handle(text)
+				if response is None:
+					writer.write("Até mais!\n".encode("utf-8"))
+					break
+				writer.write(response.encode("utf-8") + b"\n")
+				await writer.drain()
+			await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			self.connections -= 1
+			writer.close()
+			try:
+				await writer.wait_closed()
+			except ConnectionError:
+				pass
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, exact: bool = False, idle_timeout: float = 0.0) -> None:
+	# O laço de eventos nunca espera por um processo isolado: potências acima do
+	# orçamento em linha são recusadas de imediato, e com --exact os produtos também
+	# (sem isso "_*_" repetido faria o inteiro crescer a cada linha)
+	power_limits.isolate = False
+	sessions = SessionServer(exact, idle_timeout)
+	server = await asyncio.start_server(sessions.handle_connection, host, port, limit=MAX_LINE_SIZE, backlog=1024)
+	addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets or [])
+	print(f"Calculadora TCP em {addresses} (Ctrl+C para sair)")
+	async with server:
+		await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Servidor TCP da calculadora (REPL por conexão)")
+	parser.add_argument("--host", default=DEFAULT_HOST, help=f"endereço de escuta (padrão: {DEFAULT_HOST})")
+	parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"porta (padrão: {DEFAULT_PORT})")
+	parser.add_argument("--exact", action="store_true", help="mantém inteiros exatos, como na CLI")
+	parser.add_argument(
+		"--idle-timeout",
+		type=float,
+		default=0.0,
+		metavar="SEGUNDOS",
+		help="encerra sessões sem atividade por esse tempo (padrão: 0, nunca)",
+	)
+	parser.add_argument("--metrics", action="store_true", help="coleta métricas por operador ('m' mostra a tabela)")
+	args = parser.parse_args(argv)
+	if args.idle_timeout < 0:
+		parser.error("--idle-timeout deve ser zero ou positivo")
+	if args.metrics:
+		metrics.enabled = True
+	try:
+		asyncio.run(serve(args.host, args.port, args.exact, args.idle_timeout))
+	except KeyboardInterrupt:
+		print("\nAté mais!")
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
@@ -0,0 +1,210 @@
+"""
+Variáveis nomeadas com fórmulas reativas
+
+`VariableGraph` guarda células "nome = expressão" (ex.: "taxa = 0.05",
+"total = base * (1 + taxa)") em um grafo de dependências. Cada fórmula é compilada uma
+vez pelo motor de expressões; os nomes que ela usa (`CompiledExpression.variables`) viram
+arestas do grafo.
+
+Ao definir ou apagar uma variável, só as fórmulas que dependem dela (direta ou
+indiretamente) são recalculadas, em ordem topológica. Uma fórmula cujas dependências não
+mudaram de valor não é reavaliada, então a propagação para cedo. Ciclos são recusados na
+definição, sem alterar o grafo.
+
+Uma fórmula pode usar nomes ainda não definidos: ela fica com erro até que eles existam.
+Fórmulas com "_" são avaliadas na hora e guardam o valor (o último resultado muda a cada
+cálculo e não faz parte do grafo).
+
+Apenas a biblioteca padrão é usada.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
+import re
+
+from expressoes import CompiledExpression, ExpressionError, compile_expression
+
+__all__ = ["Cell", "CyclicDependency", "VariableGraph", "parse_assignment"]
+
+# "nome = expressão" ("==" não é atribuição)
+_ASSIGNMENT = re.compile(r"^\s*([^\W\d_]\w*)\s*=(?!=)\s*(.+?)\s*$")
+
+
+def parse_assignment(text: str) -> Optional[Tuple[str, str]]:
+	"""(nome, expressão) se o texto for uma atribuição, senão None."""
+	match = _ASSIGNMENT.match(text)
+	if match is None:
+		return None
+	return match.group(1), match.group(2)
+
+
+class CyclicDependency(ExpressionError):
+	"""A fórmula dependeria (direta ou indiretamente) da própria variável."""
+
+	def __init__(self, name: str) -> None:
+		super().__init__(f"dependência circular em {name}")
+		self.name = name
+
+
+class Cell:
+	"""Uma variável: texto da fórmula, fórmula compilada e o valor ou o erro atual."""
+
+	__slots__ = ("name", "source", "compiled", "value", "error")
+
+	def __init__(self, name: str, source: str, compiled: Optional[CompiledExpression]) -> None:
+		self.name = name
+		self.source = source
+		self.compiled = compiled  # None: valor fixo (fórmula com "_")
+		self.value: Optional[float] = None
+		self.error: Optional[Exception] = None
+
+	@property
+	def dependencies(self) -> frozenset:
+		return self.compiled.variables if self.compiled is not None else frozenset()
+
+	def __repr__(self) -> str:
+		return f"Cell({self.name!r}, {self.source!r}, value={self.value!r})"
+
+
+class VariableGraph:
+	"""Variáveis e fórmulas com recálculo incremental das dependentes."""
+
+	def __init__(self, exact: bool = False) -> None:
+		self.exact = exact
+		self.cells: Dict[str, Cell] = {}
+		self.values: Dict[str, float] = {}  # só as células sem erro (usado na avaliação)
+		self.evaluations = 0
+		self._dependents: Dict[str, Set[str]] = {}
+
+	def set(self, name: str, expression_text: str, last_result: Optional[float] = None) -> List[str]:
+		"""Define (ou redefine) uma variável e recalcula as dependentes.
+
+		Retorna os nomes reavaliados, em ordem (o primeiro é `name`).
+
+		Raises:
+			ExpressionSyntaxError: fórmula inválida (o grafo não muda).
+			CyclicDependency: a fórmula criaria um ciclo (o grafo não muda).
+			ArithmeticError, ExpressionError: erro ao avaliar uma fórmula com "_" (o grafo não muda).
+		"""
+		compiled = compile_expression(expression_text, self.exact)
+		if compiled.uses_last_result:
+			value = compiled.evaluate(last_result, self.values)
+			cell = Cell(name, expression_text, None)
+			cell.value = value
+		else:
+			dependencies = compiled.variables
+			if name in dependencies or not dependencies.isdisjoint(self._downstream(name)):
+				raise CyclicDependency(name)
+			cell = Cell(name, expression_text, compiled)
+		self._unlink(name)
+		self.cells[name] = cell
+		for dependency in cell.dependencies:
+			self._dependents.setdefault(dependency, set()).add(name)
+		return self._propagate(name)
+
+	def delete(self, name: str) -> List[str]:
+		"""Apaga a variável; as fórmulas que a usam são recalculadas (e ficam com erro).
+
+		Raises:
+			KeyError: variável inexistente.
+		"""
+		if name not in self.cells:
+			raise KeyError(name)
+		self._unlink(name)
+		del self.cells[name]
+		self.values.pop(name, None)
+		return self._propagate(name)
+
+	def evaluate(self, expression_text: str, last_result: Optional[float] = None) -> float:
+		"""Avalia uma expressão avulsa com os valores atuais das variáveis."""
+		return compile_expression(expression_text, self.exact).evaluate(last_result, self.values)
+
+	def _unlink(self, name: str) -> None:
+		cell = self.cells.get(name)
+		if cell is None:
+			return
+		for dependency in cell.dependencies:
+			dependents = self._dependents.get(dependency)
+			if dependents is not None:
+				dependents.discard(name)
+				if not dependents:
+					del self._dependents[dependency]
+
+	def _downstream(self, name: str) -> Set[str]:
+		"""Todas as variáveis que dependem de `name`, direta ou indiretamente."""
+		seen: Set[str] = set()
+		pending = [name]
+		while pending:
+			for dependent in self._dependents.get(pending.pop(), ()):
+				if dependent not in seen:
+					seen.add(dependent)
+					pending.append(dependent)
+		return seen
+
+	def _order(self, name: str) -> List[str]:
+		"""`name` seguido das dependentes em ordem topológica (Kahn sobre o subgrafo afetado)."""
+		affected = self._downstream(name)
+		pending_inputs = {
+			dependent: sum(1 for dependency in self.cells[dependent].dependencies if dependency in affected or dependency == name)
+			for dependent in affected
+		}
+		order = [name]
+		ready: Deque[str] = deque((name,))
+		while ready:
+			for dependent in self._dependents.get(ready.popleft(), ()):
+				pending_inputs[dependent] -= 1
+				if pending_inputs[dependent] == 0:
+					order.append(dependent)
+					ready.append(dependent)
+		return order
+
+	def _propagate(self, name: str) -> List[str]:
+		changed = {name}
+		evaluated: List[str] = []
+		for current in self._order(name):
+			cell = self.cells.get(current)
+			if cell is None:
+				continue  # variável apagada: só as dependentes são recalculadas
+			if current != name and changed.isdisjoint(cell.dependencies):
+				continue
+			before = (cell.value, cell.error)
+			self._evaluate_cell(cell)
+			evaluated.append(current)
+			if cell.error is not None or before[1] is not None or cell.value != before[0]:
+				changed.add(current)
+		return evaluated
+
+	def _evaluate_cell(self, cell: Cell) -> None:
+		if cell.compiled is not None:
+			self.evaluations += 1
+			try:
+				cell.value = cell.compiled.evaluate(None, self.values)
+				cell.error = None
+			except (ArithmeticError, ValueError) as error:
+				cell.value = None
+				cell.error = error
+		if cell.error is None:
+			self.values[cell.name] = cell.value
+		else:
+			self.values.pop(cell.name, None)
+
+	def get(self, name: str) -> Optional[Cell]:
+		return self.cells.get(name)
+
+	def dependents(self, name: str) -> Set[str]:
+		"""Variáveis que usam `name` diretamente."""
+		return set(self._dependents.get(name, ()))
+
+	def __contains__(self, name: object) -> bool:
+		return name in self.cells
+
+	def __len__(self) -> int:
+		return len(self.cells)
+
+	def __iter__(self) -> Iterator[Cell]:
+		return iter(self.cells.values())
+
+	def clear(self) -> None:
+		self.cells.clear()
+		self.values.clear()
+		self._dependents.clear()
@@ -0,0 +1,94 @@
+"""
+Operações vetorizadas da calculadora (NumPy)
+
+Aplica as operações da calculadora a colunas inteiras de operandos em uma única
+passada NumPy, sem chamadas Python por linha. O operador pode ser um só para todas
+as linhas ou um array com um operador por linha, com os símbolos e apelidos do
+registro em operacoes.py ("*" ou "×", "/" ou "÷", "**" ou "^", "%" ou "mod").
+
+Divisores zero em "/", "%" e "//" não geram mensagens: as posições afetadas voltam
+marcadas em `zero_divisor` e recebem NaN em `values`.
+
+Exemplo:
+	>>> result = calculate_vectorized([6, 1, 7], [3, 0, 2], ["/", "/", "//"])
+	>>> result.values
+	array([ 2., nan,  3.])
+	>>> result.zero_divisor
+	array([False,  True, False])
+"""
+
+from typing import Callable, Dict, NamedTuple, Sequence, Union
+
+import numpy as np
+
+from operacoes import OPERATIONS, UnknownOperator, canonical_symbol
+
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+VECTOR_FUNCTIONS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+	"+": np.add,
+	"-": np.subtract,
+	"*": np.multiply,
+	"/": np.true_divide,
+	"**": np.power,
+	"%": np.remainder,  # mesmo sinal do divisor, como o % do Python
+	"//": np.floor_divide,
+}
+
+ZERO_DIVISOR_OPERATORS = frozenset(symbol for symbol, operation in OPERATIONS.items() if operation.checks_zero_divisor)
+
+
+class VectorResult(NamedTuple):
+	values: np.ndarray
+	zero_divisor: np.ndarray
+
+
+def _canonical_operator(operator_symbol: str) -> str:
+	symbol = canonical_symbol(operator_symbol)
+	if symbol not in VECTOR_FUNCTIONS:
+		raise UnknownOperator(f"operador não suportado no modo vetorizado: {operator_symbol!r}")
+	return symbol
+
+
+def calculate_vectorized(a: ArrayLike, b: ArrayLike, operation: Union[str, Sequence[str], np.ndarray]) -> VectorResult:
+	"""Calcula `a op b` elemento a elemento.
+
+	Args:
+		a, b: operandos (arrays ou escalares; são convertidos para float64 e combinados por broadcasting).
+		operation: um operador para todas as linhas ou um array com um operador por linha.
+
+	Returns:
+		VectorResult com os valores (NaN onde o divisor é zero) e a máscara de divisores zero.
+
+	Raises:
+		UnknownOperator: se algum operador não for suportado (subclasse de ValueError).
+	"""
+	a_values = np.asarray(a, dtype=np.float64)
+	b_values = np.asarray(b, dtype=np.float64)
+
+	with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+		if isinstance(operation, str):
+			operator_symbol = _canonical_operator(operation)
+			a_values, b_values = np.broadcast_arrays(a_values, b_values)
+			values = VECTOR_FUNCTIONS[operator_symbol](a_values, b_values)
+			if operator_symbol in ZERO_DIVISOR_OPERATORS:
+				zero_divisor = b_values == 0
+			else:
+				zero_divisor = np.zeros(values.shape, dtype=bool)
+		else:
+			operators = np.asarray(operation)
+			a_values, b_values, operators = np.broadcast_arrays(a_values, b_values, operators)
+			values = np.empty(a_values.shape, dtype=np.float64)
+			zero_divisor = np.zeros(a_values.shape, dtype=bool)
+			# Uma passada por operador distinto (no máximo sete), nunca uma por linha
+			for raw_symbol in np.unique(operators):
+				operator_symbol = _canonical_operator(str(raw_symbol))
+				rows = operators == raw_symbol
+				values[rows] = VECTOR_FUNCTIONS[operator_symbol](a_values[rows], b_values[rows])
+				if operator_symbol in ZERO_DIVISOR_OPERATORS:
+					zero_divisor |= rows & (b_values == 0)
+
+	if zero_divisor.any():
+		values = np.where(zero_divisor, np.nan, values)
+	return VectorResult(values, zero_divisor)